@@ -6,6 +6,7 @@ from django.conf import settings
 
 from chatbot.crew_wrapper.tools.plan_web_search_tool import plan_web_search_tool
 from chatbot.crew_wrapper.tools.vector_meta_search_tool import vector_meta_search_tool
+from chatbot.crew_wrapper.tools.vector_multi_search_tool import vector_multi_search_tool
 from chatbot.crew_wrapper.tools.vector_search_tool import vector_search_tool
 from chatbot.crew_wrapper.tools.web_search_tool import web_search_tool
 
@@ -72,7 +73,11 @@ class ReportCrew:
     def recommend_service_selector(self) -> Agent:
         return Agent(
             config=self.agents_config["recommend_service_selector"],
-            tools=[vector_search_tool, vector_meta_search_tool],
+            tools=[
+                vector_search_tool,
+                vector_meta_search_tool,
+                vector_multi_search_tool,
+            ],
         )
 
     @agent
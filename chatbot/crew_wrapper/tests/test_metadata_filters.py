@@ -0,0 +1,18 @@
+from django.test import SimpleTestCase
+
+from chatbot.crew_wrapper.tools.metadata_filters import build_metadata_filters
+
+
+class MetadataFiltersTestCase(SimpleTestCase):
+    """
+    크루 벡터 검색 툴이 공유하는 name/region 필터 정규화를 테스트합니다.
+    """
+
+    def test_build_metadata_filters(self):
+        """name은 앞 2글자, 시/도 region은 그대로, 그 외 region은 앞 2글자로 바뀌는지 테스트"""
+        self.assertEqual(
+            build_metadata_filters("경기패스", "서울특별시"),
+            {"name": "경기", "region": "서울특별시"},
+        )
+        self.assertEqual(build_metadata_filters(region="해외 지역"), {"region": "해외"})
+        self.assertEqual(build_metadata_filters(), {})
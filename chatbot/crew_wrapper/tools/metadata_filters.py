@@ -0,0 +1,27 @@
+# chatbot/crew_wrapper/tools/metadata_filters.py
+
+from chatbot.retrieval.regions import route_region
+
+
+def build_metadata_filters(name: str = None, region: str = None) -> dict:
+    """
+    에이전트가 넘긴 name, region 값을 벡터 검색 메타데이터 필터로 변환하는 함수.
+
+    vector_meta_search_tool과 vector_multi_search_tool이 같은 입력에 같은 필터를 쓰도록
+    정규화를 한 곳에서 처리합니다.
+    - name은 앞 2글자(핵심 단어)만 부분 문자열 필터로 사용합니다.
+    - region은 시/도로 해석되면 그대로 넘겨 시/도 + 전국 파티션으로 라우팅하고,
+      해석되지 않으면 앞 2글자만 부분 문자열 필터로 사용합니다.
+
+    Args:
+        name (str): 서비스명 필터(선택).
+        region (str): 서비스 지역명 필터(선택).
+
+    Returns:
+        dict: 값이 있는 필터만 담은 {"name": ..., "region": ...} 딕셔너리.
+    """
+    if name:
+        name = name[:2]
+    if region and route_region(region) is None:
+        region = region[:2]
+    return {k: v for k, v in {"name": name, "region": region}.items() if v}
@@ -1,7 +1,9 @@
 # chatbot/crew_wrapper/tools/vector_meta_search_tool.py
 
 from crewai.tools import tool
+from django.conf import settings
 
+from chatbot.crew_wrapper.tools.metadata_filters import build_metadata_filters
 from chatbot.retriever import VectorRetriever
 
 
@@ -22,19 +24,18 @@ def vector_meta_search_tool(keyword: str, name: str = None, region: str = None)
     try:
         retriever = VectorRetriever()
 
-        if name:
-            name = name[:2]
-        if region:
-            region = region[:2]
+        filters = build_metadata_filters(name, region)
 
-        # 유효한 필터만 구성 (None 값 제거)
-        filters = {k: v for k, v in {"name": name, "region": region}.items() if v}
-
-        results = retriever.search(query=keyword, filters=filters)
+        results, context = retriever.search_and_format(
+            query=keyword,
+            filters=filters,
+            mode="hybrid",
+            max_tokens=settings.RAG_CONTEXT_MAX_TOKENS,
+        )
 
         if not results:
             return "검색 결과가 없습니다."
 
-        return retriever.format_docs(results)
+        return context
     except Exception as e:
         return f"검색 도중 오류 발생: {str(e)}"
@@ -0,0 +1,52 @@
+# chatbot/crew_wrapper/tools/vector_multi_search_tool.py
+
+from typing import List
+
+from crewai.tools import tool
+from django.conf import settings
+
+from chatbot.crew_wrapper.tools.metadata_filters import build_metadata_filters
+from chatbot.retrieval.fusion import fuse_results
+from chatbot.retriever import VectorRetriever
+
+# 키워드별 결과를 합친 뒤 최종적으로 보여줄 최대 문서 수
+MAX_RESULTS = 10
+
+
+@tool("vector_multi_search_tool")
+def vector_multi_search_tool(
+    keywords: List[str], name: str = None, region: str = None
+) -> str:
+    """
+    여러 키워드 변형을 한 번에 벡터 검색하는 툴.
+
+    키워드를 하나씩 vector_search_tool / vector_meta_search_tool로 검색하는 대신,
+    모든 키워드를 한 번의 임베딩 요청과 컬렉션별 배치 조회로 처리하고
+    결과를 중복 없이 합쳐서 반환합니다.
+
+    Args:
+        keywords (List[str]): 검색에 사용할 키워드 변형 리스트.
+        name (str, optional): 공공서비스명 필터 (앞 2글자만 사용).
+        region (str, optional): 지역명 필터 (시/도는 파티션으로 라우팅, 그 외에는 앞 2글자만 사용).
+
+    Returns:
+        str: 검색 결과를 마크다운 형식으로 포맷한 문자열.
+             결과가 없으면 '검색 결과가 없습니다.'를 반환합니다.
+    """
+    try:
+        retriever = VectorRetriever()
+
+        filters = build_metadata_filters(name, region)
+        keywords = [keyword for keyword in keywords if keyword and keyword.strip()]
+
+        per_keyword = retriever.search_many(keywords, filters=filters, mode="hybrid")
+        results = fuse_results(per_keyword, MAX_RESULTS, strategy="rrf")
+
+        if not results:
+            return "검색 결과가 없습니다."
+
+        return retriever.format_docs(
+            results, max_tokens=settings.RAG_CONTEXT_MAX_TOKENS
+        )
+    except Exception as e:
+        return f"검색 도중 오류 발생: {str(e)}"
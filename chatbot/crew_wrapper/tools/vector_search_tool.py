@@ -1,6 +1,7 @@
 # chatbot/crew_wrapper/tools/vector_search_tool.py
 
 from crewai.tools import tool
+from django.conf import settings
 
 from chatbot.retriever import VectorRetriever
 
@@ -9,6 +10,7 @@ from chatbot.retriever import VectorRetriever
 def vector_search_tool(keyword: str) -> str:
     """
     name, region 정보 없어서 keywords만 사용하여 벡터 검색을 수행하는 툴.
+    키워드만으로는 비슷한 사업이 상위를 채우기 쉬워 MMR로 다양화한 결과를 사용합니다.
 
     Args:
         keywords (str): 검색에 사용할 키워드.
@@ -20,11 +22,16 @@ def vector_search_tool(keyword: str) -> str:
     try:
         retriever = VectorRetriever()
 
-        results = retriever.search(query=keyword)
+        results, context = retriever.search_and_format(
+            query=keyword,
+            mode="hybrid",
+            max_tokens=settings.RAG_CONTEXT_MAX_TOKENS,
+            diversify=True,
+        )
 
         if not results:
             return "검색 결과가 없습니다."
 
-        return retriever.format_docs(results)
+        return context
     except Exception as e:
         return f"검색 도중 오류 발생: {str(e)}"
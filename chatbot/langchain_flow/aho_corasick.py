@@ -0,0 +1,77 @@
+"""
+다중 패턴 문자열 매칭 (aho_corasick.py)
+- 여러 키워드/문장 패턴을 하나의 Aho-Corasick 오토마톤으로 컴파일해, 메시지를 한 번만 훑어
+  포함된 패턴을 모두 찾음
+- 메시지 길이 L, 일치한 패턴 수 m일 때 O(L + m)이므로 패턴 목록이 늘어나도 메시지당 비용은
+  거의 그대로임 (패턴마다 `in` 검사를 하면 O(패턴 수 x L))
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    문자 단위 Aho-Corasick 오토마톤.
+
+    - 노드 i의 전이(goto), 실패 링크(fail), 출력(out)을 리스트로 저장.
+    - 출력에는 실패 링크를 따라 도달하는 노드의 패턴까지 미리 합쳐 두므로, 검색 중에는
+      현재 노드의 출력만 보면 됨.
+
+    Args:
+        patterns (Iterable[str]): 찾을 패턴들. `search`는 이 순서의 인덱스를 반환하며,
+            같은 문자열이 여러 번 있으면 각 인덱스가 모두 반환됨. 빈 문자열은 무시.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.out = [[]]
+        self.size = 0
+        for index, pattern in enumerate(patterns):
+            self.size += 1
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.out.append([])
+                node = next_node
+            self.out[node].append(index)
+
+        # 너비 우선으로 실패 링크를 만들고 출력을 합침
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+        self.out = [tuple(indices) for indices in self.out]
+
+    def search(self, text):
+        """
+        텍스트에 포함된 패턴의 인덱스 집합을 반환 (패턴마다 여러 번 나와도 한 번).
+
+        Args:
+            text (str): 검색할 텍스트.
+
+        Returns:
+            set[int]: 포함된 패턴 인덱스.
+        """
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
@@ -13,19 +13,31 @@ current_date = datetime.now()
 current_year_month = f"{current_date.year}년 {current_date.month}월"
 
 
+# 두 검색 모두 비동기 툴을 쓰므로 `astream` 실행 시 이벤트 루프에서 동시에 진행되고,
+# 각자의 제한 시간(RAG_TOOL_TIMEOUT / WEB_SEARCH_TIMEOUT)을 넘기면 빈 결과로 대체됨
+async def retrieve_context(x):
+    """추측 검색 결과(context)가 넘어오면 재사용하고, 없으면 비동기로 RAG 검색."""
+    if "context" in x:
+        return x["context"]
+    return await detail_rag_tool.ainvoke({"query": " ".join(x["keywords"])})
+
+
+async def web_search(x):
+    """Tavily 웹 검색."""
+    return await tavily_web_search_tool.ainvoke(
+        {
+            "query": " ".join(x["keywords"]),
+            "k": x.get("k", 4),  # 'k'를 외부 입력에서 받거나 기본값 4
+        }
+    )
+
+
 DETAIL_CHAIN = (
     RunnableMap(
         {
             "question": lambda x: x["question"],
-            "context": lambda x: detail_rag_tool.run(
-                {"query": " ".join(x["keywords"])}
-            ),
-            "web_search": lambda x: tavily_web_search_tool.invoke(
-                {
-                    "query": " ".join(x["keywords"]),
-                    "k": x.get("k", 4),  # 'k'를 외부 입력에서 받거나 기본값 4
-                }
-            ),
+            "context": retrieve_context,
+            "web_search": web_search,
             "current_year_month": lambda _: current_year_month,
             "chat_history": lambda x: x.get("chat_history", []),
         }
@@ -7,13 +7,19 @@ from chatbot.langchain_flow.tools.overview_rag_tool import overview_rag_tool
 
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.5, streaming=True)
 
+
+async def retrieve_context(x):
+    """추측 검색 결과(context)가 넘어오면 재사용하고, 없으면 비동기로 RAG 검색."""
+    if "context" in x:
+        return x["context"]
+    return await overview_rag_tool.ainvoke({"query": " ".join(x["keywords"])})
+
+
 OVERVIEW_CHAIN = (
     RunnableMap(
         {
             "question": lambda x: x["question"],
-            "context": lambda x: overview_rag_tool.run(
-                {"query": " ".join(x["keywords"])}
-            ),
+            "context": retrieve_context,
             "chat_history": lambda x: x.get("chat_history", []),
         }
     )
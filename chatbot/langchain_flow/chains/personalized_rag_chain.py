@@ -15,18 +15,31 @@ current_date = datetime.now()
 current_year_month = f"{current_date.year}년 {current_date.month}월"
 
 
+# 프로필 키워드로 RAG/웹 검색을 동시에 실행 (느린 웹 검색이 RAG 검색을 기다리게 하지 않음)
+async def retrieve_context(x):
+    """추측 검색 결과(context)가 넘어오면 재사용하고, 없으면 비동기로 RAG 검색."""
+    if "context" in x:
+        return x["context"]
+    return await detail_rag_tool.ainvoke({"query": " ".join(x["profile"])})
+
+
+async def web_search(x):
+    """Tavily 웹 검색."""
+    return await tavily_web_search_tool.ainvoke(
+        {
+            "query": " ".join(x["profile"]),
+            "k": x.get("k", 4),  # 'k'를 외부 입력에서 받거나 기본값 4
+        }
+    )
+
+
 PERSONALIZED_CHAIN = (
     RunnableMap(
         {
             "question": lambda x: x["question"],
-            "context": lambda x: detail_rag_tool.run({"query": " ".join(x["profile"])}),
+            "context": retrieve_context,
             "profile_text": lambda x: " ".join(x["profile_text"]),
-            "web_search": lambda x: tavily_web_search_tool.invoke(
-                {
-                    "query": " ".join(x["profile"]),
-                    "k": x.get("k", 4),  # 'k'를 외부 입력에서 받거나 기본값 4
-                }
-            ),
+            "web_search": web_search,
             "current_year_month": lambda _: current_year_month,
             "chat_history": lambda x: x.get("chat_history", []),
         }
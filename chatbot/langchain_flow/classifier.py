@@ -1,5 +1,18 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
 from enum import Enum
 
+from django.conf import settings
+
+from chatbot.langchain_flow.aho_corasick import AhoCorasick
+
+logger = logging.getLogger(__name__)
+
 
 class Category(Enum):
     """
@@ -22,161 +35,287 @@ class Category(Enum):
     PERSONALIZED = "personalized"
 
 
-# 각 카테고리에 해당하는 키워드 라스트
-KEYWORD_CATEGORY_MAP = {
-    Category.GOV_POLICY.value: [
-        "정책",
-        "지원",
-        "프로그램",
-        "혜택",
-        "주거지원",
-        "청년지원",
-        "복지",
-        "정부지원",
-        "대상자",
-        "제도",
-        "정부정책",
-        "복지정책",
-        "지원정책",
-        "지원제도",
-        "청년정책",
-        "창업지원",
-        "금융지원",
-        "취업지원",
-        "일자리",
-        "공공지원",
-        "청년주택",
-        "임대주택",
-        "국가정책",
-        "지원방안",
-        "제도안내",
-    ],
-    Category.DETAIL_POLICY.value: [
-        "대상",
-        "선정기준",
-        "신청방법",
-        "신청사이트",
-        "신청기한",
-        "조건",
-        "자격",
-        "신청",
-        "기간",
-        "필요서류",
-        "서류",
-        "싱세",
-        "자세히",
-        "디테일",
-        "절차",
-        "증명서",
-        "신청양식",
-        "자세한내용",
-        "서류제출",
-        "제출서류",
-        "신청조건",
-        "신청절차",
-        "신청링크",
-        "접수기간",
-        "자격요건",
-        "자격조건",
-        "신청가능일",
-        "진행절차",
-        "양식",
-        "신청비용",
-        "인터넷신청",
-        "방문신청",
-        "신청주소",
-        "증빙자료",
-        "첨부파일",
-        "먼저",
-    ],
-}
-
-# 'gov_policy' 으로 분류할 수 있는 질문/요청 패턴 목록
-POLICY_PATTERNS = [
-    "있어?",
-    "있나요?",
+# 확신도 계산에서 근거(최고 점수)가 이 점수만큼 쌓이면 근거 항이 약 0.63이 됨
+EVIDENCE_SCALE = 3
+# 분류 단어 파일에 있어야 하는 최소 카테고리 수 (확신도는 1, 2위 점수 차이로 계산)
+MIN_CATEGORIES = 2
+# 분류 단어 파일 수정 여부를 확인하는 최소 간격(초)
+TERMS_RELOAD_INTERVAL = 5
+# 이전 대화를 가리키는 표현 / 사용자 자신에게 맞는 정책을 묻는 표현 (분류 단어 파일의 markers).
+# 후속 질문/personalized 여부는 LLM만 판단할 수 있으므로 포함되면 규칙 분류를 확신하지 않음
+UNCERTAIN_MARKERS = ("reference", "personal")
+# 정책/지원 분야 단어 (분류 단어 파일의 markers). 규칙 분류에는 off_topic 카테고리가 없고
+# 문장 패턴("알려줘", "추천해줘")은 잡담에도 나오므로, 이 단어가 없으면 규칙 분류를 확신하지 않음
+TOPIC_MARKER = "topic"
+
+
+class TermMatcher:
+    """
+    분류 단어 목록을 하나의 Aho-Corasick 오토마톤으로 컴파일한 매처.
+
+    - 카테고리별 키워드/문장 패턴과 마커를 모두 한 오토마톤에 넣어, 메시지를 한 번 훑는 것으로
+      모든 카테고리 점수와 마커를 계산.
+    - 같은 단어가 여러 목록에 있으면 목록마다 점수를 받음 (기존 `in` 검사와 같은 결과).
+    - 가중치는 weights의 목록 종류별 기본값(키워드 1, 문장 패턴 2)을 쓰고, [단어, 가중치]
+      항목은 그 가중치를 사용.
+
+    Args:
+        terms (dict): 분류 단어 파일 내용.
+            weights (dict): 목록 종류(keywords/patterns) -> 기본 가중치.
+            categories (dict): 카테고리 -> {목록 종류: [단어 또는 [단어, 가중치]]}.
+            markers (dict): 마커 이름 -> [단어].
+
+    Raises:
+        ValueError: 카테고리가 MIN_CATEGORIES개보다 적은 경우.
+    """
+
+    def __init__(self, terms):
+        weights = terms.get("weights", {})
+        self.categories = list(terms["categories"])
+        if len(self.categories) < MIN_CATEGORIES:
+            raise ValueError(
+                f"분류 카테고리가 {MIN_CATEGORIES}개 이상 필요합니다: {self.categories}"
+            )
+        self.entries = []
+        patterns = []
+        for category, groups in terms["categories"].items():
+            for kind, items in groups.items():
+                for item in items:
+                    term, weight = (
+                        (item, weights[kind]) if isinstance(item, str) else item
+                    )
+                    patterns.append(term)
+                    self.entries.append((category, weight))
+        for marker, items in terms.get("markers", {}).items():
+            for term in items:
+                patterns.append(term)
+                self.entries.append((marker, None))
+        self.automaton = AhoCorasick(patterns)
+
+    def match(self, text):
+        """
+        텍스트의 카테고리별 점수와 포함된 마커를 계산.
+
+        Returns:
+            tuple: (카테고리 -> 점수 딕셔너리, 마커 이름 집합)
+        """
+        scores = dict.fromkeys(self.categories, 0)
+        markers = set()
+        for index in self.automaton.search(text):
+            name, weight = self.entries[index]
+            if weight is None:
+                markers.add(name)
+            else:
+                scores[name] += weight
+        return scores, markers
+
+
+class ReloadingTermMatcher:
+    """
+    분류 단어 파일을 컴파일해 두고, 파일이 바뀌면 다시 컴파일하는 매처 홀더.
+
+    - `get`은 마지막 확인 후 TERMS_RELOAD_INTERVAL이 지났을 때만 파일 수정 시각을 확인하므로
+      메시지마다 파일 시스템을 조회하지 않음.
+    - 바뀐 파일을 읽거나 컴파일하지 못하면(카테고리 수 부족 포함) 경고를 남기고 이전 목록을
+      계속 사용.
+
+    Args:
+        path (str): 분류 단어 JSON 파일 경로.
+        interval (float): 파일 수정 여부 확인 간격(초).
+
+    Raises:
+        OSError, ValueError: 처음 불러올 때 파일이 없거나 형식이 잘못된 경우.
+    """
+
+    def __init__(self, path, interval=TERMS_RELOAD_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.matcher = None
+        self.mtime = None
+        self.checked_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.reload()
+
+    def get(self):
+        """현재 `TermMatcher` (필요하면 파일을 다시 불러옴)."""
+        now = time.monotonic()
+        if now - self.checked_at >= self.interval:
+            self.checked_at = now
+            try:
+                changed = os.stat(self.path).st_mtime_ns != self.mtime
+            except OSError as e:
+                logger.warning("분류 단어 파일을 확인하지 못했습니다: %s", e)
+                changed = False
+            if changed:
+                self.reload()
+        return self.matcher
+
+    def reload(self):
+        """파일이 바뀌었으면 다시 컴파일해 교체."""
+        with self._lock:
+            mtime = None
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime == self.mtime:
+                    return
+                with open(self.path, encoding="utf-8") as f:
+                    matcher = TermMatcher(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if self.matcher is None:
+                    raise
+                logger.warning(
+                    "분류 단어 파일을 다시 불러오지 못해 이전 목록을 사용합니다: %s", e
+                )
+                # 같은 파일로 경고가 반복되지 않도록 수정 시각은 기록
+                self.mtime = mtime or self.mtime
+                return
+            self.matcher, self.mtime = matcher, mtime
+            logger.info("분류 단어 %d개 컴파일 (%s)", len(matcher.entries), self.path)
+
+
+# 분류 단어 목록은 임포트 시 한 번 컴파일하고, 파일이 바뀌면 다시 컴파일
+TERM_MATCHER = ReloadingTermMatcher(settings.CLASSIFIER_TERMS_PATH)
+
+# 로컬 키워드 추출 시 제거하는 요청 표현 (검색어에 도움이 되지 않는 문장 끝 표현)
+REQUEST_PHRASES = [
+    "알려주세요",
+    "알려줘요",
     "알려줘",
-    "뭐가 있어",
-    "어떤 것이 있",
-    "있는지",
-    "받을 수 있",
-    "지원받을 수",
-    "혜택 받",
-    "무슨 정책",
-    "정책 알려줘",
-    "지원해주는 게",
-    "무슨 혜택",
-    "혜택 종류",
-    "받을 수 있는 정책",
-    "관련된 정책",
-    "지원 가능한 게",
+    "추천해주세요",
     "추천해줘",
-]
-# 'detail_policy' 으로 분류할 수 있는 질문/요청 패턴 목록
-DETAIL_PATTERNS = [
-    "어떻게 신청",
-    "어디서 신청",
-    "신청 마감",
-    "제출해야 하는",
-    "필수 서류",
-    "구체적",
-    "상세 내용",
-    "자세히",
-    "어디서 확인",
-    "언제까지 신청",
-    "어떤 서류",
-    "자격 요건",
-    "자세한 정보",
-    "신청하는 법",
-    "신청 절차",
-    "신청 주소",
-    "신청 링크",
-    "필요한 서류",
-    "자세하",
-    "상세",
+    "궁금합니다",
+    "궁금해요",
+    "궁금해",
+    "뭐가 있어",
+    "뭐가 있나요",
+    "뭐 있어",
+    "뭐 있나요",
+    "뭐예요",
+    "뭐야",
+    "있나요",
+    "있어요",
+    "있어",
+    "해주세요",
+    "해줘",
 ]
 
-# 키워드 매칭 시 가중치 점수 1, 패턴 매칭 시 가중치 점수 1.5
-KEYWORD_SCORE = 1
-PATTERN_SCORE = 2
+
+class ManualClassification:
+    """
+    규칙 기반 분류 결과.
+
+    Attributes:
+        category (str | None): 더 높은 점수의 카테고리. 0점이거나 동점이면 None.
+        scores (dict): 카테고리 -> 보정 점수 (합이 1인 비율, 0점이면 모두 0).
+        confidence (float): 0~1 확신도. 점수 차이 비율 x 근거 양(1 - exp(-최고 점수 / EVIDENCE_SCALE)).
+        markers (frozenset): 메시지에 나온 마커 이름 (reference / personal / topic).
+    """
+
+    __slots__ = ("category", "scores", "confidence", "markers")
+
+    def __init__(self, category, scores, confidence, markers=frozenset()):
+        self.category = category
+        self.scores = scores
+        self.confidence = confidence
+        self.markers = frozenset(markers)
+
+    def __repr__(self):
+        return (
+            f"ManualClassification(category={self.category!r}, "
+            f"scores={self.scores!r}, confidence={self.confidence:.2f})"
+        )
 
 
-def manual_classifier(user_message: str) -> str | None:
+def manual_classifier(user_message: str) -> ManualClassification:
     """
     사용자 입력값을 키워드 및 문장 패턴을 기준으로 분류하는 함수입니다.
 
     키워드 및 문장 패턴을 사전에 정의해두고, 키워드랑 패턴 포함 정도에 따라
     'gov_policy'또는 'detail_policy' 카테고리로 분류합니다.
-    사용자 입력값에 키워드가 포함되엉 있을 때마다 점수를 얻고(KEYWORD_SCORE), 패턴은 더 높은 점수(PATTERN_SCORE)를 얻습니다.
-    최종적으로 더 높은 점수를 받은 카테고리를 반환하고, 0점이거나 동점일 때는 None을 반환합니다.
+    사용자 입력값에 키워드가 포함되엉 있을 때마다 점수를 얻고(키워드 가중치), 패턴은 더 높은 점수(패턴 가중치)를 얻습니다.
+    최종적으로 더 높은 점수를 받은 카테고리를 반환하고, 0점이거나 동점일 때는 카테고리가 None입니다.
+
+    변동사항 (10/18/26)
+    - 키워드/패턴 목록과 가중치를 분류 단어 파일(CLASSIFIER_TERMS_PATH)로 옮기고, Aho-Corasick
+      오토마톤으로 컴파일해 메시지를 한 번 훑어 점수를 계산. 파일이 바뀌면 다시 컴파일.
+    - 카테고리와 함께 보정 점수(카테고리별 비율), 확신도, 메시지에 나온 마커를 반환.
+      확신도는 두 카테고리 점수 차이가 크고 매칭된 근거가 많을수록 1에 가까워지며,
+      이전 대화를 가리키거나(reference 마커) 사용자 맞춤 정책을 묻는 표현(personal 마커)이
+      있으면 0 (후속 질문/개인화 여부는 LLM만 판단 가능).
+    - 정책/지원 분야 단어(topic 마커)가 없으면 확신도 0 (off_topic 여부는 LLM만 판단 가능).
 
     Args:
         user_message (str): 사용자 입력 메시지
 
     Returns:
-        str | None: 분류된 카테고리 문자열 ('gov_policy' 또는 'detail_policy') 또는 None.
+        ManualClassification: 분류된 카테고리('gov_policy', 'detail_policy' 또는 None), 보정 점수, 확신도, 마커.
     """
 
-    scores = {Category.GOV_POLICY.value: 0, Category.DETAIL_POLICY.value: 0}
-
-    for category, keywords in KEYWORD_CATEGORY_MAP.items():
-        for keyword in keywords:
-            if keyword in user_message:
-                scores[category] += KEYWORD_SCORE
+    scores, markers = TERM_MATCHER.get().match(user_message)
 
-    for pattern in POLICY_PATTERNS:
-        if pattern in user_message:
-            scores[Category.GOV_POLICY.value] += PATTERN_SCORE
+    total = sum(scores.values())
+    # 카테고리가 하나뿐이면 2위 점수는 0
+    max_score, runner_up = (sorted(scores.values(), reverse=True) + [0, 0])[:2]
+    calibrated = {
+        category: score / total if total else 0.0 for category, score in scores.items()
+    }
 
-    for pattern in DETAIL_PATTERNS:
-        if pattern in user_message:
-            scores[Category.DETAIL_POLICY.value] += PATTERN_SCORE
+    if max_score == 0 or max_score == runner_up:
+        return ManualClassification(None, calibrated, 0.0, markers)
 
-    max_score = max(scores.values())
-
-    if max_score == 0 or len(set(scores.values())) == 1:
-        return None
+    margin = (max_score - runner_up) / total
+    evidence = 1 - math.exp(-max_score / EVIDENCE_SCALE)
+    confidence = margin * evidence
+    if markers.intersection(UNCERTAIN_MARKERS) or TOPIC_MARKER not in markers:
+        confidence = 0.0
 
     for category, score in scores.items():
         if score == max_score:
-            return category
+            return ManualClassification(category, calibrated, confidence, markers)
+
+
+def resolve_category(classification_result: dict, manual_category: str | None) -> str:
+    """
+    LLM 분류 결과를 규칙 기반 분류 결과로 보정한 최종 카테고리를 반환합니다.
+
+    LLM이 한국말의 문맥을 판단 못하는 경우를 대비해서, off_topic/personalized가 아니면
+    특정 키워드가 있을 때 규칙 기반 분류 결과를 우선합니다.
+
+    Args:
+        classification_result (dict): LLM 분류 결과 (category, is_followup 포함).
+        manual_category (str | None): `manual_classifier`의 카테고리.
+
+    Returns:
+        str: 최종 카테고리.
+    """
+    category = classification_result["category"]
+    if category in [Category.OFF_TOPIC.value, Category.PERSONALIZED.value]:
+        return category
+    if (
+        classification_result["is_followup"]
+        and manual_category == Category.DETAIL_POLICY.value
+    ):
+        return Category.DETAIL_POLICY.value
+    if manual_category and manual_category != category:
+        return manual_category
+    return category
+
+
+def extract_keywords(user_message: str) -> str:
+    """
+    LLM 없이 사용자 입력에서 검색용 키워드를 추출합니다.
+
+    문장 부호와 검색에 도움이 되지 않는 요청 표현(REQUEST_PHRASES)을 지우고 남은 단어를
+    공백으로 이어 반환합니다. 지울 것이 없으면 입력을 그대로 사용합니다.
+
+    Args:
+        user_message (str): 사용자 입력 메시지
+
+    Returns:
+        str: 공백으로 구분된 키워드 문자열 (LLM 분류 결과의 keywords와 같은 형식).
+    """
+    text = re.sub(r"[?!.,~…]+", " ", user_message)
+    for phrase in REQUEST_PHRASES:
+        text = text.replace(phrase, " ")
+    keywords = " ".join(text.split())
+    return keywords or user_message.strip()
@@ -0,0 +1,172 @@
+"""
+규칙 기반 분류 마이크로 벤치마크 (classifier_benchmark.py)
+- 분류 단어 파일의 목록을 N배로 늘린 합성 목록으로, 단어마다 `in` 검사하는 방식과
+  Aho-Corasick 오토마톤(`TermMatcher`)의 메시지당 비용과 컴파일 시간을 비교
+- 두 방식의 점수가 같은지도 함께 확인
+
+사용 예:
+    python -m chatbot.langchain_flow.classifier_benchmark --scale 10
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from chatbot.langchain_flow.classifier import TermMatcher  # noqa: E402
+
+# 합성 단어를 만들 때 기존 단어 앞에 붙이는 대상/지역 표현
+VARIANT_PREFIXES = [
+    "서울",
+    "부산",
+    "경기",
+    "인천",
+    "대구",
+    "광주",
+    "청년",
+    "중장년",
+    "노인",
+    "대학생",
+    "신혼부부",
+    "장애인",
+    "소상공인",
+    "구직자",
+    "한부모",
+    "다자녀",
+]
+
+SAMPLE_MESSAGES = [
+    "청년 월세 지원 정책 알려줘",
+    "국민취업지원제도 신청 방법과 필요 서류 자세히 알려줘",
+    "대출 신청 조건은?",
+    "요즘 집 구하기 너무 힘드네",
+    "경기패스 신청 기간이랑 자격 요건 알려줘",
+    "서울에 사는 27살 구직자인데 받을 수 있는 지원금이나 교육 프로그램이 뭐가 있는지 궁금해요",
+    "심심하다",
+    "그거 신청 절차 자세히 알려줘",
+    "소상공인 창업지원 정책이랑 금융지원 제도 중에 제가 받을 수 있는 게 있나요?",
+    "K-디지털 트레이닝 과정 신청하려면 어떤 서류를 제출해야 하는지, 접수기간은 언제까지인지 알려주세요",
+]
+
+
+def scale_terms(terms, scale):
+    """
+    분류 단어 목록의 각 목록을 scale배로 늘린 복사본.
+
+    - 기존 단어에 대상/지역 표현을 붙인 변형을 추가하므로, 실제로 한국어 변형을 계속 추가할 때처럼
+      접두사를 공유하는 단어가 늘어남.
+    """
+    prefixes = _prefixes(scale - 1)
+    scaled = json.loads(json.dumps(terms))
+    for groups in scaled["categories"].values():
+        for kind, items in groups.items():
+            groups[kind] = items + [
+                f"{prefix}{item}" for prefix in prefixes for item in items
+            ]
+    for marker, items in scaled.get("markers", {}).items():
+        scaled["markers"][marker] = items + [
+            f"{prefix}{item}" for prefix in prefixes for item in items
+        ]
+    return scaled
+
+
+def _prefixes(count):
+    """서로 다른 접두사 count개 (부족하면 두 표현을 이어 붙여 만듦)."""
+    pairs = (
+        f"{first}{second}"
+        for first, second in itertools.permutations(VARIANT_PREFIXES, 2)
+    )
+    return list(itertools.islice(itertools.chain(VARIANT_PREFIXES, pairs), count))
+
+
+def flatten_terms(terms):
+    """기존 방식용 [(단어, 카테고리 또는 마커, 가중치 또는 None)] 목록 (측정 전에 한 번 만듦)."""
+    weights = terms.get("weights", {})
+    entries = []
+    for category, groups in terms["categories"].items():
+        for kind, items in groups.items():
+            for item in items:
+                term, weight = (item, weights[kind]) if isinstance(item, str) else item
+                entries.append((term, category, weight))
+    for marker, items in terms.get("markers", {}).items():
+        entries.extend((term, marker, None) for term in items)
+    return entries
+
+
+def scan_scores(categories, entries, message):
+    """기존 방식: 단어마다 `in` 검사해 카테고리 점수와 마커 계산."""
+    scores = dict.fromkeys(categories, 0)
+    markers = set()
+    for term, name, weight in entries:
+        if term in message:
+            if weight is None:
+                markers.add(name)
+            else:
+                scores[name] += weight
+    return scores, markers
+
+
+def per_message_us(func, messages, repeat):
+    """메시지 하나당 평균 실행 시간(µs)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            func(message)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def bench(terms, label, repeat):
+    """한 단어 목록에 대해 두 방식의 비용을 출력."""
+    start = time.perf_counter()
+    matcher = TermMatcher(terms)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    categories, entries = list(terms["categories"]), flatten_terms(terms)
+    for message in SAMPLE_MESSAGES:
+        assert matcher.match(message) == scan_scores(categories, entries, message)
+
+    scan_us = per_message_us(
+        lambda message: scan_scores(categories, entries, message),
+        SAMPLE_MESSAGES,
+        repeat,
+    )
+    automaton_us = per_message_us(matcher.match, SAMPLE_MESSAGES, repeat)
+    print(
+        f"{label:>6} | 단어 {len(matcher.entries):6d}개 | 컴파일 {compile_ms:8.1f}ms | "
+        f"in 검사 {scan_us:8.1f}µs | 오토마톤 {automaton_us:6.1f}µs | "
+        f"x{scan_us / automaton_us:.1f}"
+    )
+
+
+def main():
+    """
+    명령어 인자를 받아 벤치마크를 실행
+    """
+    parser = argparse.ArgumentParser(description="규칙 기반 분류 마이크로 벤치마크")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--terms", default=settings.CLASSIFIER_TERMS_PATH)
+    args = parser.parse_args()
+
+    with open(args.terms, encoding="utf-8") as f:
+        terms = json.load(f)
+
+    print(
+        f"메시지 {len(SAMPLE_MESSAGES)}개, 평균 길이 "
+        f"{sum(map(len, SAMPLE_MESSAGES)) / len(SAMPLE_MESSAGES):.0f}자"
+    )
+    bench(terms, "x1", args.repeat)
+    if args.scale > 1:
+        bench(scale_terms(terms, args.scale), f"x{args.scale}", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+입력 분류 빠른 경로 (fast_path.py)
+- 이전 대화가 없는 첫 질문에서 규칙 기반 분류(`manual_classifier`)의 확신도가
+  CLASSIFIER_FAST_PATH_CONFIDENCE 이상이면 gpt-4o-mini 분류 호출을 생략하고, 키워드는 로컬에서 추출
+- 빠른 경로 요청 중 CLASSIFIER_SHADOW_SAMPLE_RATE 비율만큼은 LLM 분류를 응답과 별개로 실행해
+  (섀도 실행) 규칙 분류와 얼마나 어긋나는지 누적 통계로 기록
+"""
+
+import asyncio
+import logging
+import random
+import threading
+from collections import Counter
+
+from django.conf import settings
+
+from chatbot.langchain_flow.classifier import extract_keywords, resolve_category
+
+logger = logging.getLogger(__name__)
+
+
+class ClassificationFastPath:
+    """
+    요청 하나의 입력 분류 빠른 경로 판단과 섀도 실행을 관리.
+
+    Args:
+        threshold (float, optional): 빠른 경로를 탈 최소 확신도.
+            None이면 CLASSIFIER_FAST_PATH_CONFIDENCE 설정 (1보다 크면 사용 안 함).
+        shadow_rate (float, optional): 빠른 경로 요청 중 섀도 실행 비율.
+            None이면 CLASSIFIER_SHADOW_SAMPLE_RATE 설정.
+    """
+
+    stats = Counter()
+    _stats_lock = threading.Lock()
+    # 실행 중인 섀도 태스크 (응답이 끝난 뒤에도 가비지 컬렉션되지 않도록 참조 유지)
+    _shadow_tasks = set()
+
+    def __init__(self, threshold=None, shadow_rate=None):
+        self.threshold = (
+            settings.CLASSIFIER_FAST_PATH_CONFIDENCE if threshold is None else threshold
+        )
+        self.shadow_rate = (
+            settings.CLASSIFIER_SHADOW_SAMPLE_RATE
+            if shadow_rate is None
+            else shadow_rate
+        )
+
+    def classify(self, user_message, manual, chat_history=None):
+        """
+        규칙 기반 분류를 확신하면 LLM 분류 결과와 같은 형식의 결과를 반환.
+
+        - 규칙 분류는 personalized/off_topic과 후속 질문을 판단하지 못하므로, 이전 대화를
+          가리키거나 사용자 맞춤 정책을 묻는 표현이 있거나 정책/지원 분야 단어가 없으면
+          확신도가 0이 되어 항상 LLM 분류를 탐.
+        - 이전 대화가 있으면 지시어 없이도 후속 질문일 수 있으므로 항상 LLM 분류를 탐.
+          따라서 빠른 경로 결과의 is_followup은 항상 False.
+
+        Args:
+            user_message (str): 사용자 입력 메시지.
+            manual (ManualClassification): `manual_classifier` 결과.
+            chat_history (list, optional): 이전 대화 메시지 목록.
+
+        Returns:
+            dict | None: category/original_input/is_followup/keywords 딕셔너리,
+                확신도가 부족하면 None (LLM 분류 필요).
+        """
+        confident = manual.category is not None and manual.confidence >= self.threshold
+        fast = confident and not chat_history
+        self._record_stats(
+            requests=1,
+            fast_path=int(fast),
+            history_skipped=int(confident and not fast),
+        )
+        if not fast:
+            return None
+        logger.info(
+            "입력 분류 빠른 경로 (%s, 확신도 %.2f)", manual.category, manual.confidence
+        )
+        return {
+            "category": manual.category,
+            "original_input": user_message,
+            "is_followup": False,
+            "keywords": extract_keywords(user_message),
+        }
+
+    def shadow(self, result, llm_classify):
+        """
+        샘플링된 빠른 경로 요청에 대해 LLM 분류를 백그라운드로 실행하고 결과를 비교.
+
+        - 응답 생성은 기다리지 않으며, 비교 결과는 통계에만 기록.
+        - LLM 결과에는 실제 경로와 같은 규칙 보정(`resolve_category`)을 적용해 비교.
+
+        Args:
+            result (dict): `classify`가 반환한 빠른 경로 결과.
+            llm_classify (Callable): LLM 분류 결과를 반환하는 코루틴 함수.
+        """
+        if self.shadow_rate <= 0 or random.random() >= self.shadow_rate:
+            return
+
+        async def run():
+            try:
+                llm_result = await llm_classify()
+                category = resolve_category(llm_result, result["category"])
+            except Exception as e:
+                self._record_stats(shadow_errors=1)
+                logger.warning("입력 분류 섀도 실행 실패: %s", e)
+                return
+            disagreed = category != result["category"]
+            self._record_stats(
+                shadow_runs=1,
+                shadow_disagreements=int(disagreed),
+                shadow_followups=int(bool(llm_result.get("is_followup"))),
+            )
+            if disagreed:
+                logger.info(
+                    "입력 분류 섀도 불일치 (규칙 %s, LLM %s): %s",
+                    result["category"],
+                    category,
+                    result["original_input"],
+                )
+
+        task = asyncio.ensure_future(run())
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    @classmethod
+    def get_stats(cls):
+        """
+        누적 빠른 경로 통계 반환.
+
+        Returns:
+            dict: requests(판단한 요청 수), fast_path(LLM 분류를 생략한 수),
+                history_skipped(규칙 분류를 확신했지만 이전 대화가 있어 LLM 분류를 탄 수),
+                shadow_runs/shadow_errors(섀도 실행 성공/실패 수),
+                shadow_disagreements(섀도 LLM 분류와 카테고리가 다른 수),
+                shadow_followups(LLM이 후속 질문으로 판단한 수),
+                fast_path_rate(fast_path / requests),
+                disagreement_rate(shadow_disagreements / shadow_runs).
+        """
+        with cls._stats_lock:
+            stats = dict(cls.stats)
+        requests = stats.get("requests", 0)
+        shadow_runs = stats.get("shadow_runs", 0)
+        stats["fast_path_rate"] = (
+            stats.get("fast_path", 0) / requests if requests else 0.0
+        )
+        stats["disagreement_rate"] = (
+            stats.get("shadow_disagreements", 0) / shadow_runs if shadow_runs else 0.0
+        )
+        return stats
+
+    @classmethod
+    def _record_stats(cls, **counts):
+        with cls._stats_lock:
+            cls.stats.update(counts)
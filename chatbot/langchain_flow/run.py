@@ -1,7 +1,10 @@
+import asyncio
+import logging
 import time
 
 from channels.db import database_sync_to_async
 from django.db import transaction
+from django.db.models import F
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_openai import ChatOpenAI
 
@@ -10,10 +13,24 @@ from chatbot.crew_wrapper.crews.report_crew.report_crew import ReportCrew
 from chatbot.langchain_flow.chains.detail_rag_chain import DETAIL_CHAIN
 from chatbot.langchain_flow.chains.overview_rag_chain import OVERVIEW_CHAIN
 from chatbot.langchain_flow.chains.personalized_rag_chain import PERSONALIZED_CHAIN
-from chatbot.langchain_flow.classifier import Category, manual_classifier
+from chatbot.langchain_flow.classifier import (
+    Category,
+    manual_classifier,
+    resolve_category,
+)
+from chatbot.langchain_flow.fast_path import ClassificationFastPath
 from chatbot.langchain_flow.memory import ChatHistoryManager
 from chatbot.langchain_flow.profile import fortato, get_profile_data
 from chatbot.langchain_flow.prompt import CLASSIFICATION_PROMPT
+from chatbot.langchain_flow.speculative import SpeculativeRetrieval
+from chatbot.langchain_flow.task_graph import TaskGraph
+from chatbot.langchain_flow.tools.detail_rag_tool import detail_rag_tool
+from chatbot.langchain_flow.tools.overview_rag_tool import overview_rag_tool
+
+logger = logging.getLogger(__name__)
+
+USER_NOT_FOUND_MESSAGE = "사용자 정보를 찾을 수 없습니다. 다시 로그인해주세요."
+CREDIT_REQUIRED_MESSAGE = "AInfo를 이용하기 위해서는 최소 {cost} 크레딧이 필요합니다."
 
 
 async def get_chatbot_response(
@@ -32,6 +49,18 @@ async def get_chatbot_response(
     - 검색된 문서를 기반으로 하는 답변 제공
     - Django Redis 기반 `ChatHistoryManager`를 통해 대화 내용을 관리할 수 있음
 
+    변동사항 (10/18/26)
+    - 이전 대화가 없는 첫 질문에서 규칙 기반 분류의 확신도가 CLASSIFIER_FAST_PATH_CONFIDENCE
+      이상이면 LLM 입력 분류를 생략하고 키워드를 로컬에서 추출 (일부 요청은 LLM 분류를 섀도
+      실행해 불일치율 기록)
+    - 입력 분류를 기다리는 동안 원본 메시지(사용자 맞춤 표현이 있으면 프로필 키워드)로 RAG 검색을
+      미리 시작하고(추측 검색), 분류 키워드가 충분히 겹치면 체인의 검색 단계 대신 재사용.
+      보고서 요청과 크레딧 사전 확인을 통과하지 못한 요청은 추측 검색을 하지 않음
+    - 대화 기록 로드 -> 입력 분류, 프로필 조회, 크레딧 사전 확인을 `TaskGraph`로 동시에 실행하고
+      단계별 소요 시간을 로그로 기록
+    - 크레딧 차감은 사전 확인을 통과하면 응답 생성과 동시에 진행하고, 첫 청크 전에 결과 확인
+      (첫 청크 전에 응답 생성이 실패하면 차감을 되돌림)
+
     변동사항 (03-26-25)
     - 입력 분류(classification) 기능 추가, 프로필 키워드 기반 맥락 보강, 분류 결과에 따른 체인 분기 로직 구현
 
@@ -51,100 +80,158 @@ async def get_chatbot_response(
         str: 실시간으로 생성된 응답의 텍스트 청크
     """
 
+    if user_message == "4테이토":
+        async for chunk in fortato(user_message):
+            yield chunk
+        return
+
     # 멀티턴을 위한 레디스 메모리 매니저 인스턴스 생성 & 대화내용 요약을 위한 LLM 로드
     llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, streaming=True)
     chat_manager = ChatHistoryManager(user_id, room_id, llm)
     memory = chat_manager.get_memory_manager()
-    chat_history = memory.load_memory_variables({}).get("chat_history", [])
 
     classification_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
     classification_chain = (
         CLASSIFICATION_PROMPT | classification_llm | JsonOutputParser()
     )
-    classification_result = await classification_chain.ainvoke(
-        {"question": user_message, "chat_history": chat_history}
+
+    async def load_history():
+        # Redis 조회는 동기 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        variables = await asyncio.to_thread(memory.load_memory_variables, {})
+        return variables.get("chat_history", [])
+
+    async def llm_classify(history):
+        return await classification_chain.ainvoke(
+            {"question": user_message, "chat_history": history}
+        )
+
+    # 이전 대화가 없고 규칙 기반 분류를 확신하면 LLM 입력 분류 없이 진행
+    fast_path = ClassificationFastPath()
+
+    async def classify(history):
+        fast_result = fast_path.classify(user_message, manual, history)
+        if fast_result is None:
+            return await llm_classify(history)
+        fast_path.shadow(fast_result, lambda: llm_classify(history))
+        return fast_result
+
+    # 분류 LLM 응답을 기다리는 동안 RAG 검색을 미리 시작 (추측 검색)
+    # - 보고서 요청은 체인 검색을 쓰지 않으므로 하지 않음
+    # - 크레딧 사전 확인을 통과한 뒤에만 시작 (DB 조회는 분류 LLM보다 훨씬 빠름)
+    # - 규칙 분류에 사용자 맞춤 표현(personal 마커)이 있으면 프로필 키워드로, 아니면 원본
+    #   메시지로 상세/개요 중 규칙 분류가 가리키는 체인의 검색을 시작
+    manual = manual_classifier(user_message)
+    manual_category = manual.category
+    speculation = SpeculativeRetrieval(enabled=False if is_report else None)
+    personal = "personal" in manual.markers
+
+    async def load_credit():
+        credit = await get_credit(int(user_id))
+        if not personal and credit_shortage(credit, cost=1) is None:
+            if manual_category == Category.DETAIL_POLICY.value:
+                speculation.start("detail", detail_rag_tool, user_message)
+            else:
+                speculation.start("overview", overview_rag_tool, user_message)
+        return credit
+
+    async def speculate_personalized(profile, credit):
+        if credit_shortage(credit, cost=1) is None:
+            speculation.start(
+                "personalized", detail_rag_tool, " ".join(profile["keywords"])
+            )
+
+    # 입력 분류만 대화 기록이 필요하고 프로필 조회/크레딧 확인은 서로 독립이므로,
+    # 첫 토큰 전 대기 시간은 (대화 기록 로드 + 입력 분류)와 DB 조회 중 긴 쪽이 됨
+    graph = TaskGraph()
+    graph.add("history", load_history)
+    graph.add("classification", classify, deps=("history",))
+    graph.add("profile", lambda: get_profile_data(int(user_id)))
+    graph.add("credit", load_credit)
+    if personal and speculation.enabled:
+        graph.add("speculation", speculate_personalized, deps=("profile", "credit"))
+    try:
+        results = await graph.run()
+    except BaseException:
+        speculation.cancel()
+        raise
+    logger.info(
+        "응답 전처리 %.0fms (%s)",
+        graph.elapsed * 1000,
+        ", ".join(
+            f"{name}={seconds * 1000:.0f}ms" for name, seconds in graph.timings.items()
+        ),
     )
+    chat_history = results["history"]
+    classification_result = results["classification"]
 
-    category = classification_result["category"]
     # 2차적으로 LLM이 한국말의 문맥을 판단 못하는 경우를 대비해서 특정 키워드가 있으면 분류 결과 재조정
-    if category not in [Category.OFF_TOPIC.value, Category.PERSONALIZED.value]:
-        manual_category = manual_classifier(user_message)
-
-        if (
-            classification_result["is_followup"]
-            and manual_category == Category.DETAIL_POLICY.value
-        ):
-            category = Category.DETAIL_POLICY.value
-        elif manual_category and manual_category != category:
-            category = manual_category
+    category = resolve_category(classification_result, manual_category)
 
     # 유저 프로필 정보 및 키워드 추출
-    profile_data = await get_profile_data(int(user_id))
+    profile_data = results["profile"]
 
     profile = profile_data["profile"]
     profile_keywords = profile_data["keywords"]
     print(f"classification_result >>>> {classification_result}")
     llm_keywords = classification_result.get("keywords")
     print(f"{type(llm_keywords)}, {llm_keywords}")
-    if user_message == "4테이토":
-        async for chunk in fortato(user_message):
-            yield chunk
-        return
 
     # 사용자 입력에 따른 분기 처리
     if not is_report:
+        # 체인의 검색 단계와 같은 툴/쿼리의 추측 검색 이름과 실제 검색 쿼리
+        speculative_name = None
+        search_query = " ".join(llm_keywords)
         if category == Category.OFF_TOPIC.value:
+            speculation.cancel()
             yield "정책 및 지원에 관한 내용을 물어봐주시면 친절하게 답변해드릴 수 있습니다."
             return
 
         elif category in [Category.GOV_POLICY.value, Category.SUPPORT_RELATED.value]:
-            try:
-                await check_and_deduct_credit(int(user_id), cost=1)
-            except User.DoesNotExist:
-                yield "사용자 정보를 찾을 수 없습니다. 다시 로그인해주세요."
-                return
-            except ValueError as e:
-                yield str(e)
-                return
             chain = OVERVIEW_CHAIN
+            speculative_name = "overview"
 
         elif category == Category.DETAIL_POLICY.value:
-            try:
-                await check_and_deduct_credit(int(user_id), cost=1)
-            except User.DoesNotExist:
-                yield "사용자 정보를 찾을 수 없습니다. 다시 로그인해주세요."
-                return
-            except ValueError as e:
-                yield str(e)
-                return
             chain = DETAIL_CHAIN
+            speculative_name = "detail"
 
         elif category == Category.PERSONALIZED.value:
             if not profile_keywords:
+                speculation.cancel()
                 yield "프로필 정보를 입력 후에 이용하실 수 있습니다."
                 return
 
-            try:
-                await check_and_deduct_credit(int(user_id), cost=1)
-            except User.DoesNotExist:
-                yield "사용자 정보를 찾을 수 없습니다. 다시 로그인해주세요."
-                return
-            except ValueError as e:
-                yield str(e)
-                return
-
             chain = PERSONALIZED_CHAIN
+            speculative_name = "personalized"
+            search_query = " ".join(profile_keywords + [llm_keywords])
         else:
+            speculation.cancel()
             yield "죄송합니다. 질문을 절확히 이해하지 못했습니다. 다시 한번 질문해주실 수 있을까요?"
+            return
+
+        shortage = credit_shortage(results["credit"], cost=1)
+        if shortage:
+            speculation.cancel()
+            yield shortage
+            return
+        # 사전 확인을 통과했으므로 차감은 응답 생성과 동시에 진행
+        deduction = asyncio.ensure_future(deduct_credit(int(user_id), cost=1))
+
+        # 이어지는 질문은 대화 맥락이 키워드에 들어가므로 원본 메시지로 미리 검색한 결과는 쓰지 않음
+        context = None
+        if (
+            speculative_name == "personalized"
+            or not classification_result["is_followup"]
+        ):
+            context = await speculation.take(speculative_name, search_query)
+        speculation.cancel()
     else:
+        speculation.cancel()
         if category != Category.OFF_TOPIC.value:
-            try:
-                await check_and_deduct_credit(int(user_id), cost=50)
-            except User.DoesNotExist:
-                yield "사용자 정보를 찾을 수 없습니다. 다시 로그인해주세요."
-                return
-            except ValueError as e:
-                yield str(e)
+            error = credit_shortage(results["credit"], cost=50) or await deduct_credit(
+                int(user_id), cost=50
+            )
+            if error:
+                yield error
                 return
 
             user_input = {
@@ -172,34 +259,120 @@ async def get_chatbot_response(
             yield "정책 및 지원에 관한 내용을 물어봐주시면 친절하게 답변해드릴 수 있습니다."
             return
 
-    # 스트리밍 실행
+    # 스트리밍 실행 (동시에 진행한 크레딧 차감이 실패했으면 첫 청크를 보내기 전에 중단)
+    chain_input = {
+        "question": classification_result["original_input"],
+        "keywords": llm_keywords,
+        "chat_history": chat_history,
+        "profile": profile_keywords + [llm_keywords],
+        "profile_text": profile,
+    }
+    if context is not None:
+        chain_input["context"] = context
     output_response = ""
-    async for chunk in chain.astream(
-        {
-            "question": classification_result["original_input"],
-            "keywords": llm_keywords,
-            "chat_history": chat_history,
-            "profile": profile_keywords + [llm_keywords],
-            "profile_text": profile,
-        }
+    async for chunk, answered in stream_with_deduction(
+        chain.astream(chain_input), deduction, int(user_id), cost=1
     ):
-        output_response += chunk
         yield chunk
+        if not answered:
+            return
+        output_response += chunk
 
     # 멀티턴 메모리에 저장
     memory.save_context({"human": user_message}, {"ai": output_response})
 
 
+async def stream_with_deduction(chunks, deduction, user_id: int, cost: int):
+    """
+    응답 청크를 넘기면서, 응답 생성과 동시에 진행한 크레딧 차감을 마무리.
+
+    - 첫 청크를 보내기 전에 차감 결과를 확인하고, 실패했으면 안내 메시지만 보내고 중단.
+    - 첫 청크 전에 응답 생성이 실패하면 차감 결과를 확인해, 차감되었으면 되돌리고 예외를 다시
+      발생시키고 차감도 실패했으면 안내 메시지를 보냄.
+    - 스트림이 중간에 닫혀도 차감 태스크의 결과를 회수.
+
+    Args:
+        chunks (AsyncIterator[str]): 체인의 응답 청크 스트림.
+        deduction (asyncio.Future | None): `deduct_credit` 태스크. None이면 차감 확인 없이 전달.
+        user_id (int): 사용자 ID.
+        cost (int): 차감한 크레딧.
+
+    Yields:
+        tuple: (청크, 응답 여부). 차감 실패 안내 메시지는 응답 여부가 False.
+    """
+    try:
+        async for chunk in chunks:
+            if deduction is not None:
+                error = await deduction
+                deduction = None
+                if error:
+                    yield error, False
+                    return
+            yield chunk, True
+    except Exception:
+        if deduction is None:
+            raise
+        error = await deduction
+        deduction = None
+        if error is None:
+            await refund_credit(user_id, cost=cost)
+            raise
+        yield error, False
+    finally:
+        if deduction is not None:
+            await deduction
+
+
+@database_sync_to_async
+def get_credit(user_id: int):
+    """크레딧 사전 확인용 잔여 크레딧 조회 (잠금 없음). 사용자가 없으면 None."""
+    return User.objects.filter(id=user_id).values_list("credit", flat=True).first()
+
+
+def credit_shortage(credit, cost: int):
+    """
+    사전 조회한 잔여 크레딧으로 차감 가능 여부를 확인.
+
+    Returns:
+        str | None: 차감할 수 없으면 사용자에게 보낼 안내 메시지, 가능하면 None.
+    """
+    if credit is None:
+        return USER_NOT_FOUND_MESSAGE
+    if credit < cost:
+        return CREDIT_REQUIRED_MESSAGE.format(cost=cost)
+    return None
+
+
+async def deduct_credit(user_id: int, cost: int):
+    """
+    크레딧 차감.
+
+    Returns:
+        str | None: 차감에 실패하면 사용자에게 보낼 안내 메시지, 성공하면 None.
+    """
+    try:
+        await check_and_deduct_credit(user_id, cost=cost)
+    except User.DoesNotExist:
+        return USER_NOT_FOUND_MESSAGE
+    except ValueError as e:
+        return str(e)
+    return None
+
+
 @database_sync_to_async
 def check_and_deduct_credit(user_id: int, cost: int = 1) -> User:
     with transaction.atomic():
         user = User.objects.select_for_update().get(id=user_id)
 
         if user.credit < cost:
-            raise ValueError(
-                f"AInfo를 이용하기 위해서는 최소 {cost} 크레딧이 필요합니다."
-            )
+            raise ValueError(CREDIT_REQUIRED_MESSAGE.format(cost=cost))
 
         user.credit -= cost
         user.save()
         return user
+
+
+@database_sync_to_async
+def refund_credit(user_id: int, cost: int):
+    """응답을 만들지 못한 요청의 차감 크레딧을 되돌림."""
+    User.objects.filter(id=user_id).update(credit=F("credit") + cost)
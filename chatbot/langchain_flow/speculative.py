@@ -0,0 +1,166 @@
+"""
+추측 검색 (speculative.py)
+- 입력 분류 LLM 응답을 기다리는 동안 원본 메시지(개인화는 프로필 키워드)로 RAG 검색을 미리 시작
+- 분류 결과로 정해진 실제 검색 쿼리가 추측 쿼리와 충분히 겹치면 미리 검색한 컨텍스트를 체인에
+  넘겨 체인의 검색 단계를 생략하고, 겹치지 않거나 검색이 필요 없는 분류(off_topic 등)면 취소
+- 적중률과 절약한 지연시간을 누적 통계로 기록
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from chatbot.retrieval.normalize import compact_text
+
+logger = logging.getLogger(__name__)
+
+
+def _bigrams(text):
+    """공백을 제거한 정규화 문자열의 문자 bigram 집합 (한 글자면 그 글자)."""
+    text = compact_text(text)
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def keyword_overlap(a, b):
+    """
+    두 쿼리의 문자 bigram Dice 계수 (0~1).
+
+    - 띄어쓰기, 대소문자, 전각/반각 차이는 무시.
+    - 임베딩 없이 계산하므로 추측 검색을 재사용할지 판단하는 데 추가 API 호출이 없음.
+    """
+    left, right = _bigrams(a), _bigrams(b)
+    if not left or not right:
+        return 0.0
+    return 2 * len(left & right) / (len(left) + len(right))
+
+
+class SpeculativeRetrieval:
+    """
+    요청 하나에서 미리 시작한 RAG 검색들을 관리.
+
+    - `start`로 이름마다 검색 툴의 비동기 호출을 시작하고, 분류가 끝나면 `take`로 실제 쿼리와
+      비교해 재사용하거나 `cancel`로 취소.
+    - 취소하면 검색 코루틴은 바로 멈추지만, 이미 검색기 스레드 풀에 들어간 컬렉션 조회는
+      컬렉션 타임아웃 안에서 끝나고 결과만 버려짐.
+
+    Args:
+        enabled (bool, optional): 추측 검색 사용 여부. None이면 SPECULATIVE_RETRIEVAL 설정.
+        min_overlap (float, optional): 재사용할 최소 `keyword_overlap`.
+            None이면 SPECULATIVE_RETRIEVAL_MIN_OVERLAP 설정.
+    """
+
+    stats = Counter()
+    _stats_lock = threading.Lock()
+
+    def __init__(self, enabled=None, min_overlap=None):
+        self.enabled = settings.SPECULATIVE_RETRIEVAL if enabled is None else enabled
+        self.min_overlap = (
+            settings.SPECULATIVE_RETRIEVAL_MIN_OVERLAP
+            if min_overlap is None
+            else min_overlap
+        )
+        self.pending = {}
+
+    def start(self, name, tool, query):
+        """
+        검색 툴의 비동기 호출을 백그라운드 태스크로 시작.
+
+        Args:
+            name (str): 추측 검색 이름 (체인별 검색 단계).
+            tool: `ainvoke({"query": ...})`를 제공하는 검색 툴.
+            query (str): 추측 쿼리.
+        """
+        if not self.enabled or not query.strip() or name in self.pending:
+            return
+        timing = {}
+
+        async def run():
+            start = time.perf_counter()
+            try:
+                return await tool.ainvoke({"query": query})
+            finally:
+                timing["finished"] = time.perf_counter()
+                timing["duration"] = timing["finished"] - start
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(_discard_result)
+        self.pending[name] = (query, task, timing)
+        self._record_stats(started=1)
+
+    async def take(self, name, query):
+        """
+        실제 검색 쿼리가 추측 쿼리와 충분히 겹치면 미리 검색한 컨텍스트를 반환.
+
+        - 겹치지 않으면 추측 검색을 취소하고 None을 반환하므로 체인이 직접 검색.
+        - 추측 검색이 실패해도 None을 반환 (체인이 다시 검색).
+
+        Returns:
+            str | None: 재사용할 검색 컨텍스트.
+        """
+        if name not in self.pending:
+            return None
+        speculative_query, task, timing = self.pending.pop(name)
+        overlap = keyword_overlap(speculative_query, query)
+        if overlap < self.min_overlap:
+            task.cancel()
+            self._record_stats(misses=1, cancelled=1)
+            logger.info("추측 검색 미사용 (%s, 겹침 %.2f)", name, overlap)
+            return None
+
+        requested = time.perf_counter()
+        try:
+            context = await task
+        except Exception as e:
+            self._record_stats(errors=1)
+            logger.warning("추측 검색 실패 (%s): %s", name, e)
+            return None
+        # 지금 검색을 시작했다면 걸렸을 시간 - 실제로 기다린 시간
+        waited = max(timing["finished"] - requested, 0.0)
+        saved_ms = int((timing["duration"] - waited) * 1000)
+        self._record_stats(hits=1, latency_saved_ms=saved_ms)
+        logger.info(
+            "추측 검색 재사용 (%s, 겹침 %.2f, %dms 절약)", name, overlap, saved_ms
+        )
+        return context
+
+    def cancel(self):
+        """아직 사용하지 않은 추측 검색을 모두 취소."""
+        for _, task, _ in self.pending.values():
+            task.cancel()
+        if self.pending:
+            self._record_stats(cancelled=len(self.pending))
+        self.pending.clear()
+
+    @classmethod
+    def get_stats(cls):
+        """
+        누적 추측 검색 통계 반환.
+
+        Returns:
+            dict: started(시작한 추측 검색 수), hits/misses(쿼리 비교 후 재사용 / 미사용 수),
+                cancelled(사용하지 않고 취소한 수), errors(추측 검색 실패 수),
+                latency_saved_ms(재사용으로 줄인 검색 대기 시간 합계),
+                hit_rate(hits / (hits + misses)).
+        """
+        with cls._stats_lock:
+            stats = dict(cls.stats)
+        compared = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = stats.get("hits", 0) / compared if compared else 0.0
+        return stats
+
+    @classmethod
+    def _record_stats(cls, **counts):
+        with cls._stats_lock:
+            cls.stats.update(counts)
+
+
+def _discard_result(task):
+    """취소되거나 사용하지 않은 추측 검색의 예외가 경고로 남지 않도록 확인만 함."""
+    if not task.cancelled():
+        task.exception()
@@ -1,43 +1,101 @@
+import asyncio
+import logging
 from typing import Optional
 
-from langchain.tools import tool
+from django.conf import settings
+from langchain.tools import StructuredTool
 from pydantic import BaseModel, Field
 
 from chatbot.retriever import VectorRetriever
 
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAMES = [
+    "gov24_services",
+    "youth_policy_list",
+    "mongddang_data",
+    "fifty_portal_edu_data",
+]
+
 
 class RAGsearchInput(BaseModel):
     query: str = Field(..., description="Question or keywords to search for")
     k: Optional[int] = Field(
-        3, description="Number of documents to retrieve per collection"
+        5,
+        description="Number of unique documents to retrieve across all collections",
     )
     filters: Optional[dict] = Field(
         None, description="Metadata filters for document retrieval"
     )
 
 
-@tool("overview_rag_tool", args_schema=RAGsearchInput)
-def overview_rag_tool(
+def overview_rag_search(
     query: str,
-    k: int = 3,
+    k: int = 5,
     filters: Optional[dict] = None,
 ) -> str:
     """
     Perform similarity-based document retrieval from multiple Chroma collections
     and returns the results as a formatted string.
 
+    The same policy stored in several collections is returned only once,
+    and at most k unique documents are returned in total. The formatted context
+    is kept within RAG_CONTEXT_MAX_TOKENS tokens. Results are diversified (MMR)
+    so near-identical programs registered in many districts do not fill the list.
+
     Extracts policy-related documents based on the given search query
     """
 
-    collection_names = [
-        "gov24_service_list",
-        "youth_policy_list",
-        "employment_programs",
-        "pdf_sections",
-    ]
-
     retriever = VectorRetriever()
-    docs = retriever.search(
-        query=query, k=k, filters=filters, collection_names=collection_names
+    _, context = retriever.search_and_format(
+        query=query,
+        k=k,
+        filters=filters,
+        collection_names=COLLECTION_NAMES,
+        mode="hybrid",
+        max_tokens=settings.RAG_CONTEXT_MAX_TOKENS,
+        diversify=True,
     )
-    return retriever.format_docs(docs)
+    return context
+
+
+async def aoverview_rag_search(
+    query: str,
+    k: int = 5,
+    filters: Optional[dict] = None,
+) -> str:
+    """
+    `overview_rag_search`의 비동기 버전.
+
+    - 쿼리 임베딩은 비동기 API로, 컬렉션 조회는 검색기 스레드 풀에서 실행하므로 `astream`으로
+      실행하는 체인에서 이벤트 루프를 막지 않고 웹 검색과 동시에 진행됨.
+    - RAG_TOOL_TIMEOUT 안에 끝나지 않으면 빈 컨텍스트를 반환.
+    """
+    retriever = VectorRetriever()
+    try:
+        _, context = await asyncio.wait_for(
+            retriever.asearch_and_format(
+                query=query,
+                k=k,
+                filters=filters,
+                collection_names=COLLECTION_NAMES,
+                mode="hybrid",
+                max_tokens=settings.RAG_CONTEXT_MAX_TOKENS,
+                diversify=True,
+            ),
+            timeout=settings.RAG_TOOL_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "RAG 검색 시간 초과 (%.1f초): %s", settings.RAG_TOOL_TIMEOUT, query
+        )
+        return ""
+    return context
+
+
+overview_rag_tool = StructuredTool.from_function(
+    func=overview_rag_search,
+    coroutine=aoverview_rag_search,
+    name="overview_rag_tool",
+    args_schema=RAGsearchInput,
+)
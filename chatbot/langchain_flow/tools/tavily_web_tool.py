@@ -1,9 +1,14 @@
+import asyncio
+import logging
 from typing import Optional
 
-from langchain.tools import tool
+from django.conf import settings
+from langchain.tools import StructuredTool
 from langchain_community.tools.tavily_search import TavilySearchResults
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 tavily = TavilySearchResults(k=4)
 
 
@@ -14,11 +19,38 @@ class TavilySearchInput(BaseModel):
     )
 
 
-@tool("tavily_web_search_tool", args_schema=TavilySearchInput)
-def tavily_web_search_tool(query: str, k: Optional[int] = 4) -> str:
+def tavily_web_search(query: str, k: Optional[int] = 4) -> str:
     """
     A web search tool using Tavily.
     Useful for retrieving up-to-date information from the web.
     """
     search_tool = TavilySearchResults(k=k)
     return search_tool.run(query)
+
+
+async def atavily_web_search(query: str, k: Optional[int] = 4) -> str:
+    """
+    `tavily_web_search`의 비동기 버전.
+
+    - Tavily 비동기 API(aiohttp)로 요청하므로 검색 동안 스레드를 점유하지 않음.
+    - WEB_SEARCH_TIMEOUT 안에 응답이 없으면 빈 결과를 반환해, 느린 웹 검색이 응답 생성을
+      붙잡지 않게 함.
+    """
+    search_tool = TavilySearchResults(k=k)
+    try:
+        return await asyncio.wait_for(
+            search_tool.arun(query), timeout=settings.WEB_SEARCH_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "웹 검색 시간 초과 (%.1f초): %s", settings.WEB_SEARCH_TIMEOUT, query
+        )
+        return ""
+
+
+tavily_web_search_tool = StructuredTool.from_function(
+    func=tavily_web_search,
+    coroutine=atavily_web_search,
+    name="tavily_web_search_tool",
+    args_schema=TavilySearchInput,
+)
@@ -0,0 +1,54 @@
+"""
+적응형 k (adaptive_k.py)
+- 요청한 k를 고정으로 쓰지 않고, 벡터 거리 분포를 보고 돌려줄 결과 수를 정함
+- 상위 문서 뒤에 거리가 크게 벌어지는 지점이 있으면 그 앞에서 멈추고(컨텍스트 토큰 절약),
+  거리가 고르게 붙어 있어 k번째 이후 문서도 비슷하게 관련 있으면 최대 k * ADAPTIVE_MAX_FACTOR개까지 늘림
+"""
+
+# 간격이 있어도 최소한 돌려줄 결과 수
+ADAPTIVE_MIN_K = 2
+# 거리 분포가 고를 때 늘릴 수 있는 최대 배수 (컬렉션 조회도 이만큼 가져옴)
+ADAPTIVE_MAX_FACTOR = 2
+# 다음 문서 거리가 직전 문서보다 이 비율 이상 크면 뚜렷한 간격으로 봄
+GAP_RATIO = 0.15
+# 1위 거리 대비 이 비율 안에 있는 문서는 1위와 구분되지 않는 것으로 봄
+FLAT_RATIO = 0.03
+
+
+def fetch_size(k):
+    """적응형 k를 쓸 때 컬렉션마다 조회할 후보 수."""
+    return k * ADAPTIVE_MAX_FACTOR
+
+
+def adaptive_cut(distances, k, min_k=ADAPTIVE_MIN_K, max_k=None):
+    """
+    거리 분포로 돌려줄 결과 수를 결정.
+
+    - min_k번째 이후 k번째까지 중 직전 대비 GAP_RATIO 이상 멀어지는 첫 지점에서 자름.
+    - 간격이 없고 k번째까지 모두 1위와 FLAT_RATIO 안이면, 그 범위 안에 드는 문서를
+      max_k개까지 더 포함.
+    - 그 외(후보가 k개보다 적은 경우 포함)에는 k를 그대로 사용.
+
+    Args:
+        distances (list): 거리 오름차순 리스트 (낮을수록 관련도 높음).
+        k (int): 요청한 결과 수.
+        min_k (int): 최소 결과 수.
+        max_k (int, optional): 최대 결과 수. None이면 k * ADAPTIVE_MAX_FACTOR.
+
+    Returns:
+        int: 돌려줄 결과 수.
+    """
+    max_k = fetch_size(k) if max_k is None else max_k
+    count = min(k, len(distances))
+    for i in range(min_k, count):
+        if distances[i] > distances[i - 1] * (1 + GAP_RATIO):
+            return i
+
+    if count < k:
+        return k
+    flat_limit = distances[0] * (1 + FLAT_RATIO)
+    if distances[count - 1] > flat_limit:
+        return k
+    while count < min(max_k, len(distances)) and distances[count] <= flat_limit:
+        count += 1
+    return count
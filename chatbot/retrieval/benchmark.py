@@ -0,0 +1,668 @@
+"""
+검색 성능 벤치마크 스크립트 (benchmark.py)
+- 저장된 컬렉션의 임베딩을 쿼리 벡터로 재사용하므로 임베딩 API를 호출하지 않음
+
+사용 예:
+    python -m chatbot.retrieval.benchmark filtered --collection unified_data
+    python -m chatbot.retrieval.benchmark backend --collection unified_data --backend numpy
+    python -m chatbot.retrieval.benchmark quantization --collection unified_data
+    python -m chatbot.retrieval.benchmark dimensions --collection unified_data
+    python -m chatbot.retrieval.benchmark region --collection unified_data
+    EMBEDDING_PROVIDER=hashing python -m chatbot.retrieval.benchmark indexing --docs 20000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import django
+import numpy as np
+from langchain_core.documents import Document
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from chatbot.retrieval.embedding_cache import (  # noqa: E402
+    CachedEmbeddings,
+    get_embedding_cache,
+)
+from chatbot.retrieval.embeddings import (  # noqa: E402
+    EMBEDDING_MODEL,
+    EMBEDDING_NATIVE_DIMENSIONS,
+    get_embedding_dimensions,
+    get_embedding_provider,
+)
+from chatbot.retrieval.hashing_embeddings import HASHING_MODEL  # noqa: E402
+from chatbot.retrieval.regions import (  # noqa: E402
+    NATIONWIDE,
+    PROVINCES,
+    REGION_KEY_FIELD,
+)
+from chatbot.retrieval.snapshot import (  # noqa: E402
+    QUANTIZATIONS,
+    NumpySnapshot,
+    export_snapshot,
+    snapshot_path,
+)
+from chatbot.retriever import VectorRetriever  # noqa: E402
+
+
+def load_collection_matrix(retriever, collection_name):
+    """
+    컬렉션 전체의 ID, 임베딩 행렬, 메타데이터를 로드.
+
+    Returns:
+        tuple: (ids 리스트, float32 임베딩 행렬, 메타데이터 리스트)
+    """
+    collection = retriever.collections[collection_name]
+    result = collection.get(include=["embeddings", "metadatas"])
+    matrix = np.asarray(result["embeddings"], dtype=np.float32)
+    return result["ids"], matrix, result["metadatas"]
+
+
+def exact_top_k(matrix, query, k, mask=None):
+    """
+    전수 비교로 구한 정답 top-k 행 번호 (Chroma 기본 거리와 같은 제곱 L2 기준).
+    """
+    distances = ((matrix - query) ** 2).sum(axis=1)
+    if mask is not None:
+        distances = np.where(mask, distances, np.inf)
+    order = np.argsort(distances)[:k]
+    return [i for i in order if np.isfinite(distances[i])]
+
+
+def percentile(values, pct):
+    """단순 백분위수 (ms 단위 리스트 대상)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_row(label, recalls, latencies):
+    """벤치마크 결과 한 줄 출력."""
+    print(
+        f"{label:<18} recall@k={statistics.mean(recalls):.3f}  "
+        f"p50={percentile(latencies, 50):.2f}ms  "
+        f"p95={percentile(latencies, 95):.2f}ms"
+    )
+
+
+def read_rss():
+    """
+    현재 프로세스의 RSS(MB)와 그중 파일 매핑(mmap 등 워커 간 공유 가능) 부분.
+
+    Returns:
+        tuple: (전체 RSS, 파일 매핑 RSS). /proc이 없으면 (0.0, 0.0).
+    """
+    values = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssFile"):
+                    values[key] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return values.get("VmRSS", 0.0), values.get("RssFile", 0.0)
+
+
+def print_latency_row(label, latencies, rss_before):
+    """백엔드 벤치마크 결과 한 줄 출력."""
+    rss, rss_file = read_rss()
+    print(
+        f"{label:<18} p50={percentile(latencies, 50):.2f}ms  "
+        f"p99={percentile(latencies, 99):.2f}ms  "
+        f"RSS +{rss - rss_before:.1f}MB (총 {rss:.1f}MB, 파일 매핑 {rss_file:.1f}MB)"
+    )
+
+
+def load_snapshot(retriever, collection_name, quantization):
+    """
+    dataload가 내보낸 스냅샷을 로드. 없거나 해당 양자화 행렬이 없으면 임시 디렉터리로
+    내보낸 뒤 로드.
+    """
+    path = snapshot_path(settings.RETRIEVER_INDEX_DIR, collection_name)
+    try:
+        snapshot = NumpySnapshot.load(path, quantization=quantization)
+    except FileNotFoundError:
+        snapshot = None
+    if snapshot is None:
+        path = os.path.join(tempfile.mkdtemp(), collection_name)
+        export_snapshot(
+            retriever.collections[collection_name], path, quantization=quantization
+        )
+        snapshot = NumpySnapshot.load(path, quantization=quantization)
+    return snapshot
+
+
+def bench_backend(args):
+    """
+    Chroma 조회와 NumPy mmap 스냅샷 전수 검색의 지연시간/메모리 비교.
+
+    - 스냅샷이 없으면 임시 디렉터리로 내보낸 뒤 사용.
+    - RSS는 백엔드별 증가분을 출력하므로, 정확히 비교하려면 --backend로 하나씩 실행.
+    - numpy-batch는 --batch개 쿼리를 한 번의 행렬곱으로 처리했을 때의 쿼리당 지연시간.
+    """
+    rss_start, _ = read_rss()
+    retriever = VectorRetriever.local()
+    collection = retriever.collections[args.collection]
+    ids, matrix, _ = load_collection_matrix(retriever, args.collection)
+    if len(ids) == 0:
+        print(f"'{args.collection}' 컬렉션이 비어 있습니다.")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    queries = matrix[rng.integers(0, len(ids), args.samples)]
+    queries = queries + rng.normal(0, 0.01, queries.shape).astype(np.float32)
+    del matrix
+
+    print(
+        f"\n=== backend: {args.collection} "
+        f"({len(ids)}건, 샘플 {args.samples}개, k={args.k}) ==="
+    )
+    rss_before, _ = read_rss()
+    print(
+        f"{'baseline':<18} RSS {rss_before - rss_start:+.1f}MB (총 {rss_before:.1f}MB)"
+    )
+
+    chroma_hits = []
+    if args.backend in ("chroma", "both"):
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            hits = collection.similarity_search_by_vector_with_relevance_scores(
+                query.tolist(), k=args.k
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            chroma_hits.append({doc.id for doc, _ in hits})
+        print_latency_row("chroma", latencies, rss_before)
+        rss_before, _ = read_rss()
+
+    if args.backend in ("numpy", "both"):
+        snapshot = load_snapshot(retriever, args.collection, args.quantization)
+
+        latencies, overlaps = [], []
+        for i, query in enumerate(queries):
+            start = time.perf_counter()
+            hits = snapshot.search(query, args.k)[0]
+            latencies.append((time.perf_counter() - start) * 1000)
+            if chroma_hits:
+                found = {doc.id for doc, _ in hits}
+                overlaps.append(len(found & chroma_hits[i]) / max(len(found), 1))
+        print_latency_row(f"numpy({args.quantization})", latencies, rss_before)
+
+        latencies = []
+        for start_row in range(0, len(queries), args.batch):
+            batch = queries[start_row : start_row + args.batch]
+            start = time.perf_counter()
+            snapshot.search(batch, args.k)
+            latencies.append((time.perf_counter() - start) * 1000 / len(batch))
+        print_latency_row(f"numpy-batch({args.batch})", latencies, rss_before)
+        if overlaps:
+            print(f"chroma 결과와 top-{args.k} 일치율: {statistics.mean(overlaps):.3f}")
+
+
+def bench_quantization(args):
+    """
+    양자화 모드별 recall@k / 지연시간 / 상주 행렬 크기 비교.
+
+    - 정답은 float32 원본 전수 검색 top-k.
+    - rescore 열은 양자화 후보를 float32로 재계산한 결과, raw 열은 양자화 거리만 쓴 결과.
+    """
+    retriever = VectorRetriever.local()
+    ids, matrix, _ = load_collection_matrix(retriever, args.collection)
+    if len(ids) == 0:
+        print(f"'{args.collection}' 컬렉션이 비어 있습니다.")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    queries = matrix[rng.integers(0, len(ids), args.samples)]
+    queries = queries + rng.normal(0, args.noise, queries.shape).astype(np.float32)
+    truth = [set(exact_top_k(matrix, query, args.k)) for query in queries]
+    del matrix
+
+    print(
+        f"\n=== quantization: {args.collection} "
+        f"({len(ids)}건, 샘플 {args.samples}개, k={args.k}) ==="
+    )
+    for quantization in QUANTIZATIONS:
+        snapshot = load_snapshot(retriever, args.collection, quantization)
+        recalls = {"rescore": [], "raw": []}
+        latencies = []
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            hits = snapshot.search(query, args.k)[0]
+            latencies.append((time.perf_counter() - start) * 1000)
+            raw = snapshot.search(query, args.k, rescore=False)[0]
+            for key, found in (("rescore", hits), ("raw", raw)):
+                found = {snapshot.positions[doc.id] for doc, _ in found}
+                recalls[key].append(len(found & expected) / len(expected))
+        print(
+            f"{quantization:<8} recall@k rescore={statistics.mean(recalls['rescore']):.3f} "
+            f"raw={statistics.mean(recalls['raw']):.3f}  "
+            f"p50={percentile(latencies, 50):.2f}ms  "
+            f"p99={percentile(latencies, 99):.2f}ms  "
+            f"상주 행렬 {snapshot.scan_nbytes / 1024 / 1024:.1f}MB"
+        )
+
+
+def truncate_normalize(matrix, dimensions):
+    """text-embedding-3 dimensions 옵션과 같은 방식(앞부분 절단 후 L2 정규화)으로 차원 축소."""
+    reduced = matrix[:, :dimensions]
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    return reduced / np.where(norms > 0, norms, 1.0)
+
+
+def bench_dimensions(args):
+    """
+    임베딩 차원별 정답 문서 적중률 / 전체 차원 대비 recall@k / 지연시간 / 행렬 크기 비교.
+
+    - 저장된 기본 차원(1536) 벡터를 절단+정규화해 각 차원을 재현하므로 재임베딩이 필요 없음.
+    - 쿼리는 샘플 문서의 정책명을 임베딩한 것이고, 정답은 그 문서 (answer hit@k).
+      --offline이면 API 대신 저장된 벡터에 잡음을 더해 쿼리로 사용.
+    """
+    retriever = VectorRetriever.local()
+    ids, matrix, metadatas = load_collection_matrix(retriever, args.collection)
+    if len(ids) == 0:
+        print(f"'{args.collection}' 컬렉션이 비어 있습니다.")
+        return
+    if matrix.shape[1] != EMBEDDING_NATIVE_DIMENSIONS:
+        print(
+            f"저장된 벡터가 {matrix.shape[1]}차원입니다. 절단 비교는 "
+            f"{EMBEDDING_NATIVE_DIMENSIONS}차원으로 로드한 컬렉션에서만 의미가 있습니다."
+        )
+
+    rng = np.random.default_rng(args.seed)
+    answers = rng.choice(len(ids), size=min(args.samples, len(ids)), replace=False)
+    if args.offline:
+        queries = matrix[answers] + rng.normal(
+            0, args.noise, (len(answers), matrix.shape[1])
+        )
+    else:
+        # 기본 차원으로 한 번만 임베딩하고 차원별로 절단해서 재사용
+        from langchain_openai import OpenAIEmbeddings
+
+        model = CachedEmbeddings(
+            OpenAIEmbeddings(model=EMBEDDING_MODEL),
+            get_embedding_cache(EMBEDDING_MODEL),
+        )
+        names = [str(metadatas[i].get("name", "")) for i in answers]
+        queries = np.asarray(model.embed_documents(names))
+    queries = queries.astype(np.float32)
+
+    full_docs = truncate_normalize(matrix, matrix.shape[1])
+    full_queries = truncate_normalize(queries, matrix.shape[1])
+    reference = [set(exact_top_k(full_docs, query, args.k)) for query in full_queries]
+
+    print(
+        f"\n=== dimensions: {args.collection} "
+        f"({len(ids)}건, 샘플 {len(answers)}개, k={args.k}) ==="
+    )
+    for dimensions in sorted({int(d) for d in args.dims.split(",")}, reverse=True):
+        if dimensions > matrix.shape[1]:
+            continue
+        docs = np.ascontiguousarray(truncate_normalize(matrix, dimensions))
+        reduced = truncate_normalize(queries, dimensions)
+        hits, recalls, latencies = [], [], []
+        for answer, query, expected in zip(answers, reduced, reference):
+            start = time.perf_counter()
+            scores = docs @ query
+            top = np.argpartition(-scores, args.k - 1)[: args.k]
+            latencies.append((time.perf_counter() - start) * 1000)
+            found = set(top.tolist())
+            hits.append(1.0 if answer in found else 0.0)
+            recalls.append(len(found & expected) / len(expected))
+        print(
+            f"{dimensions:>5}d  answer hit@k={statistics.mean(hits):.3f}  "
+            f"recall@k(vs {matrix.shape[1]}d)={statistics.mean(recalls):.3f}  "
+            f"p50={percentile(latencies, 50):.2f}ms  "
+            f"행렬 {docs.nbytes / 1024 / 1024:.1f}MB"
+        )
+
+
+def bench_filtered(args):
+    """
+    메타데이터 필터 검색 전/후 비교.
+
+    - before: 필터 없이 top-k를 가져온 뒤 후처리로 거르는 기존 방식
+    - after : 역색인 기반 where 조건 / 점진적 over-fetch를 사용하는 현재 방식
+    - 정답은 필터를 만족하는 문서 전체에 대한 전수 비교 top-k
+    """
+    retriever = VectorRetriever.local()
+    collection = retriever.collections[args.collection]
+    ids, matrix, metadatas = load_collection_matrix(retriever, args.collection)
+    if len(ids) == 0:
+        print(f"'{args.collection}' 컬렉션이 비어 있습니다.")
+        return
+
+    rng = random.Random(args.seed)
+    recalls = {"before": [], "after": []}
+    latencies = {"before": [], "after": []}
+
+    for _ in range(args.samples):
+        # 크루 툴과 같은 방식으로 name/region 앞 2글자를 필터로 사용
+        source = metadatas[rng.randrange(len(ids))]
+        filters = {
+            key: str(source[key])[:2]
+            for key in ("name", "region")
+            if source.get(key) and rng.random() < 0.7
+        } or {"region": str(source.get("region", ""))[:2]}
+        query = matrix[rng.randrange(len(ids))]
+
+        mask = np.array(
+            [retriever._metadata_match(meta, filters) for meta in metadatas]
+        )
+        truth = {ids[i] for i in exact_top_k(matrix, query, args.k, mask)}
+        if not truth:
+            continue
+
+        start = time.perf_counter()
+        hits = collection.similarity_search_by_vector_with_relevance_scores(
+            query.tolist(), k=args.k
+        )
+        before = [
+            doc.id
+            for doc, _ in hits
+            if retriever._metadata_match(doc.metadata, filters)
+        ]
+        latencies["before"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        hits = retriever._query_collection(
+            args.collection, query.tolist(), args.k, filters
+        )
+        after = [doc.id for doc, _ in hits]
+        latencies["after"].append((time.perf_counter() - start) * 1000)
+
+        recalls["before"].append(len(truth & set(before)) / len(truth))
+        recalls["after"].append(len(truth & set(after)) / len(truth))
+
+    print(
+        f"\n=== filtered search: {args.collection} "
+        f"({len(ids)}건, 유효 샘플 {len(recalls['after'])}개, k={args.k}) ==="
+    )
+    if not recalls["after"]:
+        print("필터를 만족하는 샘플이 없습니다.")
+        return
+    print_row("post-filter", recalls["before"], latencies["before"])
+    print_row("index/overfetch", recalls["after"], latencies["after"])
+
+
+def bench_region(args):
+    """
+    region 필터: 부분 문자열 필터 vs region_key 파티션 라우팅 비교.
+
+    - substring: "서울"처럼 앞 2글자를 region 메타데이터에 부분 문자열로 적용하는 기존 방식
+    - partition: 같은 값을 (시/도, 전국) 파티션으로 라우팅하는 방식
+    - 정답은 각 방식의 조건을 만족하는 문서 전체에 대한 전수 비교 top-k
+    """
+    retriever = VectorRetriever.local()
+    ids, matrix, metadatas = load_collection_matrix(retriever, args.collection)
+    keys = sorted(
+        {meta.get(REGION_KEY_FIELD) for meta in metadatas} - {None, NATIONWIDE}
+    )
+    if not keys:
+        print(f"'{args.collection}' 컬렉션에 region_key가 없습니다. 다시 적재하세요.")
+        return
+
+    rng = random.Random(args.seed)
+    variants = ("substring", "partition")
+    recalls = {variant: [] for variant in variants}
+    latencies = {variant: [] for variant in variants}
+    sizes = {variant: [] for variant in variants}
+    for _ in range(args.samples):
+        region = rng.choice(keys)
+        query = matrix[rng.randrange(len(ids))]
+        for variant in variants:
+            filters = {"region": region[:2]}
+            if variant == "partition":
+                filters = retriever._route_filters(
+                    {"region": region}, [args.collection]
+                )
+            mask = np.array(
+                [retriever._metadata_match(meta, filters) for meta in metadatas]
+            )
+            truth = {ids[i] for i in exact_top_k(matrix, query, args.k, mask)}
+
+            start = time.perf_counter()
+            hits = retriever._query_collection(
+                args.collection, query.tolist(), args.k, filters
+            )
+            latencies[variant].append((time.perf_counter() - start) * 1000)
+            sizes[variant].append(int(mask.sum()))
+            if truth:
+                found = {doc.id for doc, _ in hits}
+                recalls[variant].append(len(truth & found) / len(truth))
+
+    print(
+        f"\n=== region routing: {args.collection} "
+        f"({len(ids)}건, backend={retriever.backend}, k={args.k}) ==="
+    )
+    for variant in variants:
+        print_row(variant, recalls[variant], latencies[variant])
+        print(f"{'':<18} 평균 검색 대상 {statistics.mean(sizes[variant]):.0f}건")
+
+
+# indexing 벤치마크의 합성 문서 구성 요소
+SYNTHETIC_TOPICS = (
+    "월세 지원",
+    "취업 지원",
+    "창업 지원",
+    "교통비 지원",
+    "주거 지원",
+    "교육비 지원",
+    "자격증 취득 지원",
+    "마음건강 상담",
+    "문화 바우처",
+    "출산 장려금",
+    "직업 훈련",
+    "자산 형성 지원",
+)
+SYNTHETIC_TARGETS = (
+    "청년",
+    "중장년",
+    "신혼부부",
+    "대학생",
+    "구직자",
+    "소상공인",
+    "노인",
+    "1인 가구",
+)
+
+
+def synthetic_documents(count, seed):
+    """
+    실제 로더와 같은 page_content/메타데이터 형식의 합성 정책 문서 생성.
+
+    Returns:
+        list: Document 리스트 (정책명은 모두 다름).
+    """
+    rng = random.Random(seed)
+    regions = list(PROVINCES) + [NATIONWIDE]
+    documents = []
+    for i in range(count):
+        topic = rng.choice(SYNTHETIC_TOPICS)
+        target = rng.choice(SYNTHETIC_TARGETS)
+        region = rng.choice(regions)
+        name = f"{region} {target} {topic} {i}"
+        detail = " ".join(
+            f"{target}의 {rng.choice(SYNTHETIC_TOPICS)}을 위해 "
+            f"{rng.randint(1, 12)}개월간 월 {rng.randint(5, 50) * 10000}원을 지원합니다."
+            for _ in range(rng.randint(3, 8))
+        )
+        page_content = (
+            f"정책명/강좌명: {name}\n"
+            f"정책/강좌 내용: {detail}\n"
+            f"지원 대상: {target}\n"
+            f"카테고리/분야: {topic}\n"
+            f"지역: {region}\n"
+            f"상세보기 링크: https://example.com/policy/{i}"
+        )
+        documents.append(
+            Document(
+                page_content=page_content,
+                metadata={
+                    "name": name,
+                    "subject": target,
+                    "detail": detail,
+                    "link": f"https://example.com/policy/{i}",
+                    "region": region,
+                    "source": "synthetic",
+                },
+            )
+        )
+    return documents
+
+
+def bench_indexing(args):
+    """
+    합성 문서로 dataload 적재 파이프라인 처리량과 적재 후 검색 지연시간 측정.
+
+    - 임베딩 API 없이 돌리기 위한 벤치마크이므로 EMBEDDING_PROVIDER=hashing에서만 실행
+      (대상 컬렉션을 합성 문서로 교체함).
+    - embedding은 임베딩만, stage+save는 임베딩 + Chroma 저장, publish는 BM25/정책명/스냅샷/
+      지역 파티션 생성 시간. 임베딩 캐시 영향을 없애기 위해 캐시를 거치지 않은 모델을 사용.
+    - search는 적재한 컬렉션을 VectorRetriever로 조회한 지연시간 (쿼리 임베딩 포함).
+      정책명 인덱스나 결과 캐시로 끝나지 않도록 서로 다른 지원 내용 문장을 쿼리로 사용.
+    """
+    model, _, _ = get_embedding_provider()
+    if model != HASHING_MODEL:
+        print(
+            "indexing 벤치마크는 컬렉션을 합성 문서로 교체하므로 "
+            "EMBEDDING_PROVIDER=hashing에서만 실행합니다."
+        )
+        return
+
+    from dataload.common import (
+        get_embeddings,
+        new_version,
+        publish_collections,
+        save_documents_with_progress,
+        stage_collection,
+    )
+
+    documents = synthetic_documents(args.docs, args.seed)
+    embeddings = get_embeddings().embeddings
+    timings = {}
+
+    start = time.perf_counter()
+    embeddings.embed_documents([doc.page_content for doc in documents])
+    timings["embedding"] = time.perf_counter() - start
+
+    version = new_version()
+    start = time.perf_counter()
+    collection = stage_collection(args.collection, version, embeddings)
+    save_documents_with_progress(collection, documents, batch_size=args.batch)
+    timings["stage+save"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    publish_collections([args.collection], version=version)
+    timings["publish"] = time.perf_counter() - start
+
+    print(
+        f"\n=== indexing: {args.collection} "
+        f"({len(documents)}건, {get_embedding_dimensions()}차원, 배치 {args.batch}) ==="
+    )
+    for label, seconds in timings.items():
+        print(f"{label:<18} {seconds:.2f}s  {len(documents) / seconds:.0f}건/s")
+
+    retriever = VectorRetriever.local()
+    rng = random.Random(args.seed)
+    queries = {
+        documents[i].metadata["detail"].split(". ")[0]
+        for i in rng.sample(range(len(documents)), min(args.samples, len(documents)))
+    }
+    rss_before, _ = read_rss()
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        retriever.search(query, k=args.k, collection_names=[args.collection])
+        latencies.append((time.perf_counter() - start) * 1000)
+    print_latency_row(f"search({retriever.backend})", latencies, rss_before)
+
+
+def main():
+    """
+    명령어 인자를 받아 벤치마크를 실행
+    """
+    parser = argparse.ArgumentParser(description="검색 성능 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    filtered = subparsers.add_parser(
+        "filtered", help="메타데이터 필터 검색 recall@k / 지연시간 비교"
+    )
+    filtered.add_argument("--collection", default="unified_data")
+    filtered.add_argument("--samples", type=int, default=100)
+    filtered.add_argument("--k", type=int, default=5)
+    filtered.add_argument("--seed", type=int, default=42)
+    filtered.set_defaults(func=bench_filtered)
+
+    region = subparsers.add_parser(
+        "region", help="region 부분 문자열 필터 vs 시/도 파티션 라우팅 비교"
+    )
+    region.add_argument("--collection", default="unified_data")
+    region.add_argument("--samples", type=int, default=100)
+    region.add_argument("--k", type=int, default=5)
+    region.add_argument("--seed", type=int, default=42)
+    region.set_defaults(func=bench_region)
+
+    backend = subparsers.add_parser(
+        "backend", help="Chroma / NumPy 스냅샷 백엔드 p50/p99 지연시간, RSS 비교"
+    )
+    backend.add_argument("--collection", default="unified_data")
+    backend.add_argument(
+        "--backend", choices=["chroma", "numpy", "both"], default="both"
+    )
+    backend.add_argument("--quantization", choices=QUANTIZATIONS, default="none")
+    backend.add_argument("--samples", type=int, default=200)
+    backend.add_argument("--batch", type=int, default=8)
+    backend.add_argument("--k", type=int, default=5)
+    backend.add_argument("--seed", type=int, default=42)
+    backend.set_defaults(func=bench_backend)
+
+    quantization = subparsers.add_parser(
+        "quantization", help="int8/float16 양자화 recall@k, 지연시간, 메모리 비교"
+    )
+    quantization.add_argument("--collection", default="unified_data")
+    quantization.add_argument("--samples", type=int, default=200)
+    quantization.add_argument("--k", type=int, default=5)
+    quantization.add_argument("--noise", type=float, default=0.01)
+    quantization.add_argument("--seed", type=int, default=42)
+    quantization.set_defaults(func=bench_quantization)
+
+    dimensions = subparsers.add_parser(
+        "dimensions", help="임베딩 차원별 정답 적중률, recall@k, 지연시간, 메모리 비교"
+    )
+    dimensions.add_argument("--collection", default="unified_data")
+    dimensions.add_argument("--dims", default="1536,1024,512,256")
+    dimensions.add_argument("--samples", type=int, default=200)
+    dimensions.add_argument("--k", type=int, default=5)
+    dimensions.add_argument("--offline", action="store_true")
+    dimensions.add_argument("--noise", type=float, default=0.02)
+    dimensions.add_argument("--seed", type=int, default=42)
+    dimensions.set_defaults(func=bench_dimensions)
+
+    indexing = subparsers.add_parser(
+        "indexing", help="합성 문서 적재 처리량 / 적재 후 검색 지연시간 (오프라인)"
+    )
+    indexing.add_argument("--collection", default="unified_data")
+    indexing.add_argument("--docs", type=int, default=5000)
+    indexing.add_argument("--batch", type=int, default=64)
+    indexing.add_argument("--samples", type=int, default=200)
+    indexing.add_argument("--k", type=int, default=5)
+    indexing.add_argument("--seed", type=int, default=42)
+    indexing.set_defaults(func=bench_indexing)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+토큰 예산 기반 검색 컨텍스트 조립 (context_builder.py)
+- 검색 결과를 순위대로 마크다운 블록으로 만들어 토큰 예산 안에서만 채움
+- 본문과 메타데이터에 중복된 필드는 빼고, 긴 필드는 토큰 경계에서 잘라냄
+- 사용/제외된 토큰 수를 함께 돌려주므로 체인마다 프롬프트 크기를 예측할 수 있음
+"""
+
+import logging
+import math
+from functools import lru_cache
+
+from .normalize import compact_text
+
+logger = logging.getLogger(__name__)
+
+# 컨텍스트를 소비하는 체인의 모델 (토크나이저 선택용)
+CONTEXT_MODEL = "gpt-4o-mini"
+
+# 예산이 있을 때 필드별 최대 토큰 수
+FIELD_MAX_TOKENS = {"subject": 120, "detail": 160, "content": 400}
+# 남은 예산이 이보다 작으면 문서를 잘라 넣지 않고 제외
+MIN_BLOCK_TOKENS = 48
+
+BLOCK_SEPARATOR = "\n\n---\n\n"
+ELLIPSIS = "…"
+MISSING_VALUE = "정보 없음"
+
+
+class TokenCounter:
+    """
+    모델 토크나이저 기반 토큰 계산기.
+
+    - tiktoken 인코딩을 불러올 수 없으면(오프라인 등) 글자 수 기반 보수적 추정치를 사용.
+      한글은 글자당 1토큰, 그 외는 4글자당 1토큰으로 계산해 실제보다 크게 잡음.
+
+    Args:
+        model (str): 토크나이저를 고를 모델 이름.
+    """
+
+    def __init__(self, model=CONTEXT_MODEL):
+        self.model = model
+        try:
+            import tiktoken
+
+            self.encoding = tiktoken.encoding_for_model(model)
+        except Exception as e:
+            logger.warning("'%s' 토크나이저 로드 실패, 추정치 사용: %s", model, e)
+            self.encoding = None
+
+    def count(self, text):
+        """텍스트의 토큰 수."""
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+        return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+    def truncate(self, text, max_tokens):
+        """
+        텍스트를 max_tokens 이하로 자름.
+
+        - 토큰 경계에서 자른 뒤, 가까운 줄바꿈/공백까지 되돌려 단어 중간에서 끊기지 않게 하고
+          말줄임표를 붙임.
+        """
+        if self.count(text) <= max_tokens:
+            return text
+        budget = max(max_tokens - 1, 0)
+        if self.encoding is not None:
+            head = self.encoding.decode(self.encoding.encode(text)[:budget])
+            head = head.rstrip("�")
+        else:
+            cost, end = 0.0, 0
+            for end, ch in enumerate(text):
+                cost += 0.25 if ord(ch) < 128 else 1
+                if math.ceil(cost) > budget:
+                    break
+            head = text[:end]
+
+        cut = max(head.rfind("\n"), head.rfind(" "))
+        if cut > len(head) * 0.7:
+            head = head[:cut]
+        return head.rstrip() + ELLIPSIS
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model=CONTEXT_MODEL):
+    """모델별 TokenCounter를 프로세스 단위로 재사용."""
+    return TokenCounter(model)
+
+
+class BuiltContext:
+    """
+    조립된 컨텍스트와 토큰 사용 내역.
+
+    Attributes:
+        text (str): 프롬프트에 넣을 마크다운.
+        used_tokens (int): text의 토큰 수.
+        dropped_tokens (int): 예산 때문에 잘리거나 제외된 토큰 수.
+        included (int): 포함된 문서 수.
+        dropped (int): 예산 부족으로 제외된 문서 수.
+    """
+
+    __slots__ = ("text", "used_tokens", "dropped_tokens", "included", "dropped")
+
+    def __init__(self, text, used_tokens, dropped_tokens, included, dropped):
+        self.text = text
+        self.used_tokens = used_tokens
+        self.dropped_tokens = dropped_tokens
+        self.included = included
+        self.dropped = dropped
+
+
+def _is_missing(value):
+    return not value or compact_text(value) == compact_text(MISSING_VALUE)
+
+
+def doc_fields(doc):
+    """
+    문서에서 표시할 필드를 추출하고 본문과 중복된 메타데이터 필드를 제거.
+
+    - subject/detail 값이 본문에 그대로 들어 있으면 메타데이터 줄은 생략.
+
+    Returns:
+        dict: title, region, subject, detail, link, content (생략된 필드는 None).
+    """
+    meta = doc.metadata or {}
+    content = doc.page_content.strip()
+    compact_content = compact_text(content)
+
+    fields = {
+        "title": meta.get("name", "제목 없음"),
+        "region": meta.get("region", MISSING_VALUE),
+        "link": meta.get("link"),
+        "content": content,
+    }
+    for key in ("subject", "detail"):
+        value = str(meta.get(key, MISSING_VALUE))
+        if not _is_missing(value) and compact_text(value) in compact_content:
+            fields[key] = None
+        else:
+            fields[key] = value
+    return fields
+
+
+def render_block(fields):
+    """필드 딕셔너리를 format_docs와 같은 마크다운 블록으로 변환."""
+    link = fields["link"]
+    link_md = (
+        f"[바로가기]({link})" if link else "해당 서비스는 URL이 제공되지 않습니다."
+    )
+
+    lines = [f"**[{fields['title']}]**", f"- 지역: {fields['region']}"]
+    if fields["subject"] is not None:
+        lines.append(f"- 지원대상: {fields['subject']}")
+    if fields["detail"] is not None:
+        lines.append(f"- 지원내용: {fields['detail']}")
+    lines.append(f"- 링크: {link_md}")
+    lines.append(f"- 본문 요약: {fields['content']}")
+    return "\n".join(lines)
+
+
+def build_context(docs, max_tokens=None, counter=None):
+    """
+    검색 결과를 순위대로 토큰 예산 안에서 마크다운으로 조립.
+
+    - 예산이 없으면 중복 필드만 제거하고 모든 문서를 그대로 포함.
+    - 예산이 있으면 긴 필드를 FIELD_MAX_TOKENS로 자르고, 마지막 문서는 남은 예산에 맞게
+      본문을 더 줄여 넣으며, 그래도 들어가지 않는 문서는 제외.
+
+    Args:
+        docs (list): [(컬렉션 이름, Document, score)] 순위순 리스트.
+        max_tokens (int, optional): 토큰 예산.
+        counter (TokenCounter, optional): 토큰 계산기. 없으면 기본 모델용 계산기 사용.
+
+    Returns:
+        BuiltContext: 조립된 마크다운과 토큰 사용 내역.
+    """
+    counter = counter or get_token_counter()
+    separator_tokens = counter.count(BLOCK_SEPARATOR)
+
+    blocks = []
+    used = dropped_tokens = dropped = 0
+    for _, doc, _ in docs:
+        fields = doc_fields(doc)
+        if max_tokens is None:
+            blocks.append(render_block(fields))
+            continue
+
+        full_tokens = counter.count(render_block(fields))
+        for key, limit in FIELD_MAX_TOKENS.items():
+            if fields[key]:
+                fields[key] = counter.truncate(fields[key], limit)
+
+        remaining = max_tokens - used - (separator_tokens if blocks else 0)
+        block = render_block(fields)
+        block_tokens = counter.count(block)
+        if block_tokens > remaining and remaining >= MIN_BLOCK_TOKENS:
+            # 본문을 제외한 부분이 차지하는 만큼을 빼고 본문을 남은 예산에 맞춤
+            overhead = block_tokens - counter.count(fields["content"])
+            if remaining - overhead > 0:
+                fields["content"] = counter.truncate(
+                    fields["content"], remaining - overhead
+                )
+                block = render_block(fields)
+                block_tokens = counter.count(block)
+
+        if block_tokens > remaining:
+            dropped += 1
+            dropped_tokens += full_tokens
+            continue
+
+        if blocks:
+            used += separator_tokens
+        blocks.append(block)
+        used += block_tokens
+        dropped_tokens += max(full_tokens - block_tokens, 0)
+
+    text = BLOCK_SEPARATOR.join(blocks)
+    if max_tokens is None:
+        used = counter.count(text)
+    return BuiltContext(text, used, dropped_tokens, len(blocks), dropped)
@@ -0,0 +1,134 @@
+"""
+신청 기간 메타데이터 유틸리티 (deadlines.py)
+- 로더마다 형식이 다른 날짜 문자열("2025.3.1.~2025.3.31.", "20250301 ~ 20250331",
+  "2025-03-31까지")을 YYYYMMDD 정수 apply_start / apply_end 메타데이터로 정규화
+- 정수로 저장하므로 스냅샷은 배열 비교 한 번으로, Chroma는 메타데이터 값 비교로
+  마감된 문서를 검색 단계에서 제외할 수 있음
+"""
+
+import datetime
+import re
+
+from django.utils import timezone
+
+APPLY_START_FIELD = "apply_start"
+APPLY_END_FIELD = "apply_end"
+
+# 기간 정보가 없거나 상시 모집인 문서의 값 (항상 유효)
+NO_START = 0
+NO_DEADLINE = 99991231
+
+# 마감 임박 가중치를 주는 기간(일). 마감일이 가까울수록 0 -> 1로 커짐
+DEADLINE_BOOST_DAYS = 14
+
+MISSING_VALUE = "정보 없음"
+
+_DATE = re.compile(
+    r"(?<!\d)(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})(?!\d)"
+    r"|(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)"
+)
+# 날짜 하나만 있을 때 시작일로 볼 표현 ("2025.3.1부터", "2025.3.1 ~")
+_START_ONLY = re.compile(r"부터|~\s*$")
+
+
+def date_key(date):
+    """datetime.date -> YYYYMMDD 정수."""
+    return date.year * 10000 + date.month * 100 + date.day
+
+
+def key_to_date(key):
+    """YYYYMMDD 정수 -> datetime.date."""
+    return datetime.date(key // 10000, key // 100 % 100, key % 100)
+
+
+def today_key():
+    """TIME_ZONE(Asia/Seoul) 기준 오늘 날짜의 YYYYMMDD 정수."""
+    return date_key(timezone.localdate())
+
+
+def parse_dates(text):
+    """
+    문자열에 들어 있는 날짜를 등장 순서대로 추출.
+
+    Returns:
+        list: 유효한 날짜의 YYYYMMDD 정수 리스트.
+    """
+    dates = []
+    for match in _DATE.finditer(str(text or "")):
+        year, month, day = (int(group) for group in match.groups() if group)
+        try:
+            dates.append(date_key(datetime.date(year, month, day)))
+        except ValueError:
+            continue
+    return dates
+
+
+def parse_period(text):
+    """
+    신청 기간 문자열을 (시작일, 마감일)로 변환.
+
+    - 날짜가 둘 이상이면 첫 날짜를 시작일, 마지막 날짜를 마감일로 사용.
+    - 날짜가 하나면 "부터"/끝나는 "~"가 있을 때만 시작일, 그 외("까지", "마감" 등)는 마감일.
+
+    Returns:
+        tuple: (시작일, 마감일) YYYYMMDD 정수. 알 수 없는 값은 None.
+    """
+    dates = parse_dates(text)
+    if not dates:
+        return None, None
+    if len(dates) > 1:
+        return dates[0], dates[-1]
+    if _START_ONLY.search(str(text)):
+        return dates[0], None
+    return None, dates[0]
+
+
+def deadline_metadata(period=None, start=None, end=None):
+    """
+    로더용 apply_start / apply_end 메타데이터 생성.
+
+    Args:
+        period (str, optional): "시작 ~ 종료" 형태의 기간 문자열.
+        start (str, optional): 시작일 문자열. period보다 우선.
+        end (str, optional): 마감일 문자열. period보다 우선.
+
+    Returns:
+        dict: {"apply_start": int, "apply_end": int}. 알 수 없으면 NO_START / NO_DEADLINE.
+    """
+    period_start, period_end = parse_period(period)
+    start_dates = parse_dates(start)
+    end_dates = parse_dates(end)
+    return {
+        APPLY_START_FIELD: (start_dates[0] if start_dates else period_start)
+        or NO_START,
+        APPLY_END_FIELD: (end_dates[-1] if end_dates else period_end) or NO_DEADLINE,
+    }
+
+
+def format_date_key(key):
+    """본문 표시용 날짜 문자열. 기간 정보가 없으면 '정보 없음'."""
+    if not key or key in (NO_START, NO_DEADLINE):
+        return MISSING_VALUE
+    return key_to_date(key).isoformat()
+
+
+def deadline_of(metadata):
+    """메타데이터의 마감일. 없으면 NO_DEADLINE (이전 로더가 만든 문서 포함)."""
+    value = (metadata or {}).get(APPLY_END_FIELD, NO_DEADLINE)
+    return value if isinstance(value, int) else NO_DEADLINE
+
+
+def is_active(metadata, today):
+    """마감일이 지나지 않았으면 True."""
+    return deadline_of(metadata) >= today
+
+
+def urgency(metadata, today, days=DEADLINE_BOOST_DAYS):
+    """
+    마감 임박도. 오늘 마감이면 1, days일 이상 남았거나 마감일이 없으면 0.
+    """
+    deadline = deadline_of(metadata)
+    if deadline == NO_DEADLINE or deadline < today:
+        return 0.0
+    remaining = (key_to_date(deadline) - key_to_date(today)).days
+    return max(0.0, 1.0 - remaining / days)
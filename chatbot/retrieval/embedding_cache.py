@@ -0,0 +1,234 @@
+"""
+쿼리/문서 임베딩 캐시 (embedding_cache.py)
+- 1차: 프로세스 내 LRU (크기/TTL 제한)
+- 2차: 기존 REDIS_HOST의 Redis (워커 간 공유)
+- 키는 정규화된 텍스트 + 임베딩 모델 이름, 값은 float32 바이트로 저장
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import redis
+from django.conf import settings
+from langchain_core.embeddings import Embeddings
+
+from .lru import LRUCache
+from .normalize import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Redis 장애 시 재연결을 시도하기 전까지 Redis 계층을 건너뛰는 시간(초)
+REDIS_RETRY_INTERVAL = 30
+
+
+class EmbeddingCache:
+    """
+    임베딩 벡터용 2단계 캐시.
+
+    - 조회 순서: 프로세스 LRU -> Redis. Redis에서 찾은 값은 LRU에도 채워 넣음.
+    - Redis 오류는 검색을 막지 않도록 경고만 남기고, 일정 시간 Redis 계층을 건너뜀.
+
+    Args:
+        namespace (str): 키 접두어로 쓰이는 임베딩 모델 이름.
+        maxsize (int): 프로세스 LRU 최대 항목 수.
+        ttl (float): 프로세스 LRU 만료 시간(초).
+        redis_client (redis.Redis, optional): Redis 클라이언트. None이면 LRU만 사용.
+        redis_ttl (int, optional): Redis 항목 만료 시간(초).
+    """
+
+    def __init__(self, namespace, maxsize, ttl, redis_client=None, redis_ttl=None):
+        self.namespace = namespace
+        self.local = LRUCache(maxsize, ttl)
+        self.redis = redis_client
+        self.redis_ttl = redis_ttl
+        self._redis_retry_at = 0.0
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def make_key(self, text):
+        """정규화된 텍스트와 모델 이름으로 캐시 키 생성."""
+        digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"emb:{self.namespace}:{digest}"
+
+    def get_many(self, texts):
+        """
+        텍스트 리스트에 대한 캐시된 벡터 조회.
+
+        Returns:
+            list: 텍스트 순서대로 list[float] 또는 None(캐시 미스).
+        """
+        keys = [self.make_key(text) for text in texts]
+        vectors = [self.local.get(key) for key in keys]
+        local_hits = sum(v is not None for v in vectors)
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        remote_hits = 0
+        if missing and self._redis_available():
+            try:
+                values = self.redis.mget([keys[i] for i in missing])
+            except redis.RedisError as e:
+                self._redis_failed(e)
+                values = [None] * len(missing)
+            for i, value in zip(missing, values):
+                if value is not None:
+                    vectors[i] = value
+                    self.local.set(keys[i], value)
+                    remote_hits += 1
+
+        self._record_stats(
+            local_hits=local_hits,
+            redis_hits=remote_hits,
+            misses=len(texts) - local_hits - remote_hits,
+        )
+        return [
+            np.frombuffer(v, dtype=np.float32).tolist() if v is not None else None
+            for v in vectors
+        ]
+
+    def set_many(self, texts, vectors):
+        """텍스트별 벡터를 float32 바이트로 LRU와 Redis에 저장."""
+        items = {
+            self.make_key(text): np.asarray(vector, dtype=np.float32).tobytes()
+            for text, vector in zip(texts, vectors)
+        }
+        for key, value in items.items():
+            self.local.set(key, value)
+
+        if items and self._redis_available():
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, value in items.items():
+                    pipe.set(key, value, ex=self.redis_ttl)
+                pipe.execute()
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    def get_stats(self):
+        """local_hits / redis_hits / misses 카운터 반환."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _record_stats(self, **counts):
+        with self._stats_lock:
+            self.stats.update(counts)
+
+    def _redis_available(self):
+        return self.redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, error):
+        logger.warning(
+            "임베딩 캐시 Redis 오류, %ds 동안 건너뜀: %s", REDIS_RETRY_INTERVAL, error
+        )
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        self._record_stats(redis_errors=1)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임의의 LangChain `Embeddings` 구현을 감싸 캐시를 적용하는 래퍼.
+
+    - Chroma 컬렉션, VectorRetriever, dataload 로더 등 `Embeddings`를 받는 곳에
+      그대로 넘길 수 있음.
+    - 캐시 미스인 텍스트만 모아 한 번의 요청으로 임베딩.
+
+    Args:
+        embeddings (Embeddings): 실제 임베딩을 계산할 모델.
+        cache (EmbeddingCache): 사용할 캐시.
+    """
+
+    def __init__(self, embeddings, cache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        vectors = self.cache.get_many(texts)
+        missing = self._unique_missing(texts, vectors)
+        if missing:
+            computed = self.embeddings.embed_documents(missing)
+            self.cache.set_many(missing, computed)
+            vectors = self._fill(texts, vectors, missing, computed)
+        return vectors
+
+    def embed_query(self, text):
+        vector = self.cache.get_many([text])[0]
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.set_many([text], [vector])
+        return vector
+
+    async def aembed_documents(self, texts):
+        vectors = await asyncio.to_thread(self.cache.get_many, texts)
+        missing = self._unique_missing(texts, vectors)
+        if missing:
+            computed = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self.cache.set_many, missing, computed)
+            vectors = self._fill(texts, vectors, missing, computed)
+        return vectors
+
+    async def aembed_query(self, text):
+        vector = (await asyncio.to_thread(self.cache.get_many, [text]))[0]
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self.cache.set_many, [text], [vector])
+        return vector
+
+    def _unique_missing(self, texts, vectors):
+        """캐시 미스인 텍스트를 정규화 키 기준으로 중복 없이 추출."""
+        seen = set()
+        missing = []
+        for text, vector in zip(texts, vectors):
+            key = self.cache.make_key(text)
+            if vector is None and key not in seen:
+                seen.add(key)
+                missing.append(text)
+        return missing
+
+    def _fill(self, texts, vectors, missing, computed):
+        """새로 계산한 벡터로 캐시 미스 자리를 채움."""
+        by_key = {
+            self.cache.make_key(text): vector for text, vector in zip(missing, computed)
+        }
+        return [
+            vector if vector is not None else by_key[self.cache.make_key(text)]
+            for text, vector in zip(texts, vectors)
+        ]
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(namespace):
+    """
+    모델 이름별로 프로세스 전역에서 공유하는 EmbeddingCache 반환.
+
+    Args:
+        namespace (str): 임베딩 모델 이름.
+
+    Returns:
+        EmbeddingCache: 설정값(EMBEDDING_CACHE_*)으로 생성된 캐시.
+    """
+    with _caches_lock:
+        if namespace not in _caches:
+            redis_client = None
+            if settings.EMBEDDING_CACHE_REDIS:
+                redis_client = redis.Redis(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    db=settings.EMBEDDING_CACHE_REDIS_DB,
+                    socket_timeout=0.5,
+                    socket_connect_timeout=0.5,
+                )
+            _caches[namespace] = EmbeddingCache(
+                namespace,
+                maxsize=settings.EMBEDDING_CACHE_SIZE,
+                ttl=settings.EMBEDDING_CACHE_TTL,
+                redis_client=redis_client,
+                redis_ttl=settings.EMBEDDING_CACHE_REDIS_TTL,
+            )
+        return _caches[namespace]
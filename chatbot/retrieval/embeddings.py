@@ -0,0 +1,141 @@
+"""
+임베딩 모델 생성 (embeddings.py)
+- VectorRetriever와 dataload 로더가 같은 모델/캐시/차원 설정을 쓰도록 한 곳에서 생성
+- 컬렉션 메타데이터에 모델과 차원을 기록해, 설정과 다른 차원으로 만든 인덱스를 시작 시 감지
+- 임베딩 제공자는 EMBEDDING_PROVIDER로 선택 (openai: OpenAI API, hashing: API 없이 동작하는
+  결정적 해싱 임베딩으로 CI/부하 테스트용)
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from langchain_openai import OpenAIEmbeddings
+
+from .embedding_cache import CachedEmbeddings, get_embedding_cache
+from .hashing_embeddings import HASHING_MODEL, HashingEmbeddings
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# 모델 기본 차원. 더 작은 값은 API의 dimensions 옵션(앞부분 절단 + 정규화)으로 요청
+EMBEDDING_NATIVE_DIMENSIONS = 1536
+
+
+def _openai_embeddings(dimensions, api_key=None):
+    """OpenAI 임베딩. 기본 차원이 아니면 dimensions 옵션을 넘김."""
+    kwargs = {"model": EMBEDDING_MODEL}
+    if dimensions != EMBEDDING_NATIVE_DIMENSIONS:
+        kwargs["dimensions"] = dimensions
+    if api_key:
+        kwargs["api_key"] = api_key
+    return OpenAIEmbeddings(**kwargs)
+
+
+def _hashing_embeddings(dimensions, api_key=None):
+    """API 키 없이 동작하는 해싱 임베딩."""
+    return HashingEmbeddings(dimensions)
+
+
+# 임베딩 제공자: 이름 -> (모델 이름, 최대 차원(None이면 제한 없음), 모델 생성 함수)
+EMBEDDING_PROVIDERS = {
+    "openai": (EMBEDDING_MODEL, EMBEDDING_NATIVE_DIMENSIONS, _openai_embeddings),
+    "hashing": (HASHING_MODEL, None, _hashing_embeddings),
+}
+
+
+def get_embedding_provider():
+    """
+    설정된 임베딩 제공자(EMBEDDING_PROVIDER) 정보.
+
+    Returns:
+        tuple: (모델 이름, 최대 차원, 모델 생성 함수)
+
+    Raises:
+        ImproperlyConfigured: 등록되지 않은 제공자인 경우.
+    """
+    provider = settings.EMBEDDING_PROVIDER
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ImproperlyConfigured(
+            f"EMBEDDING_PROVIDER는 {', '.join(EMBEDDING_PROVIDERS)} 중 하나여야 합니다: "
+            f"{provider}"
+        )
+    return EMBEDDING_PROVIDERS[provider]
+
+
+def get_embedding_dimensions():
+    """
+    설정된 임베딩 차원(EMBEDDING_DIMENSIONS)을 검증해 반환.
+
+    Raises:
+        ImproperlyConfigured: 1 ~ 모델 기본 차원 범위를 벗어난 경우 (해싱 임베딩은 1 이상).
+    """
+    _, max_dimensions, _ = get_embedding_provider()
+    dimensions = settings.EMBEDDING_DIMENSIONS
+    if dimensions <= 0 or (max_dimensions and dimensions > max_dimensions):
+        allowed = f"1~{max_dimensions} 사이" if max_dimensions else "1 이상"
+        raise ImproperlyConfigured(
+            f"EMBEDDING_DIMENSIONS는 {allowed}여야 합니다: {dimensions}"
+        )
+    return dimensions
+
+
+def embedding_signature():
+    """
+    컬렉션/스냅샷 메타데이터에 기록하는 임베딩 설정.
+
+    Returns:
+        dict: {"embedding_model": 모델 이름, "embedding_dimensions": 차원}
+    """
+    model, _, _ = get_embedding_provider()
+    return {
+        "embedding_model": model,
+        "embedding_dimensions": get_embedding_dimensions(),
+    }
+
+
+def get_embedding_model(api_key=None):
+    """
+    캐시가 적용된 임베딩 모델 반환.
+
+    - EMBEDDING_PROVIDER에 따라 OpenAI 또는 해싱 임베딩을 생성.
+    - 캐시는 모델과 차원별로 분리 (OpenAI 기본 차원은 기존 캐시 키 유지).
+
+    Args:
+        api_key (str, optional): OpenAI API 키. None이면 환경 변수 사용.
+
+    Returns:
+        CachedEmbeddings: 프로세스 전역 임베딩 캐시를 공유하는 임베딩 모델.
+    """
+    model, max_dimensions, factory = get_embedding_provider()
+    dimensions = get_embedding_dimensions()
+    namespace = model
+    if dimensions != max_dimensions:
+        namespace = f"{model}:{dimensions}"
+    return CachedEmbeddings(
+        factory(dimensions, api_key=api_key), get_embedding_cache(namespace)
+    )
+
+
+def stored_model(collection):
+    """
+    Chroma 컬렉션 메타데이터에 기록된 임베딩 모델 이름. 기록이 없으면(이전 버전 로더) None.
+    """
+    metadata = collection._collection.metadata or {}
+    return metadata.get("embedding_model")
+
+
+def stored_dimensions(collection):
+    """
+    Chroma 컬렉션에 저장된 임베딩 차원.
+
+    - 메타데이터에 기록된 값을 우선 사용하고, 없으면(이전 버전 로더) 저장된 벡터 하나의
+      길이를 확인.
+
+    Returns:
+        int | None: 차원. 빈 컬렉션이면 None.
+    """
+    metadata = collection._collection.metadata or {}
+    if "embedding_dimensions" in metadata:
+        return int(metadata["embedding_dimensions"])
+    result = collection.get(limit=1, include=["embeddings"])
+    embeddings = result.get("embeddings")
+    if embeddings is None or len(embeddings) == 0:
+        return None
+    return len(embeddings[0])
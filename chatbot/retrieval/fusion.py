@@ -0,0 +1,107 @@
+"""
+검색 결과 순위 병합 유틸리티 (fusion.py)
+- 점수 척도가 서로 다른 랭킹(벡터 거리, BM25 점수 등)을 순위만으로 합침
+- 로더가 같은 문서를 소스별 컬렉션과 unified_data에 모두 저장하므로,
+  여러 컬렉션의 결과를 문서 키 기준으로 중복 제거하며 병합
+"""
+
+import hashlib
+
+from .normalize import compact_text, normalize_text
+
+# RRF 상수 (원 논문 기본값). 클수록 하위 순위의 영향이 커짐
+RRF_K = 60
+
+# 컬렉션 간 결과 병합 방식
+# - min: 같은 문서는 가장 가까운 거리를 사용하고 거리순 정렬
+# - rrf: 컬렉션별 순위로 RRF 점수를 계산 (score는 RRF 점수의 역수)
+FUSION_STRATEGIES = ("min", "rrf")
+
+# 로더가 값이 없을 때 채우는 문자열 (common.sanitize_metadata)
+MISSING_VALUE = "정보 없음"
+
+
+def document_key(doc):
+    """
+    컬렉션이 달라도 같은 문서면 같은 값이 나오는 안정적인 문서 키.
+
+    - link/name/source를 정규화해 해시. 링크는 사이트 대표 주소인 경우가 많아
+      이름과 함께 사용함.
+    - 세 값이 모두 비어 있으면 Chroma ID(없으면 본문)를 사용.
+
+    Returns:
+        str: 문서 키 (sha1 hex).
+    """
+    metadata = doc.metadata or {}
+    parts = [
+        normalize_text(metadata.get("link", "")),
+        compact_text(metadata.get("name", "")),
+        compact_text(metadata.get("source", "")),
+    ]
+    parts = ["" if part == compact_text(MISSING_VALUE) else part for part in parts]
+    if not any(parts):
+        parts = [doc.id or doc.page_content]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def reciprocal_rank_fusion(rankings, rrf_k=RRF_K):
+    """
+    Reciprocal Rank Fusion으로 여러 랭킹을 병합.
+
+    - 각 랭킹에서 순위 r(1부터)인 항목은 1 / (rrf_k + r)를 받고, 같은 key의 점수는 합산.
+    - 항목 값은 처음 등장한 랭킹의 것을 사용.
+
+    Args:
+        rankings (list): 좋은 순으로 정렬된 [(key, item)] 리스트들의 리스트.
+        rrf_k (int): RRF 상수.
+
+    Returns:
+        list: [(key, item, RRF 점수)] 점수 내림차순 리스트.
+    """
+    scores = {}
+    items = {}
+    for ranking in rankings:
+        for rank, (key, item) in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            items.setdefault(key, item)
+    return sorted(
+        ((key, items[key], score) for key, score in scores.items()),
+        key=lambda x: x[2],
+        reverse=True,
+    )
+
+
+def fuse_results(rankings, k, strategy="min", rrf_k=RRF_K):
+    """
+    여러 랭킹을 문서 키 기준으로 중복 제거하며 병합하고 상위 k개를 반환.
+
+    Args:
+        rankings (list): 좋은 순으로 정렬된 [(컬렉션 이름, Document, score)] 리스트들의 리스트.
+            min 전략에서는 score가 거리(낮을수록 좋음)여야 함.
+        k (int): 반환할 고유 문서 수.
+        strategy (str): "min" 또는 "rrf".
+        rrf_k (int): RRF 상수.
+
+    Returns:
+        list: [(컬렉션 이름, Document, score)] score 오름차순 최대 k개.
+    """
+    if strategy == "rrf":
+        fused = reciprocal_rank_fusion(
+            [
+                [(document_key(doc), (name, doc)) for name, doc, _ in ranking]
+                for ranking in rankings
+            ],
+            rrf_k=rrf_k,
+        )
+        return [(name, doc, 1.0 / score) for _, (name, doc), score in fused[:k]]
+
+    if strategy != "min":
+        raise ValueError(f"지원하지 않는 병합 방식입니다: {strategy}")
+
+    best = {}
+    for ranking in rankings:
+        for name, doc, score in ranking:
+            key = document_key(doc)
+            if key not in best or score < best[key][2]:
+                best[key] = (name, doc, score)
+    return sorted(best.values(), key=lambda x: x[2])[:k]
@@ -0,0 +1,127 @@
+"""
+인덱스 세대(generation) 관리 (generation.py)
+- dataload 로더가 컬렉션 갱신을 마치면 Redis의 세대 번호를 올리고,
+  검색 프로세스는 세대 번호가 바뀌면 캐시와 파생 인덱스를 무효화
+"""
+
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "retriever:index_generation"
+UPDATED_COLLECTIONS_KEY = "retriever:updated_collections"
+
+# 검색 요청마다 Redis를 조회하지 않도록 세대 번호를 캐싱하는 시간(초)
+GENERATION_CHECK_INTERVAL = 2.0
+# Redis 조회에 실패한 뒤 다시 확인하기까지의 시간(초)
+# - 연결 재시도(수 초)가 검색 요청을 막으므로, Redis가 없는 환경에서 요청마다 기다리지 않게 함
+GENERATION_RETRY_INTERVAL = 30.0
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis_client():
+    """검색 메타데이터(세대 번호 등)용 Redis 클라이언트 반환."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.RETRIEVER_REDIS_DB,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+                decode_responses=True,
+            )
+        return _client
+
+
+def bump_index_generation(collection_names=()):
+    """
+    인덱스 세대 번호를 1 올리고 갱신된 컬렉션을 기록.
+
+    Args:
+        collection_names (Iterable[str]): 이번에 갱신된 컬렉션 이름들.
+
+    Returns:
+        int | None: 새 세대 번호. Redis 오류 시 None.
+    """
+    client = get_redis_client()
+    try:
+        generation = client.incr(GENERATION_KEY)
+        if collection_names:
+            client.hset(
+                UPDATED_COLLECTIONS_KEY,
+                mapping={name: generation for name in collection_names},
+            )
+        return generation
+    except redis.RedisError as e:
+        logger.warning("인덱스 세대 번호 갱신 실패: %s", e)
+        return None
+
+
+def get_index_generation():
+    """현재 인덱스 세대 번호. 아직 없거나 Redis 오류면 None."""
+    try:
+        value = get_redis_client().get(GENERATION_KEY)
+    except redis.RedisError as e:
+        logger.warning("인덱스 세대 번호 조회 실패: %s", e)
+        return None
+    return int(value) if value is not None else 0
+
+
+class GenerationWatcher:
+    """
+    세대 번호를 주기적으로 확인해 변경 여부를 알려주는 헬퍼.
+
+    - `GENERATION_CHECK_INTERVAL` 동안은 마지막으로 읽은 값을 재사용.
+    - Redis에 연결할 수 없으면 마지막으로 알려진 값을 유지하고
+      `GENERATION_RETRY_INTERVAL` 동안 다시 확인하지 않음.
+    - 새 세대는 호출자가 `commit`해야 현재 세대가 됨. 전환에 실패하면 커밋하지 않으므로
+      다음 확인에서 다시 변경으로 알려줌.
+    """
+
+    def __init__(
+        self,
+        interval=GENERATION_CHECK_INTERVAL,
+        retry_interval=GENERATION_RETRY_INTERVAL,
+    ):
+        self.interval = interval
+        self.retry_interval = retry_interval
+        generation = get_index_generation()
+        self.current = generation or 0
+        self._checked_at = time.monotonic()
+        if generation is None:
+            self._checked_at += self.retry_interval - self.interval
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """
+        세대 번호를 확인.
+
+        Returns:
+            tuple: (세대 번호, 커밋된 세대와 다른지 여부)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at < self.interval:
+                return self.current, False
+            self._checked_at = now
+            generation = get_index_generation()
+            if generation is None:
+                self._checked_at = now + self.retry_interval - self.interval
+                return self.current, False
+            if generation == self.current:
+                return self.current, False
+            return generation, True
+
+    def commit(self, generation):
+        """새 세대로 전환을 마친 뒤 현재 세대로 기록."""
+        with self._lock:
+            self.current = generation
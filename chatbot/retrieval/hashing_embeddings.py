@@ -0,0 +1,79 @@
+"""
+오프라인 해싱 임베딩 (hashing_embeddings.py)
+- OpenAI API 없이 CI/부하 테스트 환경에서 적재 처리량과 검색 지연시간을 측정하기 위한 임베딩
+- 문자 n-gram을 해싱해 설정된 차원(EMBEDDING_DIMENSIONS)에 투영하므로, 같은 텍스트는 항상
+  같은 벡터가 되고 벡터 크기/분포는 실제 인덱스와 비슷한 형태가 됨
+- 글자가 많이 겹치는 텍스트끼리 코사인 유사도가 높아, 정책명 검색 정도는 그럴듯하게 동작함
+  (의미 검색 품질 평가용은 아님)
+"""
+
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .normalize import normalize_text
+
+HASHING_MODEL = "hashing-char-ngram"
+# 사용할 문자 n-gram 길이 (한글은 1~3글자 조합이 단어 일부를 잘 나타냄)
+NGRAM_RANGE = (1, 3)
+# n-gram 해시 결과 캐시 크기 (정책 문서는 같은 n-gram이 반복되므로 해시 계산을 재사용)
+NGRAM_CACHE_SIZE = 2**18
+
+
+@lru_cache(maxsize=NGRAM_CACHE_SIZE)
+def _hash_ngram(ngram):
+    """
+    n-gram의 (해시값, 부호). 프로세스마다 바뀌는 내장 hash() 대신 blake2b를 써서
+    어느 환경에서든 같은 결과가 나오게 함.
+    """
+    value = int.from_bytes(
+        hashlib.blake2b(ngram.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return value >> 1, 1.0 if value & 1 else -1.0
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    문자 n-gram 특성 해싱(feature hashing) 임베딩.
+
+    - 정규화한 텍스트의 n-gram마다 해시로 차원과 부호를 정해 더한 뒤, 빈도는 로그로 완화하고
+      L2 정규화함.
+    - 부호를 함께 해싱하므로 충돌한 n-gram끼리 값이 한쪽으로 쌓이지 않음.
+
+    Args:
+        dimensions (int): 출력 벡터 차원.
+        ngram_range (tuple): (최소, 최대) n-gram 길이.
+    """
+
+    def __init__(self, dimensions, ngram_range=NGRAM_RANGE):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+    def _embed(self, text):
+        text = normalize_text(text)
+        low, high = self.ngram_range
+        hashed = [
+            _hash_ngram(text[start : start + n])
+            for n in range(low, high + 1)
+            for start in range(len(text) - n + 1)
+        ]
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if hashed:
+            values, signs = zip(*hashed)
+            buckets = np.asarray(values, dtype=np.uint64) % np.uint64(self.dimensions)
+            vector = np.bincount(
+                buckets.astype(np.int64), weights=signs, minlength=self.dimensions
+            ).astype(np.float32)
+            vector = np.sign(vector) * np.log1p(np.abs(vector))
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector /= norm
+        return vector.tolist()
@@ -0,0 +1,201 @@
+"""
+한국어 문자 n-gram BM25 인덱스 (lexical_index.py)
+- 정책명/줄임말처럼 임베딩으로 잘 잡히지 않는 어휘 일치를 보완하기 위한 로컬 희소 인덱스
+- dataload 파이프라인이 컬렉션별로 생성해 RETRIEVER_INDEX_DIR에 저장하고,
+  VectorRetriever가 로드해서 하이브리드 검색에 사용
+"""
+
+import json
+import math
+import os
+from collections import Counter, defaultdict
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .normalize import normalize_text
+
+NGRAM_SIZES = (2, 3)
+# 정책명은 본문보다 중요하므로 색인 시 반복해서 가중치를 줌
+NAME_WEIGHT = 2
+
+
+def char_ngrams(text, sizes=NGRAM_SIZES):
+    """
+    띄어쓰기 단위 토큰마다 문자 n-gram을 생성.
+
+    - 한 글자 토큰은 그 글자 자체를 토큰으로 사용.
+
+    Returns:
+        list: n-gram 문자열 리스트 (중복 포함).
+    """
+    grams = []
+    for token in normalize_text(text).split(" "):
+        if len(token) == 1:
+            grams.append(token)
+            continue
+        for n in sizes:
+            grams.extend(token[i : i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+class LexicalIndex:
+    """
+    문자 n-gram 기반 BM25 인덱스.
+
+    - 포스팅은 용어별로 연속된 numpy 배열 구간(offset, length)으로 저장해
+      로드와 점수 계산을 벡터화.
+
+    Args:
+        ids (list): 문서 ID 리스트 (Chroma ID).
+        texts (list): 문서 본문 리스트.
+        metadatas (list): 문서 메타데이터 리스트.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, ids, texts, metadatas, vocab, offsets, doc_ids, tfs, doc_lens):
+        self.ids = list(ids)
+        self.texts = list(texts)
+        self.metadatas = list(metadatas)
+        self.vocab = vocab
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lens = doc_lens
+        self.avg_len = float(doc_lens.mean()) if len(doc_lens) else 0.0
+
+    @classmethod
+    def build(cls, ids, texts, metadatas):
+        """문서 리스트로 인덱스 생성."""
+        postings = defaultdict(list)
+        doc_lens = np.zeros(len(ids), dtype=np.float32)
+        for position, (text, metadata) in enumerate(zip(texts, metadatas)):
+            name = (metadata or {}).get("name", "")
+            grams = char_ngrams(" ".join([name] * NAME_WEIGHT + [text or ""]))
+            doc_lens[position] = len(grams)
+            for gram, tf in Counter(grams).items():
+                postings[gram].append((position, tf))
+
+        vocab = {}
+        offsets = np.zeros((len(postings), 2), dtype=np.int64)
+        doc_ids, tfs = [], []
+        for term_id, (gram, entries) in enumerate(sorted(postings.items())):
+            vocab[gram] = term_id
+            offsets[term_id] = (len(doc_ids), len(entries))
+            doc_ids.extend(position for position, _ in entries)
+            tfs.extend(tf for _, tf in entries)
+
+        return cls(
+            ids,
+            texts,
+            metadatas,
+            vocab,
+            offsets,
+            np.asarray(doc_ids, dtype=np.int32),
+            np.asarray(tfs, dtype=np.float32),
+            doc_lens,
+        )
+
+    @classmethod
+    def from_collection(cls, collection):
+        """Chroma 컬렉션 전체 문서로 인덱스 생성."""
+        result = collection.get(include=["documents", "metadatas"])
+        return cls.build(result["ids"], result["documents"], result["metadatas"])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def document(self, position):
+        """문서 위치에 해당하는 LangChain Document 반환."""
+        return Document(
+            page_content=self.texts[position] or "",
+            metadata=self.metadatas[position] or {},
+            id=self.ids[position],
+        )
+
+    def search(self, query, k=10):
+        """
+        BM25 점수 상위 k개 문서 검색.
+
+        Returns:
+            list: [(문서 위치, BM25 점수)] 점수 내림차순.
+        """
+        if not len(self.ids):
+            return []
+
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        n_docs = len(self.ids)
+        for gram, qtf in Counter(char_ngrams(query)).items():
+            term_id = self.vocab.get(gram)
+            if term_id is None:
+                continue
+            start, length = self.offsets[term_id]
+            docs = self.doc_ids[start : start + length]
+            tf = self.tfs[start : start + length]
+            idf = math.log(1 + (n_docs - length + 0.5) / (length + 0.5))
+            norm = self.K1 * (1 - self.B + self.B * self.doc_lens[docs] / self.avg_len)
+            scores[docs] += qtf * idf * tf * (self.K1 + 1) / (tf + norm)
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def save(self, path):
+        """
+        인덱스를 `{path}.npz`(포스팅 배열)와 `{path}.json`(어휘, 문서)로 저장.
+
+        - 임시 파일에 쓴 뒤 교체하므로, 읽는 쪽이 반쯤 쓰인 파일을 보지 않음.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        terms = sorted(self.vocab, key=self.vocab.get)
+        with open(f"{path}.npz.tmp", "wb") as f:
+            np.savez(
+                f,
+                offsets=self.offsets,
+                doc_ids=self.doc_ids,
+                tfs=self.tfs,
+                doc_lens=self.doc_lens,
+            )
+        with open(f"{path}.json.tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "terms": terms,
+                    "ids": self.ids,
+                    "texts": self.texts,
+                    "metadatas": self.metadatas,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(f"{path}.npz.tmp", f"{path}.npz")
+        os.replace(f"{path}.json.tmp", f"{path}.json")
+
+    @classmethod
+    def load(cls, path):
+        """`save`로 저장한 인덱스 로드. 파일이 없으면 None."""
+        if not (os.path.exists(f"{path}.npz") and os.path.exists(f"{path}.json")):
+            return None
+        with open(f"{path}.json", encoding="utf-8") as f:
+            data = json.load(f)
+        arrays = np.load(f"{path}.npz", allow_pickle=False)
+        vocab = {term: term_id for term_id, term in enumerate(data["terms"])}
+        return cls(
+            data["ids"],
+            data["texts"],
+            data["metadatas"],
+            vocab,
+            arrays["offsets"],
+            arrays["doc_ids"],
+            arrays["tfs"],
+            arrays["doc_lens"],
+        )
+
+
+def lexical_index_path(index_dir, collection_name):
+    """컬렉션의 BM25 인덱스 저장 경로 (확장자 제외)."""
+    return os.path.join(index_dir, "lexical", collection_name)
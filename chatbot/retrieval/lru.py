@@ -0,0 +1,66 @@
+"""
+스레드 안전한 LRU + TTL 캐시 (lru.py)
+- 임베딩 캐시, 검색 결과 캐시 등 프로세스 내 캐시 계층에서 공통으로 사용
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    최대 항목 수와 만료 시간(TTL)을 가진 LRU 캐시.
+
+    Args:
+        maxsize (int): 최대 항목 수. 초과하면 가장 오래 사용하지 않은 항목부터 제거.
+        ttl (float, optional): 기본 만료 시간(초). None이면 만료되지 않음.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """키에 해당하는 값을 반환. 없거나 만료되었으면 default."""
+        with self._lock:
+            item = self._data.get(key, self._MISSING)
+            if item is self._MISSING:
+                return default
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """값을 저장. ttl을 지정하면 기본 TTL 대신 사용."""
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """키를 제거하고 값을 반환."""
+        with self._lock:
+            item = self._data.pop(key, self._MISSING)
+        return default if item is self._MISSING else item[1]
+
+    def clear(self):
+        """모든 항목 삭제."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,183 @@
+"""
+메타데이터 역색인 (metadata_index.py)
+- name / region / source 메타데이터의 부분 문자열 필터를 벡터 검색 전에 해석하기 위한 인덱스
+- 문서별 마감일(apply_end)을 함께 모아, 마감 문서 수를 조회 전에 알 수 있게 함
+- 검색 스레드들이 동시에 읽으므로 생성이 끝난 뒤에는 조회 메서드에서 상태를 바꾸지 않음
+"""
+
+import bisect
+from collections import defaultdict
+
+from .deadlines import APPLY_END_FIELD, deadline_of
+from .normalize import compact_text
+
+INDEXED_FIELDS = ("name", "region", "source")
+
+
+def _bigrams(text):
+    """문자열의 문자 바이그램 집합. 한 글자 문자열은 그 자체를 반환."""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class MetadataIndex:
+    """
+    정규화된 메타데이터 값 -> 원본 값 -> 문서 ID 역색인.
+
+    - 필드별로 고유값을 모아두고, 고유값의 문자 바이그램으로 후보값을 좁힌 뒤
+      부분 문자열 포함 여부를 확인해 필터 조건을 만족하는 원본 값 목록을 구함.
+    - 원본 값 목록은 Chroma의 `where` 조건(`$in`)으로 그대로 넘길 수 있어,
+      top-k를 먼저 뽑고 버리는 대신 후보 집합 안에서만 벡터 검색을 수행할 수 있음.
+
+    Attributes:
+        size (int): 색인된 문서 수.
+        undated (int): 정수 apply_end가 없는 문서 수 (이전 로더가 만든 문서).
+            apply_end where 조건에 걸리지 않지만 마감되지 않은 문서로 취급됨.
+    """
+
+    def __init__(self, fields=INDEXED_FIELDS):
+        self.fields = tuple(fields)
+        self.size = 0
+        self.undated = 0
+        # 문서별 마감일 (YYYYMMDD). 항상 정렬된 상태로 유지
+        self._deadlines = []
+        # field -> 정규화 값 -> {원본 값}
+        self._values = {field: defaultdict(set) for field in self.fields}
+        # field -> 원본 값 -> {문서 ID}
+        self._postings = {field: defaultdict(set) for field in self.fields}
+        # field -> 바이그램 -> {정규화 값}
+        self._grams = {field: defaultdict(set) for field in self.fields}
+
+    @classmethod
+    def from_collection(cls, collection):
+        """
+        Chroma 컬렉션의 전체 메타데이터로 인덱스를 생성.
+
+        Args:
+            collection (Chroma): LangChain Chroma 컬렉션 인스턴스.
+
+        Returns:
+            MetadataIndex: 생성된 인덱스.
+        """
+        result = collection.get(include=["metadatas"])
+        return cls.from_records(result["ids"], result["metadatas"])
+
+    @classmethod
+    def from_records(cls, ids, metadatas):
+        """문서 ID와 메타데이터 리스트로 인덱스를 생성 (NumPy 스냅샷 등)."""
+        index = cls()
+        deadlines = []
+        for doc_id, metadata in zip(ids, metadatas):
+            metadata = metadata or {}
+            index._index_fields(doc_id, metadata)
+            deadlines.append(index._record_deadline(metadata))
+        # 문서마다 삽입 정렬하지 않고 마지막에 한 번만 정렬
+        deadlines.sort()
+        index._deadlines = deadlines
+        return index
+
+    def add(self, doc_id, metadata):
+        """문서 하나의 메타데이터를 색인."""
+        self._index_fields(doc_id, metadata)
+        bisect.insort(self._deadlines, self._record_deadline(metadata))
+
+    def _record_deadline(self, metadata):
+        """문서 수와 apply_end가 없는 문서 수를 세고 마감일을 반환."""
+        self.size += 1
+        if not isinstance(metadata.get(APPLY_END_FIELD), int):
+            self.undated += 1
+        return deadline_of(metadata)
+
+    def _index_fields(self, doc_id, metadata):
+        """색인 대상 필드 값을 역색인에 추가."""
+        for field in self.fields:
+            if field not in metadata:
+                continue
+            raw = metadata[field]
+            normalized = compact_text(raw)
+            if normalized not in self._values[field]:
+                for gram in _bigrams(normalized):
+                    self._grams[field][gram].add(normalized)
+            self._values[field][normalized].add(raw)
+            self._postings[field][raw].add(doc_id)
+
+    def expired_count(self, today):
+        """마감일이 today보다 이전인 문서 수."""
+        return bisect.bisect_left(self._deadlines, today)
+
+    def supports(self, filters):
+        """모든 필터 키가 색인된 필드인지 여부."""
+        return bool(filters) and all(key in self.fields for key in filters)
+
+    def matching_values(self, field, value):
+        """
+        필터 값을 부분 문자열로 포함하는 원본 메타데이터 값 집합.
+
+        Args:
+            field (str): 메타데이터 필드명.
+            value (str): 필터 값.
+
+        Returns:
+            set: 조건을 만족하는 원본 값 집합.
+        """
+        needle = compact_text(value)
+        if not needle:
+            return set(self._postings[field])
+
+        grams = _bigrams(needle)
+        if len(needle) < 2:
+            candidates = [v for v in self._values[field] if needle in v]
+        else:
+            postings = sorted(
+                (self._grams[field].get(g, set()) for g in grams), key=len
+            )
+            candidates = set.intersection(*postings) if postings else set()
+            candidates = [v for v in candidates if needle in v]
+
+        matched = set()
+        for normalized in candidates:
+            matched |= self._values[field][normalized]
+        return matched
+
+    def build_where(self, filters, max_values=None):
+        """
+        필터 조건을 Chroma `where` 조건으로 변환.
+
+        Args:
+            filters (dict): {"필드": "부분 문자열"} 형태의 조건.
+            max_values (int, optional): 필드별 허용 원본 값 개수 상한.
+                초과하면 인덱스로 좁히는 이점이 적으므로 None을 반환.
+
+        Returns:
+            dict | None: Chroma `where` 조건. 일치하는 값이 없으면 빈 dict,
+                인덱스로 처리할 수 없으면 None.
+        """
+        if not self.supports(filters):
+            return None
+
+        clauses = []
+        for field, value in filters.items():
+            values = self.matching_values(field, value)
+            if not values:
+                return {}
+            if max_values is not None and len(values) > max_values:
+                return None
+            clauses.append({field: {"$in": sorted(values)}})
+
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def candidate_ids(self, filters):
+        """필터 조건을 모두 만족하는 문서 ID 집합. 인덱스로 처리할 수 없으면 None."""
+        if not self.supports(filters):
+            return None
+
+        result = None
+        for field, value in filters.items():
+            ids = set()
+            for raw in self.matching_values(field, value):
+                ids |= self._postings[field][raw]
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
@@ -0,0 +1,79 @@
+"""
+MMR 다양화 (mmr.py)
+- 같은 사업이 여러 자치구에, 같은 강좌가 여러 50플러스 캠퍼스에 등록되어 있어 거리순 상위 k개가
+  거의 같은 문서로 채워지는 문제를 줄이기 위한 재순위화
+- 검색 중에 이미 가져온 후보 임베딩으로 후보 간 코사인 유사도 행렬을 행렬곱 한 번으로 만든 뒤,
+  관련도와 이미 고른 문서와의 유사도를 절충해 탐욕적으로 k개를 고름 (maximal marginal relevance)
+"""
+
+import numpy as np
+
+# 관련도 가중치 (1이면 원래 순서 그대로, 0이면 다양성만 고려)
+MMR_LAMBDA = 0.5
+# 다양화할 때 컬렉션마다 조회하고 병합할 후보 수 = k * MMR_FETCH_FACTOR
+MMR_FETCH_FACTOR = 4
+
+
+def mmr_fetch_size(k):
+    """다양화할 때 조회/병합할 후보 수."""
+    return k * MMR_FETCH_FACTOR
+
+
+def _normalized(values):
+    """min-max 정규화. 값이 모두 같으면 0."""
+    spread = values.max() - values.min() if values.size else 0.0
+    if spread <= 0:
+        return np.zeros_like(values)
+    return (values - values.min()) / spread
+
+
+def mmr_select(scores, vectors, k, lambda_mult=MMR_LAMBDA):
+    """
+    후보 중 서로 다른 문서 k개를 MMR로 선택.
+
+    - 관련도는 병합 점수(낮을수록 관련)를 후보 안에서 0~1로 정규화한 값이므로, 거리/RRF/
+      마감 임박 가중치 등 병합 방식과 관계없이 적용됨.
+    - 유사도는 후보 간 코사인 유사도를 후보 안에서 0~1로 정규화한 값. 임베딩은 서로 비슷한
+      문서끼리 유사도가 높은 구간에 몰려 있으므로, 정규화하지 않으면 관련도 차이에 묻힘.
+    - 임베딩이 없는 후보(예: BM25로만 찾은 문서)는 다른 후보와 유사도 0으로 취급.
+
+    Args:
+        scores (list): 병합 점수 (낮을수록 관련도 높음).
+        vectors (list): 후보별 임베딩 벡터 또는 None.
+        k (int): 선택할 문서 수.
+        lambda_mult (float): 관련도 가중치 (0~1).
+
+    Returns:
+        list: 선택한 후보의 위치 (선택 순서).
+    """
+    n = len(scores)
+    present = [i for i, vector in enumerate(vectors) if vector is not None]
+    if n <= k or len(present) < 2:
+        return sorted(range(n), key=lambda i: scores[i])[:k]
+
+    relevance = 1.0 - _normalized(np.asarray(scores, dtype=np.float32))
+    matrix = np.asarray([vectors[i] for i in present], dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms > 0, norms, 1.0)
+
+    cosine = matrix @ matrix.T
+    off_diagonal = cosine[~np.eye(len(present), dtype=bool)]
+    low, high = off_diagonal.min(), off_diagonal.max()
+    similarity = np.zeros((n, n), dtype=np.float32)
+    if high > low:
+        similarity[np.ix_(present, present)] = np.clip(
+            (cosine - low) / (high - low), 0.0, 1.0
+        )
+
+    selected = [int(np.argmax(relevance))]
+    chosen = np.zeros(n, dtype=bool)
+    chosen[selected[0]] = True
+    max_similarity = similarity[selected[0]].copy()
+    while len(selected) < k:
+        marginal = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        marginal[chosen] = -np.inf
+        best = int(np.argmax(marginal))
+        selected.append(best)
+        chosen[best] = True
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
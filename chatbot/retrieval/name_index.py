@@ -0,0 +1,174 @@
+"""
+정책명 완전 일치 인덱스 (name_index.py)
+- "경기패스 신청 방법"처럼 쿼리에 정책명이 그대로 들어 있으면 벡터 검색 순위에 맡기지 않고
+  해당 문서를 바로 찾기 위한 인덱스
+- dataload 파이프라인이 컬렉션별로 정규화된 정책명 -> 문서 ID 맵을 저장하고,
+  VectorRetriever가 모든 컬렉션의 맵과 줄임말 테이블을 합쳐 문자 트라이로 만듦
+"""
+
+import json
+import os
+from collections import defaultdict
+
+from .normalize import compact_text
+
+# 줄임말 -> 정식 명칭 (공백 무시). 정식 명칭이 정책명에 포함된 모든 문서로 연결됨
+NAME_ALIASES = {
+    "산대특": "산업구조변화대응",
+    "산업구조변화대응특화훈련": "산업구조변화대응",
+    "k디지털트레이닝": "k-디지털 트레이닝",
+    "케이디지털트레이닝": "k-디지털 트레이닝",
+    "국취제": "국민취업지원제도",
+    "내배카": "국민내일배움카드",
+    "내일배움카드": "국민내일배움카드",
+    "청도약": "청년도약계좌",
+    "기동카": "기후동행카드",
+}
+
+# 쿼리 일부로 일치시킬 최소 이름 길이 (공백 제외 글자 수).
+# 이보다 짧은 이름은 쿼리 전체가 이름과 같을 때만 일치로 봄
+MIN_MATCH_LENGTH = 3
+
+# 로더가 값이 없을 때 채우는 문자열 (common.sanitize_metadata)
+MISSING_VALUE = "정보 없음"
+
+# 트라이 노드에서 이 위치에서 끝나는 이름 키 목록을 담는 키
+_TERMINAL = ""
+
+
+def name_map_path(index_dir, collection_name):
+    """컬렉션의 정책명 맵 저장 경로."""
+    return os.path.join(index_dir, "names", f"{collection_name}.json")
+
+
+def build_name_map(ids, metadatas):
+    """
+    정규화된 정책명 -> 문서 ID 리스트 맵 생성.
+
+    Args:
+        ids (list): 문서 ID 리스트 (Chroma ID).
+        metadatas (list): 문서 메타데이터 리스트.
+
+    Returns:
+        dict: 공백을 제거한 정책명을 key로, 문서 ID 리스트를 value로 하는 딕셔너리.
+    """
+    names = defaultdict(list)
+    for doc_id, metadata in zip(ids, metadatas):
+        name = compact_text((metadata or {}).get("name", ""))
+        if name and name != compact_text(MISSING_VALUE):
+            names[name].append(doc_id)
+    return dict(names)
+
+
+def export_name_map(collection, path):
+    """
+    Chroma 컬렉션의 정책명 맵을 JSON으로 저장.
+
+    - 임시 파일에 쓴 뒤 교체하므로, 읽는 쪽이 반쯤 쓰인 파일을 보지 않음.
+
+    Returns:
+        int: 고유 정책명 수.
+    """
+    result = collection.get(include=["metadatas"])
+    names = build_name_map(result["ids"], result["metadatas"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(names, f, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+    return len(names)
+
+
+def load_name_map(path):
+    """`export_name_map`으로 저장한 맵 로드. 파일이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class NameIndex:
+    """
+    여러 컬렉션의 정책명 맵과 줄임말 테이블을 합친 문자 트라이.
+
+    - 트라이 키는 공백을 제거한 정책명과 줄임말이며, 줄임말은 정식 명칭을 포함하는
+      정책명 키들로 연결됨.
+    - 쿼리를 앞에서부터 훑으며 가장 긴 일치를 고르는 방식(leftmost-longest)으로
+      쿼리 안의 정책명을 모두 찾음. 쿼리 길이 L, 가장 긴 이름 길이 M일 때 O(L·M).
+
+    Args:
+        name_maps (dict): 컬렉션 이름을 key로, `build_name_map` 결과를 value로 하는 딕셔너리.
+        aliases (dict): 줄임말 -> 정식 명칭 딕셔너리.
+    """
+
+    def __init__(self, name_maps, aliases=NAME_ALIASES):
+        self.entries = defaultdict(list)
+        for collection_name, names in name_maps.items():
+            for name, ids in names.items():
+                self.entries[name].extend((collection_name, doc_id) for doc_id in ids)
+
+        self.root = {}
+        for name in self.entries:
+            self._insert(name, [name])
+        for alias, target in aliases.items():
+            target = compact_text(target)
+            names = [name for name in self.entries if target in name]
+            if names:
+                self._insert(compact_text(alias), names)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _insert(self, key, names):
+        node = self.root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        terminal = node.setdefault(_TERMINAL, [])
+        terminal.extend(name for name in names if name not in terminal)
+
+    def match(self, query):
+        """
+        쿼리에 들어 있는 정책명 키를 등장 순서대로 반환.
+
+        - 겹치는 일치는 먼저 시작하는 가장 긴 것만 사용.
+        - MIN_MATCH_LENGTH보다 짧은 키는 쿼리 전체와 같을 때만 일치로 봄.
+
+        Returns:
+            list: 정책명 키 리스트 (중복 제거).
+        """
+        text = compact_text(query)
+        matched = []
+        start = 0
+        while start < len(text):
+            node, end, names = self.root, None, None
+            for i in range(start, len(text)):
+                node = node.get(text[i])
+                if node is None:
+                    break
+                if _TERMINAL in node:
+                    length = i + 1 - start
+                    if length >= MIN_MATCH_LENGTH or length == len(text):
+                        end, names = i + 1, node[_TERMINAL]
+            if end is None:
+                start += 1
+                continue
+            matched.extend(name for name in names if name not in matched)
+            start = end
+        return matched
+
+    def lookup(self, query):
+        """
+        쿼리에 들어 있는 정책명의 문서 목록.
+
+        Returns:
+            list: [(컬렉션 이름, 문서 ID)] 정책명 등장 순서 리스트.
+        """
+        return [entry for name in self.match(query) for entry in self.entries[name]]
+
+    def covers(self, query):
+        """쿼리 전체가 하나의 정책명(또는 줄임말)인지 여부."""
+        node = self.root
+        for ch in compact_text(query):
+            node = node.get(ch)
+            if node is None:
+                return False
+        return _TERMINAL in node
@@ -0,0 +1,34 @@
+"""
+검색용 텍스트 정규화 유틸리티 (normalize.py)
+- 쿼리 캐시 키, 메타데이터 인덱스 등에서 같은 규칙으로 문자열을 비교하기 위해 사용
+"""
+
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """
+    NFKC 정규화 + 소문자 변환 + 연속 공백 축약.
+
+    Args:
+        text (str): 원본 문자열.
+
+    Returns:
+        str: 정규화된 문자열.
+    """
+    if text is None:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def compact_text(text):
+    """
+    `normalize_text` 결과에서 공백까지 제거한 문자열.
+
+    - "경기 패스"와 "경기패스"처럼 띄어쓰기만 다른 이름을 같은 값으로 취급할 때 사용.
+    """
+    return normalize_text(text).replace(" ", "")
@@ -0,0 +1,180 @@
+"""
+지역 정규화 및 파티션 라우팅 (regions.py)
+- 로더마다 형식이 다른 자유 텍스트 region 메타데이터("서울시", "경기도 안산시",
+  "고용노동부" 등)를 17개 시/도 또는 전국 중 하나의 region_key로 매핑
+- dataload가 region_key별 파티션 컬렉션(및 스냅샷)을 따로 만들고, 검색 시 region 필터는
+  전체 컬렉션에 대한 부분 문자열 필터 대신 해당 시/도 파티션 + 전국 파티션 검색으로 바뀜
+"""
+
+import json
+import os
+
+from .normalize import compact_text
+
+# 메타데이터 필드명 (로더가 문서마다 기록)
+REGION_KEY_FIELD = "region_key"
+
+# 특정 시/도로 매핑되지 않는 문서(전국 단위, 중앙부처, 지역 정보 없음)의 파티션
+NATIONWIDE = "전국"
+
+# 시/도 정식 명칭 -> 별칭. accounts.Region 테이블이 비어 있어도 쓸 수 있는 고정 목록
+PROVINCES = {
+    "서울특별시": ("서울", "서울시"),
+    "부산광역시": ("부산", "부산시"),
+    "대구광역시": ("대구", "대구시"),
+    "인천광역시": ("인천", "인천시"),
+    "광주광역시": ("광주", "광주시"),
+    "대전광역시": ("대전", "대전시"),
+    "울산광역시": ("울산", "울산시"),
+    "세종특별자치시": ("세종", "세종시"),
+    "경기도": ("경기",),
+    "강원특별자치도": ("강원", "강원도"),
+    "충청북도": ("충북",),
+    "충청남도": ("충남",),
+    "전북특별자치도": ("전북", "전라북도"),
+    "전라남도": ("전남",),
+    "경상북도": ("경북",),
+    "경상남도": ("경남",),
+    "제주특별자치도": ("제주", "제주도"),
+}
+
+
+# 파티션 컬렉션 이름에 쓰는 영문 식별자 (Chroma 컬렉션 이름은 영문/숫자/._-만 허용)
+PARTITION_SLUGS = {
+    "서울특별시": "seoul",
+    "부산광역시": "busan",
+    "대구광역시": "daegu",
+    "인천광역시": "incheon",
+    "광주광역시": "gwangju",
+    "대전광역시": "daejeon",
+    "울산광역시": "ulsan",
+    "세종특별자치시": "sejong",
+    "경기도": "gyeonggi",
+    "강원특별자치도": "gangwon",
+    "충청북도": "chungbuk",
+    "충청남도": "chungnam",
+    "전북특별자치도": "jeonbuk",
+    "전라남도": "jeonnam",
+    "경상북도": "gyeongbuk",
+    "경상남도": "gyeongnam",
+    "제주특별자치도": "jeju",
+    NATIONWIDE: "nationwide",
+}
+
+
+def _build_aliases():
+    aliases = {}
+    for province, names in PROVINCES.items():
+        for name in (province, *names):
+            aliases[compact_text(name)] = province
+    return aliases
+
+
+_ALIASES = _build_aliases()
+
+
+def load_subregions():
+    """
+    accounts.SubRegion 테이블에서 시/군/구 이름 -> 시/도 정식 명칭 맵을 만듦.
+
+    - 여러 시/도에 같은 이름이 있는 시/군/구(중구, 동구 등)는 모호하므로 제외.
+    - 테이블을 읽을 수 없으면(마이그레이션 전 등) 빈 dict를 반환하고 시/도 별칭만 사용.
+
+    Returns:
+        dict: 공백을 제거한 시/군/구 이름을 key로, 시/도 정식 명칭을 value로 하는 딕셔너리.
+    """
+    try:
+        from accounts.models import SubRegion
+
+        rows = list(SubRegion.objects.values_list("name", "region__name"))
+    except Exception:
+        return {}
+
+    subregions, ambiguous = {}, set()
+    for name, region_name in rows:
+        province = region_key(region_name)
+        key = compact_text(name)
+        if province == NATIONWIDE or not key:
+            continue
+        if subregions.get(key, province) != province:
+            ambiguous.add(key)
+        subregions[key] = province
+    for key in ambiguous:
+        del subregions[key]
+    return subregions
+
+
+def region_key(text, subregions=None):
+    """
+    자유 텍스트 지역명을 시/도 정식 명칭 또는 NATIONWIDE로 매핑.
+
+    - 시/도 별칭 중 가장 앞에 나오는 것(같은 위치면 가장 긴 것)을 사용하므로,
+      "경기도 광주시"는 광주광역시가 아니라 경기도로 매핑됨.
+    - 별칭이 없으면 띄어쓰기 단위로 시/군/구 맵을 찾아봄.
+
+    Args:
+        text (str): region 메타데이터 또는 필터 값.
+        subregions (dict, optional): `load_subregions` 결과.
+
+    Returns:
+        str: 시/도 정식 명칭. 특정할 수 없으면 NATIONWIDE.
+    """
+    compact = compact_text(text)
+    best = None
+    for alias, province in _ALIASES.items():
+        position = compact.find(alias)
+        if position < 0:
+            continue
+        rank = (position, -len(alias))
+        if best is None or rank < best[0]:
+            best = (rank, province)
+    if best is not None:
+        return best[1]
+
+    for token in (text or "").split():
+        province = (subregions or {}).get(compact_text(token))
+        if province:
+            return province
+    return NATIONWIDE
+
+
+def route_region(value):
+    """
+    region 필터 값을 검색할 파티션 목록으로 변환.
+
+    Returns:
+        tuple | None: (시/도, NATIONWIDE) 또는 (NATIONWIDE,). 시/도를 특정할 수 없으면
+            None이며, 이 경우 기존 부분 문자열 필터를 그대로 사용.
+    """
+    province = region_key(value)
+    if province != NATIONWIDE:
+        return (province, NATIONWIDE)
+    if compact_text(value) == compact_text(NATIONWIDE):
+        return (NATIONWIDE,)
+    return None
+
+
+def partition_collection_name(collection_name, key):
+    """region_key 파티션의 Chroma 컬렉션 이름. 예: unified_data__seoul"""
+    return f"{collection_name}__{PARTITION_SLUGS[key]}"
+
+
+def partition_manifest_path(index_dir, collection_name):
+    """컬렉션의 파티션 목록(region_key -> 파티션 컬렉션 이름) 저장 경로."""
+    return os.path.join(index_dir, "partitions", f"{collection_name}.json")
+
+
+def save_partition_manifest(path, manifest):
+    """파티션 목록 저장. 임시 파일에 쓴 뒤 교체."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_partition_manifest(path):
+    """`save_partition_manifest`로 저장한 파티션 목록 로드. 파일이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
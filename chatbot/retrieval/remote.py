@@ -0,0 +1,279 @@
+"""
+검색 서비스 클라이언트 (remote.py)
+- RETRIEVER_SERVICE_URL이 설정되면 VectorRetriever()가 인덱스를 직접 로드하는 대신
+  이 모듈의 RemoteRetriever를 반환하므로, 웹/Celery 워커는 Chroma 클라이언트와 임베딩 모델을
+  열지 않고 호스트당 하나인 검색 서비스(service.py)에 요청함
+- 서비스 주소는 "http://host:port" 또는 "unix:///path/to/socket" 형식
+- 연결은 urllib3 연결 풀로 keep-alive 재사용
+- 비동기 메서드는 연결 풀 크기만큼의 전용 스레드 풀에서 요청하므로, 기본 스레드 풀을 점유하지
+  않고 연결 수만큼 동시에 요청할 수 있음
+"""
+
+import asyncio
+import json
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import urllib3
+from langchain_core.documents import Document
+from urllib3.connection import HTTPConnection
+
+from .context_builder import build_context
+
+
+class RetrievalServiceError(RuntimeError):
+    """검색 서비스가 오류 응답을 반환했거나 연결할 수 없을 때 발생."""
+
+
+def encode_results(results):
+    """[(컬렉션 이름, Document, score)] -> JSON 직렬화 가능한 리스트."""
+    return [
+        [
+            name,
+            {"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata},
+            float(score),
+        ]
+        for name, doc, score in results
+    ]
+
+
+def decode_results(payload):
+    """`encode_results` 결과 -> [(컬렉션 이름, Document, score)]."""
+    return [(name, Document(**doc), score) for name, doc, score in payload]
+
+
+class UnixHTTPConnection(HTTPConnection):
+    """Unix 도메인 소켓으로 연결하는 urllib3 HTTP 연결."""
+
+    def __init__(self, *args, socket_path, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+
+class UnixHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    """Unix 도메인 소켓용 urllib3 연결 풀."""
+
+    ConnectionCls = UnixHTTPConnection
+
+
+def connection_pool(url, pool_size, timeout):
+    """
+    서비스 주소에 맞는 urllib3 연결 풀 생성.
+
+    Args:
+        url (str): "http://host:port" 또는 "unix:///path/to/socket".
+        pool_size (int): 유지할 최대 연결 수. 모두 사용 중이면 반납될 때까지 대기.
+        timeout (float): 요청 타임아웃(초).
+
+    Returns:
+        urllib3.HTTPConnectionPool: 연결 풀.
+    """
+    parts = urlsplit(url)
+    options = {"maxsize": pool_size, "block": True, "timeout": timeout, "retries": 2}
+    if parts.scheme == "unix":
+        return UnixHTTPConnectionPool("localhost", socket_path=parts.path, **options)
+    if parts.scheme == "http":
+        return urllib3.HTTPConnectionPool(parts.hostname, parts.port or 80, **options)
+    raise ValueError(f"지원하지 않는 검색 서비스 주소입니다: {url}")
+
+
+class RemoteRetriever:
+    """
+    검색 서비스에 요청하는 VectorRetriever 대체 클라이언트.
+
+    - search / asearch / search_many / search_and_format / embed_query / get_stats는 서비스가
+      처리하며, 결과 캐시와 임베딩 캐시도 서비스 프로세스 하나에만 존재.
+    - build_context / format_docs는 인덱스가 필요 없으므로 워커에서 직접 처리.
+
+    Args:
+        url (str): 검색 서비스 주소.
+        pool_size (int): 연결 풀 크기.
+        timeout (float): 요청 타임아웃(초).
+    """
+
+    def __init__(self, url, pool_size=8, timeout=30.0):
+        self.url = url
+        self._pool = connection_pool(url, pool_size, timeout)
+        # 비동기 요청용 스레드 풀 (연결 풀보다 많으면 연결 반납을 기다리는 스레드만 늘어남)
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="retrieval-client"
+        )
+
+    def _request(self, method, path, payload=None):
+        """
+        JSON 요청을 보내고 응답 본문을 반환.
+
+        - 서비스가 400을 반환하면(잘못된 검색 모드 등) 로컬 검색과 같게 ValueError를 발생.
+        """
+        body = None
+        if payload is not None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        try:
+            response = self._pool.request(
+                method, path, body=body, headers={"Content-Type": "application/json"}
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise RetrievalServiceError(
+                f"검색 서비스 연결 실패({self.url}): {e}"
+            ) from e
+
+        data = json.loads(response.data or b"{}")
+        if response.status == 400:
+            raise ValueError(data.get("error"))
+        if response.status != 200:
+            raise RetrievalServiceError(
+                f"검색 서비스 오류({response.status}): {data.get('error')}"
+            )
+        return data
+
+    def search(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        query_embedding=None,
+        mode="vector",
+        diversify=False,
+    ):
+        """`VectorRetriever.search`와 같은 인자/반환값."""
+        if query_embedding is not None:
+            query_embedding = [float(value) for value in query_embedding]
+        data = self._request(
+            "POST",
+            "/search",
+            {
+                "query": query,
+                "k": k,
+                "filters": filters,
+                "collection_names": collection_names,
+                "query_embedding": query_embedding,
+                "mode": mode,
+                "diversify": diversify,
+            },
+        )
+        return decode_results(data["results"])
+
+    async def asearch(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        query_embedding=None,
+        mode="vector",
+        diversify=False,
+    ):
+        """`search`의 비동기 버전. 요청은 클라이언트 전용 스레드 풀에서 실행."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: self.search(
+                query,
+                k=k,
+                filters=filters,
+                collection_names=collection_names,
+                query_embedding=query_embedding,
+                mode=mode,
+                diversify=diversify,
+            ),
+        )
+
+    def search_many(
+        self,
+        queries,
+        k=5,
+        filters=None,
+        collection_names=None,
+        mode="vector",
+        diversify=False,
+    ):
+        """`VectorRetriever.search_many`와 같은 인자/반환값."""
+        data = self._request(
+            "POST",
+            "/search_many",
+            {
+                "queries": list(queries),
+                "k": k,
+                "filters": filters,
+                "collection_names": collection_names,
+                "mode": mode,
+                "diversify": diversify,
+            },
+        )
+        return [decode_results(results) for results in data["results"]]
+
+    def search_and_format(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        mode="vector",
+        max_tokens=None,
+        diversify=False,
+    ):
+        """`VectorRetriever.search_and_format`과 같은 인자/반환값."""
+        data = self._request(
+            "POST",
+            "/search_and_format",
+            {
+                "query": query,
+                "k": k,
+                "filters": filters,
+                "collection_names": collection_names,
+                "mode": mode,
+                "max_tokens": max_tokens,
+                "diversify": diversify,
+            },
+        )
+        return decode_results(data["results"]), data["text"]
+
+    async def asearch_and_format(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        mode="vector",
+        max_tokens=None,
+        diversify=False,
+    ):
+        """`search_and_format`의 비동기 버전. 요청은 클라이언트 전용 스레드 풀에서 실행."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: self.search_and_format(
+                query,
+                k=k,
+                filters=filters,
+                collection_names=collection_names,
+                mode=mode,
+                max_tokens=max_tokens,
+                diversify=diversify,
+            ),
+        )
+
+    def embed_query(self, query):
+        """`VectorRetriever.embed_query`와 같은 인자/반환값 (서비스의 임베딩 캐시 사용)."""
+        return self._request("POST", "/embed", {"query": query})["embedding"]
+
+    def get_stats(self):
+        """검색 서비스의 누적 검색 통계."""
+        return self._request("GET", "/stats")
+
+    def build_context(self, docs, max_tokens=None):
+        """검색 결과를 토큰 예산 안에서 마크다운으로 조립."""
+        return build_context(docs, max_tokens=max_tokens)
+
+    def format_docs(self, docs, max_tokens=None):
+        """검색 결과를 마크다운 문자열로 변환."""
+        return self.build_context(docs, max_tokens=max_tokens).text
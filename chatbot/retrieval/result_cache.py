@@ -0,0 +1,129 @@
+"""
+검색 결과 캐시 (result_cache.py)
+- (정규화된 쿼리, 컬렉션 집합, k, 필터) 단위로 정렬된 검색 결과와 포맷된 마크다운을 저장
+- 항목마다 인덱스 세대 번호를 기록해, 세대가 바뀌면 자동으로 무효화
+- 결과가 없던 필터 조합은 쿼리와 무관하게 짧은 TTL 동안 따로 기억 (negative cache)
+"""
+
+import json
+
+from .lru import LRUCache
+from .normalize import compact_text, normalize_text
+
+
+class CachedResult:
+    """
+    캐시 항목.
+
+    Attributes:
+        generation (int): 항목을 만들 때의 인덱스 세대 번호.
+        results (list): [(컬렉션 이름, Document, score)] 정렬된 검색 결과.
+        formatted (dict): 포맷 옵션 -> 마크다운 문자열.
+    """
+
+    __slots__ = ("generation", "results", "formatted")
+
+    def __init__(self, generation, results):
+        self.generation = generation
+        self.results = list(results)
+        self.formatted = {}
+
+    @property
+    def hits(self):
+        """[(컬렉션 이름, 문서 ID, score)] 형태의 순위 목록."""
+        return [(name, doc.id, score) for name, doc, score in self.results]
+
+
+class ResultCache:
+    """
+    인덱스 세대 번호로 무효화되는 검색 결과 LRU 캐시.
+
+    Args:
+        maxsize (int): 최대 항목 수.
+        ttl (float): 항목 만료 시간(초). 세대 번호를 확인할 수 없을 때의 안전장치.
+        negative_ttl (float): 결과가 없던 필터 조합을 기억할 시간(초). 0이면 사용 안 함.
+    """
+
+    def __init__(self, maxsize, ttl, negative_ttl=0):
+        self._cache = LRUCache(maxsize, ttl)
+        self._negative = LRUCache(maxsize, negative_ttl)
+        self.negative_ttl = negative_ttl
+        self.generation = 0
+
+    @staticmethod
+    def make_key(query, collection_names, k, filters=None, **options):
+        """
+        검색 조건으로 캐시 키 생성.
+
+        - 쿼리는 정규화하고, 컬렉션/필터/옵션은 순서와 무관하게 정렬.
+        """
+        return json.dumps(
+            [
+                normalize_text(query),
+                sorted(collection_names),
+                k,
+                sorted((filters or {}).items()),
+                sorted(options.items()),
+            ],
+            ensure_ascii=False,
+            default=str,
+        )
+
+    @classmethod
+    def make_filter_key(cls, collection_names, filters, **options):
+        """
+        쿼리와 k를 제외한 필터 조합 키 생성 (negative cache용).
+
+        - 필터 값은 대소문자/전각/띄어쓰기를 무시하도록 정규화.
+        """
+        normalized = {
+            key: compact_text(value) if isinstance(value, str) else value
+            for key, value in (filters or {}).items()
+        }
+        return cls.make_key("", collection_names, None, normalized, **options)
+
+    def get(self, key):
+        """현재 세대의 캐시 항목을 반환. 없거나 이전 세대면 None."""
+        entry = self._cache.get(key)
+        if entry is None or entry.generation != self.generation:
+            return None
+        return entry
+
+    def set(self, key, results, generation=None):
+        """
+        검색 결과를 저장.
+
+        - generation은 검색을 시작할 때의 세대. 그사이 세대가 바뀌었으면 이전 세대 항목으로
+          저장되므로 조회되지 않음. None이면 현재 세대.
+        """
+        if generation is None:
+            generation = self.generation
+        self._cache.set(key, CachedResult(generation, results))
+
+    def set_formatted(self, key, variant, formatted, generation=None):
+        """이미 저장된 검색 결과에 포맷된 마크다운을 추가."""
+        if generation is not None and generation != self.generation:
+            return
+        entry = self.get(key)
+        if entry is not None:
+            entry.formatted[variant] = formatted
+
+    def mark_empty(self, filter_key, generation=None):
+        """필터 조합에 일치하는 문서가 없다고 기록. generation은 `set`과 같음."""
+        if self.negative_ttl > 0:
+            self._negative.set(
+                filter_key, self.generation if generation is None else generation
+            )
+
+    def is_empty(self, filter_key):
+        """현재 세대에서 결과가 없다고 기록된 필터 조합인지 여부."""
+        return self._negative.get(filter_key) == self.generation
+
+    def invalidate(self, generation):
+        """세대 번호를 바꾸고 기존 항목을 모두 버림."""
+        self.generation = generation
+        self._cache.clear()
+        self._negative.clear()
+
+    def __len__(self):
+        return len(self._cache)
@@ -0,0 +1,188 @@
+"""
+공유 검색 서비스 (service.py)
+- 호스트당 하나의 프로세스가 Chroma 컬렉션/스냅샷, 임베딩 모델과 캐시, 검색 결과 캐시를 소유하고
+  HTTP(TCP 또는 Unix 도메인 소켓)로 검색 요청을 처리
+- 웹/Celery 워커는 RETRIEVER_SERVICE_URL만 설정하면 VectorRetriever()가 RemoteRetriever
+  클라이언트를 반환하므로 코드 변경 없이 서비스를 사용
+
+엔드포인트:
+    POST /search, /search_many, /search_and_format, /embed  (VectorRetriever 메서드 인자를 JSON으로)
+    GET  /stats, /health
+
+사용 예:
+    python -m chatbot.retrieval.service --url unix:///run/ainfo/retrieval.sock
+    python -m chatbot.retrieval.service --url http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .remote import encode_results
+
+logger = logging.getLogger(__name__)
+
+# 유휴 keep-alive 연결을 닫기까지의 시간(초). 연결마다 스레드 하나를 점유하므로 제한
+IDLE_TIMEOUT = 60
+
+
+def _search(retriever, body):
+    return {"results": encode_results(retriever.search(**body))}
+
+
+def _search_many(retriever, body):
+    return {
+        "results": [
+            encode_results(results) for results in retriever.search_many(**body)
+        ]
+    }
+
+
+def _search_and_format(retriever, body):
+    results, text = retriever.search_and_format(**body)
+    return {"results": encode_results(results), "text": text}
+
+
+def _embed(retriever, body):
+    return {"embedding": [float(value) for value in retriever.embed_query(**body)]}
+
+
+ROUTES = {
+    "/search": _search,
+    "/search_many": _search_many,
+    "/search_and_format": _search_and_format,
+    "/embed": _embed,
+}
+
+
+class RetrievalRequestHandler(BaseHTTPRequestHandler):
+    """
+    검색 요청 핸들러. 연결마다 스레드 하나에서 실행되며 keep-alive(HTTP/1.1)를 유지.
+
+    - 잘못된 인자(TypeError/ValueError)는 400, 그 외 예외는 500으로 응답.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT
+
+    def setup(self):
+        super().setup()
+        if self.connection.family in (socket.AF_INET, socket.AF_INET6):
+            # 헤더와 본문을 따로 쓰므로, Nagle 알고리즘이 켜져 있으면 응답마다 클라이언트의
+            # 지연 ACK(약 40ms)만큼 늦어짐
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send(200, self.server.retriever.get_stats())
+        else:
+            self._send(404, {"error": f"알 수 없는 경로입니다: {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        handler = ROUTES.get(self.path)
+        if handler is None:
+            self._send(404, {"error": f"알 수 없는 경로입니다: {self.path}"})
+            return
+        try:
+            payload = handler(self.server.retriever, json.loads(body or b"{}"))
+        except (TypeError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            logger.exception("검색 요청 처리 실패: %s", self.path)
+            self._send(500, {"error": str(e)})
+            return
+        self._send(200, payload)
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Unix 소켓에는 클라이언트 주소가 없으므로 기본 구현(address_string) 대신 사용
+        logger.debug("%s " + format, self.command, *args)
+
+
+class UnixRetrievalServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix 도메인 소켓 위의 스레드형 HTTP 서버."""
+
+    daemon_threads = True
+
+
+def make_server(url, retriever):
+    """
+    서비스 주소에 맞는 HTTP 서버 생성.
+
+    - Unix 소켓이면 이전 실행이 남긴 소켓 파일을 지우고 바인딩.
+
+    Args:
+        url (str): "http://host:port" 또는 "unix:///path/to/socket".
+        retriever (VectorRetriever): 요청을 처리할 로컬 검색기.
+
+    Returns:
+        socketserver.BaseServer: `serve_forever`로 실행할 서버.
+    """
+    parts = urlsplit(url)
+    if parts.scheme == "unix":
+        if os.path.exists(parts.path):
+            os.unlink(parts.path)
+        os.makedirs(os.path.dirname(parts.path) or ".", exist_ok=True)
+        server = UnixRetrievalServer(parts.path, RetrievalRequestHandler)
+    elif parts.scheme == "http":
+        server = ThreadingHTTPServer(
+            (parts.hostname, parts.port or 80), RetrievalRequestHandler
+        )
+    else:
+        raise ValueError(f"지원하지 않는 검색 서비스 주소입니다: {url}")
+    server.retriever = retriever
+    return server
+
+
+def main():
+    """
+    명령어 인자를 받아 검색 서비스를 실행
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+
+    from chatbot.retriever import VectorRetriever
+
+    parser = argparse.ArgumentParser(description="공유 검색 서비스")
+    parser.add_argument(
+        "--url",
+        default=settings.RETRIEVER_SERVICE_URL or "http://127.0.0.1:8765",
+        help="바인딩할 주소 (http://host:port 또는 unix:///path)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    retriever = VectorRetriever.local()
+    server = make_server(args.url, retriever)
+    logger.info("검색 서비스 시작: %s", args.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
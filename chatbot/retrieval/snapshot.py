@@ -0,0 +1,308 @@
+"""
+NumPy 벡터 스냅샷 (snapshot.py)
+- dataload 파이프라인이 컬렉션마다 임베딩 행렬(.npy)과 문서 ID/검색용 메타데이터 열(.json)을 내보냄
+- 본문과 나머지 메타데이터는 워커 힙에 올리지 않고, top-k를 고른 뒤 검색기가 Chroma에서
+  ID로 가져옴
+- 검색 프로세스는 행렬을 읽기 전용 mmap으로 열어 워커 간에 페이지를 공유하고,
+  쿼리당 한 번의 행렬곱으로 전수 검색 (Chroma와 같은 제곱 L2 거리)
+- 양자화 모드(int8/float16)에서는 작은 양자화 행렬로 후보를 찾고, 상위 후보만
+  float32 원본으로 다시 계산하므로 원본 행렬 페이지는 대부분 메모리에 올라오지 않음
+"""
+
+import json
+import os
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .deadlines import APPLY_END_FIELD, deadline_of
+from .metadata_index import INDEXED_FIELDS
+from .regions import REGION_KEY_FIELD
+
+QUANTIZATIONS = ("none", "int8", "float16")
+# 양자화 행렬은 BLAS를 쓸 수 없으므로 이 행 수 단위로 float32 버퍼에 옮겨 계산
+# (버퍼가 CPU 캐시에 머무는 크기일 때 가장 빠름)
+QUANTIZED_CHUNK_ROWS = 256
+# 재계산할 후보 수 = max(k * RESCORE_FACTOR, RESCORE_MIN)
+RESCORE_FACTOR = 10
+RESCORE_MIN = 50
+
+EMBEDDINGS_FILE = "embeddings.npy"
+NORMS_FILE = "norms.npy"
+INT8_FILE = "embeddings_int8.npy"
+INT8_SCALES_FILE = "scales_int8.npy"
+FLOAT16_FILE = "embeddings_float16.npy"
+META_FILE = "meta.json"
+
+# 스냅샷에 남기는 메타데이터 열 (top-k 전에 필요한 역색인/필터, 지역 파티션, 마감일 필드)
+METADATA_COLUMNS = INDEXED_FIELDS + (REGION_KEY_FIELD, APPLY_END_FIELD)
+
+
+def snapshot_path(index_dir, collection_name):
+    """컬렉션 스냅샷 디렉터리 경로."""
+    return os.path.join(index_dir, "snapshots", collection_name)
+
+
+def _replace_file(path, write):
+    """임시 파일에 쓴 뒤 교체. 기존 파일을 mmap 중인 프로세스는 이전 내용을 계속 봄."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def quantize_int8(matrix):
+    """
+    벡터별 스케일을 둔 int8 스칼라 양자화.
+
+    Returns:
+        tuple: (int8 행렬, float32 스케일 벡터). 원본 ≈ int8 행렬 * 스케일[:, None]
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.zeros(0)
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(matrix / scales[:, None]), -127, 127)
+    return quantized.astype(np.int8), scales
+
+
+def export_snapshot(collection, path, quantization="none"):
+    """
+    Chroma 컬렉션을 NumPy 스냅샷으로 내보냄.
+
+    - float32 원본(재계산용)과 함께 quantization에 해당하는 양자화 행렬만 저장하고,
+      이전에 다른 방식으로 저장한 양자화 행렬은 삭제 (원본과 어긋난 행렬이 남지 않게).
+    - 메타데이터는 METADATA_COLUMNS만 열 단위로 저장하고 본문은 저장하지 않음.
+
+    Args:
+        collection (Chroma): LangChain Chroma 컬렉션 인스턴스.
+        path (str): 스냅샷 디렉터리.
+        quantization (str): 함께 저장할 양자화 방식 ("none", "int8", "float16").
+
+    Returns:
+        int: 내보낸 문서 수.
+    """
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantization}")
+    result = collection.get(include=["embeddings", "metadatas"])
+    matrix = np.asarray(result["embeddings"], dtype=np.float32)
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(0, 0)
+    norms = (matrix**2).sum(axis=1).astype(np.float32)
+    arrays = [(EMBEDDINGS_FILE, matrix), (NORMS_FILE, norms)]
+    if quantization == "int8":
+        int8_matrix, int8_scales = quantize_int8(matrix)
+        arrays += [(INT8_FILE, int8_matrix), (INT8_SCALES_FILE, int8_scales)]
+    elif quantization == "float16":
+        arrays.append((FLOAT16_FILE, matrix.astype(np.float16)))
+
+    os.makedirs(path, exist_ok=True)
+    metadatas = [metadata or {} for metadata in result["metadatas"]]
+    meta = {
+        "dimensions": int(matrix.shape[1]),
+        "ids": result["ids"],
+        "columns": {
+            column: [metadata.get(column) for metadata in metadatas]
+            for column in METADATA_COLUMNS
+        },
+    }
+    for filename, array in arrays:
+        _replace_file(os.path.join(path, filename), lambda f: np.save(f, array))
+    written = {filename for filename, _ in arrays}
+    for filename in (INT8_FILE, INT8_SCALES_FILE, FLOAT16_FILE):
+        if filename not in written and os.path.exists(os.path.join(path, filename)):
+            os.remove(os.path.join(path, filename))
+    _replace_file(
+        os.path.join(path, META_FILE),
+        lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+    )
+    return len(result["ids"])
+
+
+class NumpySnapshot:
+    """
+    mmap으로 연 임베딩 행렬 위의 전수 검색.
+
+    - 거리는 ||x||² - 2x·q + ||q||² (제곱 L2)로 계산하며, ||x||²는 내보낼 때 미리 저장.
+    - 여러 쿼리는 (n, d) 행렬 하나로 묶어 한 번의 행렬곱으로 처리.
+    - quantization이 int8/float16이면 양자화 행렬로 근사 거리를 구해 후보를 뽑고,
+      후보만 float32 원본으로 다시 계산해 최종 순위를 정함.
+    - 결과 Document는 본문이 비어 있고 메타데이터도 METADATA_COLUMNS만 담고 있으므로,
+      호출자가 ID로 원본 문서를 가져와야 함.
+
+    Args:
+        path (str): 스냅샷 디렉터리.
+        quantization (str): "none", "int8", "float16".
+    """
+
+    def __init__(self, path, quantization="none"):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantization}")
+        self.path = path
+        self.quantization = quantization
+        self.matrix = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+        self.norms = np.load(os.path.join(path, NORMS_FILE), mmap_mode="r")
+        self.quantized = self.scales = None
+        if quantization == "int8":
+            self.quantized = np.load(os.path.join(path, INT8_FILE), mmap_mode="r")
+            self.scales = np.load(os.path.join(path, INT8_SCALES_FILE))
+        elif quantization == "float16":
+            self.quantized = np.load(os.path.join(path, FLOAT16_FILE), mmap_mode="r")
+
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.dimensions = meta["dimensions"]
+        self.ids = meta["ids"]
+        self.columns = meta["columns"]
+        self.positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.deadlines = np.asarray(
+            [deadline_of(self.metadata(i)) for i in range(len(self.ids))],
+            dtype=np.int64,
+        )
+
+    @classmethod
+    def load(cls, path, quantization="none"):
+        """스냅샷 로드. 없으면 None."""
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            return None
+        return cls(path, quantization=quantization)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def scan_nbytes(self):
+        """후보 검색 때 전부 읽는 행렬의 바이트 수 (프로세스에 상주하는 크기)."""
+        if self.quantized is None:
+            return self.matrix.nbytes
+        return self.quantized.nbytes + (
+            0 if self.scales is None else self.scales.nbytes
+        )
+
+    def supports(self, filters):
+        """필터 키가 모두 스냅샷에 저장된 메타데이터 열인지 여부."""
+        return not filters or all(key in self.columns for key in filters)
+
+    def metadata(self, position):
+        """행 번호에 해당하는 검색용 메타데이터 (값이 없는 열은 제외)."""
+        return {
+            column: values[position]
+            for column, values in self.columns.items()
+            if values[position] is not None
+        }
+
+    def document(self, position):
+        """행 번호에 해당하는 본문 없는 LangChain Document 반환."""
+        return Document(
+            page_content="", metadata=self.metadata(position), id=self.ids[position]
+        )
+
+    def _dot(self, queries, rows=None, exact=False):
+        """
+        (행 수, 쿼리 수) 내적 행렬. rows가 주어지면 해당 행만 계산.
+
+        - exact가 아니고 양자화 모드이면 양자화 행렬을 청크 단위로 재사용하는 float32
+          버퍼에 옮겨 계산.
+        """
+        if exact or self.quantized is None:
+            matrix = self.matrix if rows is None else self.matrix[rows]
+            return matrix @ queries.T
+
+        matrix = self.quantized if rows is None else self.quantized[rows]
+        dots = np.empty((len(matrix), len(queries)), dtype=np.float32)
+        buffer = np.empty((QUANTIZED_CHUNK_ROWS, matrix.shape[1]), dtype=np.float32)
+        for start in range(0, len(matrix), QUANTIZED_CHUNK_ROWS):
+            chunk = matrix[start : start + QUANTIZED_CHUNK_ROWS]
+            converted = buffer[: len(chunk)]
+            np.copyto(converted, chunk, casting="unsafe")
+            dots[start : start + len(chunk)] = converted @ queries.T
+        if self.scales is not None:
+            dots *= (self.scales if rows is None else self.scales[rows])[:, None]
+        return dots
+
+    def distances(self, queries, rows=None, exact=False):
+        """
+        쿼리별 제곱 L2 거리 (양자화 모드에서 exact가 아니면 근사값).
+
+        Args:
+            queries (np.ndarray): (쿼리 수, 차원) float32 행렬.
+            rows (np.ndarray, optional): 계산할 행 번호. None이면 전체.
+            exact (bool): 양자화 모드에서도 float32 원본으로 계산할지 여부.
+
+        Returns:
+            np.ndarray: (쿼리 수, 행 수) 거리 행렬.
+        """
+        norms = self.norms if rows is None else self.norms[rows]
+        query_norms = (queries**2).sum(axis=1)
+        dots = self._dot(queries, rows, exact=exact)
+        return np.maximum(norms[:, None] - 2 * dots + query_norms, 0.0).T
+
+    def search(
+        self, queries, k, rows=None, predicate=None, rescore=True, active_on=None
+    ):
+        """
+        쿼리마다 거리 상위 k개 문서 검색.
+
+        Args:
+            queries (list | np.ndarray): 쿼리 임베딩 하나 또는 (쿼리 수, 차원) 행렬.
+            k (int): 쿼리별 결과 수.
+            rows (list, optional): 검색 대상으로 제한할 행 번호.
+            predicate (callable, optional): metadata -> bool. 거리순으로 훑으며 통과한
+                문서만 담음.
+            rescore (bool): 양자화 모드에서 후보를 float32 원본으로 다시 계산할지 여부.
+            active_on (int, optional): YYYYMMDD. 주어지면 마감일이 이보다 이전인 행은
+                거리를 inf로 두어 후보에서 제외.
+
+        Returns:
+            list: 쿼리마다 [(Document, score)] 거리 오름차순 리스트.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        if rows is not None:
+            rows = np.asarray(sorted(rows), dtype=np.int64)
+        n_rows = len(self.ids) if rows is None else len(rows)
+        if n_rows == 0:
+            return [[] for _ in range(len(queries))]
+
+        rescore = rescore and self.quantized is not None
+        limit = max(k * RESCORE_FACTOR, RESCORE_MIN) if rescore else k
+
+        all_distances = self.distances(queries, rows)
+        if active_on is not None:
+            deadlines = self.deadlines if rows is None else self.deadlines[rows]
+            all_distances[:, deadlines < active_on] = np.inf
+
+        results = []
+        for query, distances in zip(queries, all_distances):
+            if predicate is None and limit < n_rows:
+                order = np.argpartition(distances, limit - 1)[:limit]
+                order = order[np.argsort(distances[order])]
+            else:
+                order = np.argsort(distances)
+
+            candidates, scores = [], []
+            for i in order:
+                if distances[i] == np.inf:
+                    break
+                position = int(i if rows is None else rows[i])
+                if predicate is not None and not predicate(self.metadata(position)):
+                    continue
+                candidates.append(position)
+                scores.append(float(distances[i]))
+                if len(candidates) >= limit:
+                    break
+
+            if rescore and candidates:
+                exact = self.distances(
+                    query[None, :], np.asarray(candidates), exact=True
+                )[0]
+                top = np.argsort(exact)[:k]
+                candidates = [candidates[i] for i in top]
+                scores = [float(exact[i]) for i in top]
+
+            results.append(
+                [
+                    (self.document(position), score)
+                    for position, score in zip(candidates[:k], scores[:k])
+                ]
+            )
+        return results
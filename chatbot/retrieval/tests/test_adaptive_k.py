@@ -0,0 +1,18 @@
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.adaptive_k import adaptive_cut
+
+
+class AdaptiveKTestCase(SimpleTestCase):
+    """
+    거리 분포에 따른 적응형 결과 수 결정을 테스트합니다.
+    """
+
+    def test_adaptive_cut(self):
+        """간격이 있으면 줄이고, 고르면 늘리고, 그 외에는 k를 유지하는지 테스트"""
+        self.assertEqual(adaptive_cut([0.50, 0.51, 0.52, 0.90, 0.91], 5), 3)
+        self.assertEqual(adaptive_cut([0.50, 0.52, 0.90, 0.91, 0.92], 5), 2)
+        self.assertEqual(adaptive_cut([0.50] * 7 + [0.60] * 3, 5), 7)
+        self.assertEqual(adaptive_cut([0.50, 0.53, 0.56, 0.59, 0.62, 0.65], 5), 5)
+        self.assertEqual(adaptive_cut([0.50, 0.51], 5), 5)
+        self.assertEqual(adaptive_cut([], 5), 5)
@@ -0,0 +1,43 @@
+from django.test import SimpleTestCase
+from langchain_core.documents import Document
+
+from chatbot.retrieval.context_builder import build_context, get_token_counter
+
+
+def make_hit(name, content, **metadata):
+    metadata = {"name": name, "region": "전국", "link": "https://x", **metadata}
+    return ("unified_data", Document(page_content=content, metadata=metadata), 0.1)
+
+
+class ContextBuilderTestCase(SimpleTestCase):
+    """
+    토큰 예산 기반 컨텍스트 조립을 테스트합니다.
+    """
+
+    def setUp(self):
+        self.counter = get_token_counter()
+
+    def test_duplicate_fields_removed(self):
+        """본문에 이미 있는 지원대상/지원내용은 메타데이터 줄에서 빠지는지 테스트"""
+        hit = make_hit(
+            "청년 월세 지원",
+            "지원 대상: 만 19~34세 청년\n지원 내용: 월 20만원",
+            subject="만 19~34세 청년",
+            detail="월 30만원",
+        )
+        text = build_context([hit], counter=self.counter).text
+        self.assertNotIn("- 지원대상:", text)
+        self.assertIn("- 지원내용: 월 30만원", text)
+
+    def test_budget_is_respected(self):
+        """예산 안에서 순위순으로 채우고 사용/제외 토큰 수를 보고하는지 테스트"""
+        hits = [make_hit(f"정책 {i}", "청년 주거 지원 안내 " * 200) for i in range(5)]
+        unlimited = build_context(hits, counter=self.counter)
+        context = build_context(hits, max_tokens=600, counter=self.counter)
+
+        self.assertLessEqual(self.counter.count(context.text), 600)
+        self.assertTrue(context.text.startswith("**[정책 0]**"))
+        self.assertGreater(context.dropped_tokens, 0)
+        self.assertEqual(context.included + context.dropped, 5)
+        self.assertIn("…", context.text)
+        self.assertGreater(unlimited.used_tokens, context.used_tokens)
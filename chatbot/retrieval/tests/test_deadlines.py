@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.deadlines import (
+    NO_DEADLINE,
+    NO_START,
+    deadline_metadata,
+    is_active,
+    parse_period,
+    urgency,
+)
+
+
+class DeadlineTestCase(SimpleTestCase):
+    """
+    신청 기간 문자열 정규화와 마감 여부 / 임박도 계산을 테스트합니다.
+    """
+
+    def test_parse_period(self):
+        """로더별 기간 표기가 (시작일, 마감일) 정수로 변환되는지 테스트"""
+        self.assertEqual(
+            parse_period("20250301 ~ 20250331\n20250401 ~ 20250430"),
+            (20250301, 20250430),
+        )
+        self.assertEqual(parse_period("2025.3.1.~2025.3.31."), (20250301, 20250331))
+        self.assertEqual(parse_period("2025년 3월 31일까지"), (None, 20250331))
+        self.assertEqual(parse_period("2025-03-01부터"), (20250301, None))
+        self.assertEqual(parse_period("상시 신청"), (None, None))
+        self.assertEqual(
+            deadline_metadata(period="상시"),
+            {"apply_start": NO_START, "apply_end": NO_DEADLINE},
+        )
+        self.assertEqual(
+            deadline_metadata(start="2025-03-01", end="2025-03-31")["apply_end"],
+            20250331,
+        )
+
+    def test_active_and_urgency(self):
+        """마감일 당일까지 유효하고, 임박할수록 임박도가 커지는지 테스트"""
+        metadata = {"apply_end": 20250331}
+        self.assertTrue(is_active(metadata, 20250331))
+        self.assertFalse(is_active(metadata, 20250401))
+        self.assertTrue(is_active({"apply_end": "정보 없음"}, 20250401))
+        self.assertEqual(urgency(metadata, 20250331), 1.0)
+        self.assertGreater(urgency(metadata, 20250330), urgency(metadata, 20250325))
+        self.assertEqual(urgency(metadata, 20250301), 0.0)
+        self.assertEqual(urgency({}, 20250331), 0.0)
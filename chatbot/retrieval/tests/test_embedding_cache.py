@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+from langchain_core.embeddings import Embeddings
+
+from chatbot.retrieval.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    """호출 횟수를 세는 테스트용 임베딩 모델"""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class CachedEmbeddingsTestCase(SimpleTestCase):
+    """
+    Redis 없이 프로세스 LRU 계층만으로 임베딩 캐시 동작을 테스트합니다.
+    """
+
+    def setUp(self):
+        self.model = CountingEmbeddings()
+        self.cache = EmbeddingCache("test-model", maxsize=10, ttl=60)
+        self.embeddings = CachedEmbeddings(self.model, self.cache)
+
+    def test_query_is_embedded_once(self):
+        """정규화 후 같은 쿼리는 한 번만 임베딩되는지 테스트"""
+        first = self.embeddings.embed_query("청년 월세 지원")
+        second = self.embeddings.embed_query("  청년   월세 지원 ")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.model.calls), 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["local_hits"], stats["misses"]), (1, 1))
+
+    def test_documents_embed_only_misses(self):
+        """캐시 미스만 중복 없이 한 번의 요청으로 임베딩하는지 테스트"""
+        self.embeddings.embed_query("경기패스")
+        vectors = self.embeddings.embed_documents(
+            ["경기패스", "기후동행카드", "기후동행카드"]
+        )
+        self.assertEqual(self.model.calls[-1], ["기후동행카드"])
+        self.assertEqual(vectors[1], vectors[2])
+        self.assertEqual(vectors[0], [4.0, 0.5])
+
+    def test_vectors_stored_as_float32(self):
+        """저장된 값이 float32 바이트인지 테스트"""
+        self.embeddings.embed_query("산대특")
+        stored = self.cache.local.get(self.cache.make_key("산대특"))
+        self.assertEqual(len(stored), 2 * 4)
@@ -0,0 +1,69 @@
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from chatbot.retrieval.embeddings import (
+    embedding_signature,
+    get_embedding_dimensions,
+    get_embedding_model,
+    stored_dimensions,
+)
+from chatbot.retrieval.hashing_embeddings import HASHING_MODEL, HashingEmbeddings
+
+
+class FakeChromaCollection:
+    """stored_dimensions가 사용하는 속성만 가진 컬렉션."""
+
+    def __init__(self, metadata, embeddings):
+        self._collection = self
+        self.metadata = metadata
+        self.embeddings = embeddings
+
+    def get(self, limit=None, include=None):
+        return {"embeddings": self.embeddings[:limit]}
+
+
+class EmbeddingDimensionsTestCase(SimpleTestCase):
+    """
+    임베딩 차원 설정 검증과 저장된 차원 확인을 테스트합니다.
+    """
+
+    @override_settings(EMBEDDING_DIMENSIONS=2048)
+    def test_invalid_dimensions(self):
+        """모델 기본 차원보다 큰 값은 설정 오류인지 테스트"""
+        with self.assertRaises(ImproperlyConfigured):
+            get_embedding_dimensions()
+
+    def test_stored_dimensions(self):
+        """메타데이터 기록값을 우선 쓰고, 없으면 저장된 벡터 길이를 쓰는지 테스트"""
+        recorded = FakeChromaCollection({"embedding_dimensions": 256}, [[0.0] * 8])
+        legacy = FakeChromaCollection(None, [[0.0] * 8])
+        empty = FakeChromaCollection(None, [])
+        self.assertEqual(stored_dimensions(recorded), 256)
+        self.assertEqual(stored_dimensions(legacy), 8)
+        self.assertIsNone(stored_dimensions(empty))
+
+
+class HashingEmbeddingsTestCase(SimpleTestCase):
+    """
+    오프라인 해싱 임베딩 제공자를 테스트합니다.
+    """
+
+    @override_settings(EMBEDDING_PROVIDER="hashing", EMBEDDING_DIMENSIONS=64)
+    def test_hashing_provider(self):
+        """설정한 차원의 결정적 단위 벡터를 만들고, 글자가 겹치는 텍스트가 더 가까운지 테스트"""
+        model = get_embedding_model()
+        query, similar, other = model.embeddings.embed_documents(
+            ["청년 월세 지원", "청년 월세 한시 지원", "노인 일자리 사업"]
+        )
+        self.assertEqual(len(query), 64)
+        self.assertAlmostEqual(float(np.linalg.norm(query)), 1.0, places=5)
+        self.assertEqual(query, HashingEmbeddings(64).embed_query("청년 월세 지원"))
+        self.assertGreater(np.dot(query, similar), np.dot(query, other))
+        self.assertEqual(embedding_signature()["embedding_model"], HASHING_MODEL)
+
+    @override_settings(EMBEDDING_PROVIDER="unknown")
+    def test_unknown_provider(self):
+        """등록되지 않은 제공자는 설정 오류인지 테스트"""
+        with self.assertRaises(ImproperlyConfigured):
+            get_embedding_model()
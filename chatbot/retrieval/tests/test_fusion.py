@@ -0,0 +1,75 @@
+from django.test import SimpleTestCase
+from langchain_core.documents import Document
+
+from chatbot.retrieval.fusion import (
+    document_key,
+    fuse_results,
+    reciprocal_rank_fusion,
+)
+
+
+def make_doc(doc_id, name, link="https://example.com"):
+    return Document(
+        page_content=name,
+        metadata={"name": name, "link": link, "source": "정부24"},
+        id=doc_id,
+    )
+
+
+class FusionTestCase(SimpleTestCase):
+    """
+    컬렉션 간 중복 제거와 결과 병합 방식을 테스트합니다.
+    """
+
+    def setUp(self):
+        self.gov24 = [
+            ("gov24_services", make_doc("g1", "경기패스"), 0.2),
+            ("gov24_services", make_doc("g2", "청년 월세 지원"), 0.5),
+        ]
+        self.unified = [
+            ("unified_data", make_doc("u1", "경기 패스"), 0.1),
+            ("unified_data", make_doc("u2", "기후동행카드"), 0.4),
+            ("unified_data", make_doc("u3", "청년 월세 지원"), 0.6),
+        ]
+
+    def test_document_key(self):
+        """컬렉션/ID가 달라도 같은 정책이면 같은 키인지 테스트"""
+        self.assertEqual(
+            document_key(make_doc("g1", "경기패스")),
+            document_key(make_doc("u1", "경기 패스")),
+        )
+        self.assertNotEqual(
+            document_key(make_doc("a", "경기패스")),
+            document_key(make_doc("a", "경기패스", link="https://other.com")),
+        )
+        self.assertNotEqual(
+            document_key(Document(page_content="a", metadata={}, id="1")),
+            document_key(Document(page_content="a", metadata={}, id="2")),
+        )
+
+    def test_min_fusion(self):
+        """min 방식이 중복을 제거하고 최소 거리로 전체 k개를 반환하는지 테스트"""
+        results = fuse_results([self.gov24, self.unified], k=3, strategy="min")
+        self.assertEqual(
+            [(name, doc.id, score) for name, doc, score in results],
+            [
+                ("unified_data", "u1", 0.1),
+                ("unified_data", "u2", 0.4),
+                ("gov24_services", "g2", 0.5),
+            ],
+        )
+
+    def test_rrf_fusion(self):
+        """RRF 방식에서 여러 컬렉션에 나온 문서가 위로 오는지 테스트"""
+        results = fuse_results([self.gov24, self.unified], k=2, strategy="rrf")
+        self.assertEqual([doc.id for _, doc, _ in results], ["g1", "g2"])
+        self.assertLess(results[0][2], results[1][2])
+        with self.assertRaises(ValueError):
+            fuse_results([self.gov24], k=2, strategy="max")
+
+    def test_reciprocal_rank_fusion(self):
+        """두 랭킹에 모두 나온 항목이 위로 올라오는지 테스트"""
+        fused = reciprocal_rank_fusion(
+            [[("a", 1), ("b", 2)], [("b", 2), ("c", 3)]], rrf_k=60
+        )
+        self.assertEqual([key for key, _, _ in fused], ["b", "a", "c"])
@@ -0,0 +1,35 @@
+import threading
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.generation import GenerationWatcher
+from chatbot.retriever import VectorRetriever
+
+
+class GenerationReloadTestCase(SimpleTestCase):
+    """
+    인덱스 세대 변경 시 전환에 실패하면 다음 확인에서 다시 시도하는지 테스트합니다.
+    """
+
+    def test_retry_after_failed_reload(self):
+        """첫 전환이 실패하면 세대를 커밋하지 않고, 다음 확인에서 전환 후 캐시를 비우는지 테스트"""
+        with patch(
+            "chatbot.retrieval.generation.get_index_generation", side_effect=[1, 2, 2]
+        ):
+            retriever = object.__new__(VectorRetriever)
+            retriever.generation_watcher = GenerationWatcher(interval=0)
+            retriever.refresh_metadata_indexes = MagicMock(side_effect=[False, True])
+            retriever.result_cache = MagicMock()
+            retriever.stats, retriever._stats_lock = Counter(), threading.Lock()
+
+            retriever._check_generation()
+            self.assertEqual(retriever.generation_watcher.current, 1)
+            retriever.result_cache.invalidate.assert_not_called()
+
+            retriever._check_generation()
+
+        self.assertEqual(retriever.refresh_metadata_indexes.call_count, 2)
+        self.assertEqual(retriever.generation_watcher.current, 2)
+        retriever.result_cache.invalidate.assert_called_once_with(2)
@@ -0,0 +1,36 @@
+import tempfile
+
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.lexical_index import LexicalIndex, lexical_index_path
+
+
+class LexicalIndexTestCase(SimpleTestCase):
+    """
+    BM25 문자 n-gram 인덱스의 검색과 저장/로드를 테스트합니다.
+    """
+
+    def setUp(self):
+        names = ["경기패스", "K-디지털 트레이닝", "청년 월세 지원"]
+        self.index = LexicalIndex.build(
+            ids=["a", "b", "c"],
+            texts=[f"{name} 안내" for name in names],
+            metadatas=[{"name": name} for name in names],
+        )
+
+    def test_search_ranks_lexical_match_first(self):
+        """띄어쓰기가 달라도 n-gram이 겹치는 문서가 가장 먼저 나오는지 테스트"""
+        hits = self.index.search("디지털트레이닝", k=3)
+        self.assertEqual(self.index.ids[hits[0][0]], "b")
+        self.assertEqual(self.index.search("없는단어", k=3), [])
+
+    def test_save_and_load(self):
+        """저장 후 로드한 인덱스가 같은 검색 결과를 주는지 테스트"""
+        with tempfile.TemporaryDirectory() as index_dir:
+            path = lexical_index_path(index_dir, "unified_data")
+            self.index.save(path)
+            loaded = LexicalIndex.load(path)
+        self.assertEqual(
+            loaded.search("월세 지원", k=2), self.index.search("월세 지원", k=2)
+        )
+        self.assertEqual(loaded.document(2).id, "c")
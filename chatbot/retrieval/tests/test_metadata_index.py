@@ -0,0 +1,58 @@
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.metadata_index import MetadataIndex
+
+
+class MetadataIndexTestCase(SimpleTestCase):
+    """
+    메타데이터 역색인이 기존 부분 문자열 필터와 같은 후보를 돌려주는지 테스트합니다.
+    """
+
+    def setUp(self):
+        self.index = MetadataIndex()
+        self.index.add(
+            "1", {"name": "경기패스", "region": "경기도", "source": "정부24"}
+        )
+        self.index.add("2", {"name": "기후동행카드", "region": "서울특별시"})
+        self.index.add("3", {"name": "경기 청년 기본소득", "region": "경기도 안산시"})
+
+    def test_candidate_ids_by_prefix(self):
+        """name/region 앞 2글자 필터로 후보 문서를 찾는지 테스트"""
+        self.assertEqual(self.index.candidate_ids({"region": "경기"}), {"1", "3"})
+        self.assertEqual(
+            self.index.candidate_ids({"name": "경기", "region": "안산"}), {"3"}
+        )
+
+    def test_candidate_ids_ignores_spacing(self):
+        """띄어쓰기가 달라도 같은 이름으로 매칭되는지 테스트"""
+        self.assertEqual(self.index.candidate_ids({"name": "청년기본"}), {"3"})
+
+    def test_build_where(self):
+        """일치하는 원본 값이 Chroma where 조건으로 변환되는지 테스트"""
+        where = self.index.build_where({"name": "경기", "region": "경기"})
+        self.assertEqual(
+            where,
+            {
+                "$and": [
+                    {"name": {"$in": ["경기 청년 기본소득", "경기패스"]}},
+                    {"region": {"$in": ["경기도", "경기도 안산시"]}},
+                ]
+            },
+        )
+        self.assertEqual(self.index.build_where({"name": "부산"}), {})
+
+    def test_unindexed_field(self):
+        """색인되지 않은 필드는 None을 반환해 over-fetch로 넘어가는지 테스트"""
+        self.assertIsNone(self.index.candidate_ids({"title": "청년"}))
+        self.assertIsNone(self.index.build_where({"title": "청년"}))
+
+    def test_expired_count(self):
+        """apply_end가 없는 문서는 마감되지 않은 문서로 세고 undated에 집계되는지 테스트"""
+        index = MetadataIndex.from_records(
+            ["1", "2", "3"],
+            [{"apply_end": 20250301}, {"apply_end": 20250101}, {"name": "이전 문서"}],
+        )
+        self.assertEqual(index.expired_count(20250201), 1)
+        self.assertEqual(index.expired_count(20250401), 2)
+        self.assertEqual(index.undated, 1)
+        self.assertEqual(self.index.expired_count(20250401), 0)
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.mmr import mmr_select
+
+
+class MMRTestCase(SimpleTestCase):
+    """
+    후보 임베딩 기반 MMR 다양화를 테스트합니다.
+    """
+
+    def test_mmr_select(self):
+        """거의 같은 문서 대신 다른 문서를 고르고, 벡터가 없으면 점수순을 유지하는지 테스트"""
+        scores = [0.10, 0.11, 0.12, 0.30]
+        vectors = [[1.0, 0.0], [1.0, 0.01], [0.99, 0.02], [0.0, 1.0]]
+
+        self.assertEqual(mmr_select(scores, vectors, 2), [0, 3])
+        self.assertEqual(mmr_select(scores, vectors, 2, lambda_mult=1.0), [0, 1])
+        self.assertEqual(mmr_select(scores, [None] * 4, 2), [0, 1])
+        self.assertEqual(mmr_select(scores[:2], vectors[:2], 3), [0, 1])
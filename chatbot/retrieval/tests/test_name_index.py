@@ -0,0 +1,51 @@
+import tempfile
+
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.name_index import (
+    NameIndex,
+    build_name_map,
+    load_name_map,
+    name_map_path,
+)
+
+
+class NameIndexTestCase(SimpleTestCase):
+    """
+    정책명 트라이의 쿼리 내 정책명 탐색, 줄임말 연결, 저장/로드를 테스트합니다.
+    """
+
+    def setUp(self):
+        names = {
+            "a": "경기패스",
+            "b": "산업구조변화대응 등 특화훈련",
+            "c": "경기 청년 패스",
+            "d": "정보 없음",
+        }
+        self.name_map = build_name_map(
+            list(names), [{"name": name} for name in names.values()]
+        )
+        self.index = NameIndex(
+            {"unified_data": self.name_map}, aliases={"산대특": "산업구조변화대응"}
+        )
+
+    def test_match_names_in_query(self):
+        """쿼리 안의 정책명을 띄어쓰기와 무관하게 가장 긴 일치로 찾는지 테스트"""
+        self.assertEqual(self.index.match("경기 패스 신청 방법"), ["경기패스"])
+        self.assertEqual(
+            self.index.lookup("경기청년패스 자격"), [("unified_data", "c")]
+        )
+        self.assertEqual(self.index.match("경기도 청년 정책"), [])
+        self.assertNotIn("정보없음", self.name_map)
+
+    def test_alias_and_covers(self):
+        """줄임말이 정식 명칭 문서로 연결되고, 쿼리 전체 일치를 구분하는지 테스트"""
+        self.assertEqual(self.index.lookup("산대특 신청"), [("unified_data", "b")])
+        self.assertTrue(self.index.covers("산대특"))
+        self.assertTrue(self.index.covers("경기 패스"))
+        self.assertFalse(self.index.covers("경기패스 신청"))
+
+    def test_load_missing_map(self):
+        """맵 파일이 없으면 None을 반환하는지 테스트"""
+        with tempfile.TemporaryDirectory() as index_dir:
+            self.assertIsNone(load_name_map(name_map_path(index_dir, "unified_data")))
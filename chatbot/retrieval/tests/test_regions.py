@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.regions import (
+    NATIONWIDE,
+    partition_collection_name,
+    region_key,
+    route_region,
+)
+
+
+class RegionTestCase(SimpleTestCase):
+    """
+    자유 텍스트 지역명의 시/도 매핑과 region_key 파티션 라우팅을 테스트합니다.
+    """
+
+    def test_region_key(self):
+        """별칭/정식 명칭/시군구 표기가 같은 시/도로 매핑되는지 테스트"""
+        self.assertEqual(region_key("서울시"), "서울특별시")
+        self.assertEqual(region_key("경기도 광주시"), "경기도")
+        self.assertEqual(region_key("광주광역시 북구"), "광주광역시")
+        self.assertEqual(region_key("전라북도 전주시"), "전북특별자치도")
+        self.assertEqual(region_key("안산시", {"안산시": "경기도"}), "경기도")
+        self.assertEqual(region_key("고용노동부"), NATIONWIDE)
+        self.assertEqual(region_key("정보 없음"), NATIONWIDE)
+
+    def test_route_region(self):
+        """시/도로 해석되는 필터만 (시/도, 전국) 파티션으로 라우팅되는지 테스트"""
+        self.assertEqual(route_region("서울"), ("서울특별시", NATIONWIDE))
+        self.assertEqual(route_region("전국"), (NATIONWIDE,))
+        self.assertIsNone(route_region("전라"))
+        self.assertEqual(
+            partition_collection_name("unified_data", NATIONWIDE),
+            "unified_data__nationwide",
+        )
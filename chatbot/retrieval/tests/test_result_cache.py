@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+from langchain_core.documents import Document
+
+from chatbot.retrieval.result_cache import ResultCache
+
+
+class ResultCacheTestCase(SimpleTestCase):
+    """
+    검색 결과 캐시의 키 정규화와 세대 기반 무효화를 테스트합니다.
+    """
+
+    def setUp(self):
+        self.cache = ResultCache(maxsize=10, ttl=60)
+        self.results = [
+            ("unified_data", Document(page_content="경기패스", id="a"), 0.1)
+        ]
+
+    def test_key_normalization(self):
+        """쿼리 공백/대소문자, 컬렉션 순서가 달라도 같은 키가 되는지 테스트"""
+        key1 = self.cache.make_key(
+            "K디지털  트레이닝", ["b", "a"], 3, {"region": "서울"}
+        )
+        key2 = self.cache.make_key(
+            " k디지털 트레이닝", ["a", "b"], 3, {"region": "서울"}
+        )
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(
+            key1, self.cache.make_key("K디지털 트레이닝", ["a", "b"], 5)
+        )
+
+    def test_generation_invalidation(self):
+        """세대 번호가 바뀌면 기존 결과를 돌려주지 않는지 테스트"""
+        key = self.cache.make_key("경기패스", ["unified_data"], 5)
+        self.cache.set(key, self.results)
+        self.cache.set_formatted(key, "markdown", "**[경기패스]**")
+
+        entry = self.cache.get(key)
+        self.assertEqual(entry.hits, [("unified_data", "a", 0.1)])
+        self.assertEqual(entry.formatted["markdown"], "**[경기패스]**")
+
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get(key))
+
+    def test_negative_entries(self):
+        """결과가 없던 필터 조합은 표기 차이와 무관하게 기억되고 세대 변경 시 버려지는지 테스트"""
+        cache = ResultCache(maxsize=10, ttl=60, negative_ttl=60)
+        cache.mark_empty(cache.make_filter_key(["a"], {"name": "경기 패스"}))
+        self.assertTrue(
+            cache.is_empty(cache.make_filter_key(["a"], {"name": "경기패스"}))
+        )
+        self.assertFalse(cache.is_empty(cache.make_filter_key(["a"], {"name": "청년"})))
+
+        cache.invalidate(1)
+        self.assertFalse(
+            cache.is_empty(cache.make_filter_key(["a"], {"name": "경기패스"}))
+        )
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from langchain_core.documents import Document
+
+from chatbot.retrieval.remote import RemoteRetriever
+from chatbot.retrieval.service import make_server
+
+
+class EchoRetriever:
+    """검색 서비스가 호출하는 VectorRetriever 메서드만 가진 검색기."""
+
+    def search(self, query, k=5, filters=None, mode="vector", **kwargs):
+        if mode not in ("vector", "hybrid"):
+            raise ValueError(f"지원하지 않는 검색 모드입니다: {mode}")
+        doc = Document(page_content=query, metadata={"region": "서울"}, id="a")
+        return [("unified_data", doc, 0.25)] * min(k, 2)
+
+    def search_many(self, queries, **kwargs):
+        return [self.search(query, **kwargs) for query in queries]
+
+    def embed_query(self, query):
+        return [float(len(query)), 0.5]
+
+    def get_stats(self):
+        return {"searches": 1}
+
+
+class RetrievalServiceTestCase(SimpleTestCase):
+    """
+    Unix 소켓 검색 서비스와 연결 풀 클라이언트의 왕복을 테스트합니다.
+    """
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        url = f"unix://{os.path.join(tmpdir.name, 'retrieval.sock')}"
+        server = make_server(url, EchoRetriever())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.client = RemoteRetriever(url, pool_size=2, timeout=5)
+
+    def test_round_trip(self):
+        """결과가 Document로 복원되고, 연결을 재사용하며, 잘못된 인자는 ValueError인지 테스트"""
+        results = self.client.search("청년 월세", k=3, filters={"region": "서울"})
+        self.assertEqual(len(results), 2)
+        name, doc, score = results[0]
+        self.assertEqual(
+            (name, doc.id, doc.page_content, score),
+            ("unified_data", "a", "청년 월세", 0.25),
+        )
+        self.assertEqual(doc.metadata, {"region": "서울"})
+
+        many = self.client.search_many(["a", "b"], k=1)
+        self.assertEqual([hits[0][1].page_content for hits in many], ["a", "b"])
+        self.assertEqual(self.client.get_stats(), {"searches": 1})
+        self.assertEqual(self.client.embed_query("청년"), [2.0, 0.5])
+        self.assertEqual(self.client._pool.num_connections, 1)
+
+        with self.assertRaises(ValueError):
+            self.client.search("청년", mode="unknown")
+
+    def test_async_requests_use_client_executor(self):
+        """비동기 검색이 기본 스레드 풀이 아닌 클라이언트 전용 스레드 풀에서 실행되는지 테스트"""
+        threads = []
+        search = self.client.search
+
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return search(*args, **kwargs)
+
+        async def run():
+            return await asyncio.gather(
+                self.client.asearch("청년", k=1), self.client.asearch("월세", k=1)
+            )
+
+        with patch.object(self.client, "search", record):
+            results = asyncio.run(run())
+        self.assertEqual(
+            [hits[0][1].page_content for hits in results], ["청년", "월세"]
+        )
+        self.assertTrue(all(name.startswith("retrieval-client") for name in threads))
@@ -0,0 +1,105 @@
+import os
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.snapshot import NumpySnapshot, export_snapshot
+
+
+class FakeCollection:
+    """export_snapshot이 사용하는 Chroma get()만 흉내내는 컬렉션."""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    def get(self, include=None):
+        count = len(self.embeddings)
+        return {
+            "ids": [f"doc{i}" for i in range(count)],
+            "embeddings": self.embeddings,
+            "documents": [f"본문 {i}" for i in range(count)],
+            "metadatas": [
+                {
+                    "region": "서울" if i % 2 else "부산",
+                    "apply_end": 20250101 if i % 5 == 0 else 20251231,
+                    "link": f"https://example.com/{i}",
+                }
+                for i in range(count)
+            ],
+        }
+
+
+class NumpySnapshotTestCase(SimpleTestCase):
+    """
+    NumPy 스냅샷 내보내기/로드와 전수 검색 결과를 테스트합니다.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.normal(size=(50, 8)).astype(np.float32)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def load(self, quantization):
+        path = f"{self.tmpdir.name}/snapshot"
+        export_snapshot(FakeCollection(self.embeddings), path, quantization)
+        return NumpySnapshot.load(path, quantization=quantization)
+
+    def test_search_matches_brute_force(self):
+        """단일/배치 검색이 제곱 L2 전수 비교와 같은 순서/거리를 주는지 테스트"""
+        snapshot = self.load("none")
+        queries = self.embeddings[:3] + 0.01
+        expected = ((self.embeddings[None] - queries[:, None]) ** 2).sum(axis=2)
+
+        batched = snapshot.search(queries, k=4)
+        for i, hits in enumerate(batched):
+            order = np.argsort(expected[i])[:4]
+            self.assertEqual([doc.id for doc, _ in hits], [f"doc{j}" for j in order])
+            np.testing.assert_allclose(
+                [score for _, score in hits], expected[i][order], atol=1e-4
+            )
+        self.assertEqual(snapshot.search(queries[0], k=4)[0], batched[0])
+
+    def test_rows_and_predicate(self):
+        """후보 행 제한과 메타데이터 조건이 적용되는지 테스트"""
+        snapshot = self.load("int8")
+        hits = snapshot.search(self.embeddings[0], k=3, rows=[1, 3, 5])[0]
+        self.assertEqual({doc.id for doc, _ in hits}, {"doc1", "doc3", "doc5"})
+
+        hits = snapshot.search(
+            self.embeddings[0], k=5, predicate=lambda meta: meta["region"] == "서울"
+        )[0]
+        self.assertEqual(len(hits), 5)
+        self.assertTrue(all(doc.metadata["region"] == "서울" for doc, _ in hits))
+
+    def test_keeps_only_metadata_columns(self):
+        """본문과 검색에 쓰지 않는 메타데이터는 스냅샷에 남기지 않는지 테스트"""
+        snapshot = self.load("none")
+        doc = snapshot.document(1)
+        self.assertEqual(doc.page_content, "")
+        self.assertEqual(doc.metadata, {"region": "서울", "apply_end": 20251231})
+        self.assertTrue(snapshot.supports({"region": "서울"}))
+        self.assertFalse(snapshot.supports({"link": "example"}))
+
+    def test_exports_only_configured_quantization(self):
+        """설정한 양자화 행렬만 저장하고, 다른 방식으로 저장했던 행렬은 지우는지 테스트"""
+        path = f"{self.tmpdir.name}/snapshot"
+        export_snapshot(FakeCollection(self.embeddings), path, "int8")
+        export_snapshot(FakeCollection(self.embeddings), path, "float16")
+        self.assertEqual(
+            sorted(os.listdir(path)),
+            ["embeddings.npy", "embeddings_float16.npy", "meta.json", "norms.npy"],
+        )
+        with self.assertRaises(FileNotFoundError):
+            NumpySnapshot.load(path, quantization="int8")
+
+    def test_active_on_excludes_expired(self):
+        """기준일보다 마감일이 이전인 행은 top-k 계산 전에 제외되는지 테스트"""
+        snapshot = self.load("none")
+        hits = snapshot.search(self.embeddings[0], k=50, active_on=20250601)[0]
+        self.assertEqual(len(hits), 40)
+        self.assertNotIn("doc0", {doc.id for doc, _ in hits})
+
+        hits = snapshot.search(self.embeddings[0], k=3, rows=[0, 5], active_on=20250601)
+        self.assertEqual(hits, [[]])
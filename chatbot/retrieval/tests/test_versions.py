@@ -0,0 +1,48 @@
+import tempfile
+
+from django.test import SimpleTestCase
+
+from chatbot.retrieval.versions import (
+    load_versions,
+    resolve,
+    save_versions,
+    split_version,
+    stale_versions,
+    versioned_name,
+)
+
+
+class VersionsTestCase(SimpleTestCase):
+    """
+    버전이 붙은 컬렉션 이름과 이전 버전 정리 대상 계산을 테스트합니다.
+    """
+
+    def test_resolve_and_round_trip(self):
+        """버전 목록 저장/로드 후 논리 이름이 실제 이름으로 바뀌는지 테스트"""
+        with tempfile.TemporaryDirectory() as index_dir:
+            self.assertEqual(load_versions(index_dir), {})
+            name = versioned_name("unified_data", "20250618013000")
+            save_versions(index_dir, {"unified_data": name})
+            versions = load_versions(index_dir)
+
+        self.assertEqual(resolve(versions, "unified_data"), name)
+        self.assertEqual(resolve(versions, "gov24_services"), "gov24_services")
+        self.assertEqual(split_version(name), ("unified_data", "20250618013000"))
+        self.assertEqual(split_version(f"{name}__seoul"), (f"{name}__seoul", None))
+
+    def test_stale_versions(self):
+        """현재/직전 버전과 더 새로운 스테이징은 남기고 나머지만 정리하는지 테스트"""
+        names = [
+            "unified_data",
+            "unified_data.v20250601000000",
+            "unified_data.v20250608000000",
+            "unified_data.v20250608000000__seoul",
+            "unified_data.v20250615000000",
+            "unified_data.v20250622000000",
+            "gov24_services.v20250601000000",
+        ]
+        self.assertEqual(
+            stale_versions(names, "unified_data", "unified_data.v20250615000000"),
+            ["unified_data", "unified_data.v20250601000000"],
+        )
+        self.assertEqual(stale_versions(names, "unified_data", "unified_data"), [])
@@ -0,0 +1,140 @@
+"""
+컬렉션 버전 관리 (versions.py)
+- dataload 로더는 검색 중인 컬렉션을 비우고 다시 채우는 대신, 버전이 붙은 스테이징 컬렉션
+  (예: unified_data.v20250618013000)을 새로 만들고 발행 시 버전 목록만 교체
+- 검색 프로세스는 논리 이름(unified_data)을 버전 목록으로 실제 컬렉션 이름에 매핑하므로,
+  적재 중에도 이전 버전 전체를 검색하고 세대 번호가 바뀌면 새 버전으로 한 번에 전환
+- 버전 목록에 없는 컬렉션은 논리 이름 그대로 사용 (버전 관리 이전에 적재한 저장소 호환)
+"""
+
+import json
+import os
+import time
+
+VERSION_SEPARATOR = ".v"
+
+# 발행 후에도 지우지 않고 남겨 둘 버전 수 (현재 + 직전)
+# - 세대 번호를 아직 확인하지 않은 검색 프로세스는 직전 버전을 계속 조회하므로 바로 지우지 않음
+KEEP_VERSIONS = 2
+
+
+def new_version():
+    """스테이징 컬렉션에 붙일 버전 문자열 (시각 기준이므로 문자열 순서가 생성 순서)."""
+    return time.strftime("%Y%m%d%H%M%S")
+
+
+def versioned_name(collection_name, version):
+    """버전이 붙은 실제 컬렉션 이름. 예: unified_data.v20250618013000"""
+    return f"{collection_name}{VERSION_SEPARATOR}{version}"
+
+
+def split_version(physical_name):
+    """
+    실제 컬렉션 이름을 (논리 이름, 버전)으로 분리.
+
+    - 버전이 없는 이름이면 버전은 None.
+    """
+    name, separator, version = physical_name.rpartition(VERSION_SEPARATOR)
+    if not separator or not version.isdigit():
+        return physical_name, None
+    return name, version
+
+
+def versions_path(index_dir):
+    """논리 이름 -> 실제 컬렉션 이름 목록의 저장 경로."""
+    return os.path.join(index_dir, "versions.json")
+
+
+def load_versions(index_dir):
+    """저장된 버전 목록 로드. 파일이 없으면 빈 딕셔너리."""
+    path = versions_path(index_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_versions(index_dir, versions):
+    """버전 목록 저장. 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 이전 목록이나 새 목록만 봄."""
+    path = versions_path(index_dir)
+    os.makedirs(index_dir, exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(versions, f, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def resolve(versions, collection_name):
+    """논리 이름에 해당하는 현재 실제 컬렉션 이름."""
+    return versions.get(collection_name, collection_name)
+
+
+def stale_versions(physical_names, collection_name, current, keep=KEEP_VERSIONS):
+    """
+    지워도 되는 이전 버전 컬렉션 이름 목록.
+
+    - 현재 버전과 그 직전 (keep - 1)개 버전은 유지.
+    - 현재 버전보다 새로운 버전은 다른 로더가 적재 중인 스테이징일 수 있으므로 유지.
+    - 버전 없이 논리 이름 그대로인 컬렉션(버전 관리 이전 적재분)은 가장 오래된 버전으로 취급.
+
+    Args:
+        physical_names (Iterable[str]): 저장소에 있는 컬렉션 이름들.
+        collection_name (str): 논리 이름.
+        current (str): 방금 발행한 실제 컬렉션 이름.
+        keep (int): 유지할 버전 수.
+
+    Returns:
+        list: 삭제할 실제 컬렉션 이름들 (오래된 순).
+    """
+    _, current_version = split_version(current)
+    if current_version is None:
+        return []
+    older = []
+    for physical_name in physical_names:
+        name, version = split_version(physical_name)
+        if name != collection_name:
+            continue
+        version = version or ""
+        if version < current_version:
+            older.append((version, physical_name))
+    older.sort()
+    return [
+        physical_name for _, physical_name in older[: max(len(older) - keep + 1, 0)]
+    ]
+
+
+def release_collection(collection):
+    """
+    Chroma가 컬렉션에 대해 메모리에 올린 세그먼트(HNSW 인덱스, 메타데이터 리더)를 해제.
+
+    - 같은 저장소 경로의 Chroma 클라이언트는 프로세스 안에서 시스템 하나를 공유하므로
+      클라이언트 자체를 닫으면 새 버전 컬렉션도 닫힘. 대신 이전 버전 컬렉션의 세그먼트만 내림.
+    - dataload가 이전 버전을 삭제해도 이미 올라간 세그먼트는 검색 프로세스에 남으므로,
+      해제하지 않으면 세대가 바뀔 때마다 이전 HNSW 인덱스만큼 메모리가 늘어남.
+
+    Args:
+        collection (Chroma): LangChain Chroma 컬렉션 인스턴스.
+
+    Returns:
+        bool: 해제한 세그먼트가 있으면 True.
+    """
+    try:
+        collection_id = collection._collection.id
+        manager = collection._client._server._manager
+        caches = manager.segment_cache.values()
+    except AttributeError:
+        # 원격(HTTP) 클라이언트 등 세그먼트를 직접 올리지 않는 경우
+        return False
+
+    released = False
+    for cache in caches:
+        segment = cache.pop(collection_id)
+        if segment is None:
+            continue
+        instance = manager._instances.pop(segment["id"], None)
+        if instance is not None:
+            instance.stop()
+            released = True
+    file_handles = getattr(manager, "_vector_instances_file_handle_cache", None)
+    if file_handles is not None:
+        file_handles.cache.pop(collection_id, None)
+    return released
@@ -1,6 +1,179 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+import numpy as np
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.documents import Document
+
+from chatbot.retrieval.adaptive_k import adaptive_cut, fetch_size
+from chatbot.retrieval.context_builder import build_context
+from chatbot.retrieval.deadlines import (
+    APPLY_END_FIELD,
+    is_active,
+    today_key,
+    urgency,
+)
+from chatbot.retrieval.embeddings import (
+    get_embedding_dimensions,
+    get_embedding_model,
+    get_embedding_provider,
+    stored_dimensions,
+    stored_model,
+)
+from chatbot.retrieval.fusion import FUSION_STRATEGIES, document_key, fuse_results
+from chatbot.retrieval.generation import GenerationWatcher
+from chatbot.retrieval.lexical_index import LexicalIndex, lexical_index_path
+from chatbot.retrieval.metadata_index import MetadataIndex
+from chatbot.retrieval.mmr import mmr_fetch_size, mmr_select
+from chatbot.retrieval.name_index import NameIndex, load_name_map, name_map_path
+from chatbot.retrieval.normalize import compact_text
+from chatbot.retrieval.regions import (
+    REGION_KEY_FIELD,
+    load_partition_manifest,
+    partition_manifest_path,
+    route_region,
+)
+from chatbot.retrieval.remote import RemoteRetriever
+from chatbot.retrieval.result_cache import ResultCache
+from chatbot.retrieval.snapshot import NumpySnapshot, snapshot_path
+from chatbot.retrieval.versions import load_versions, release_collection, resolve
+
+logger = logging.getLogger(__name__)
+
+# 메타데이터 필터 처리 방식
+# - 역색인으로 구한 후보 문서가 적으면 후보 임베딩만 가져와 직접 거리 계산
+# - 일치 값이 이 개수 이하이면 Chroma where 조건으로 검색 범위를 제한
+# - 그보다 많거나 색인되지 않은 필드면 필터 결과가 k개가 될 때까지 점진적으로 더 가져옴
+EXACT_CANDIDATE_LIMIT = 128
+METADATA_WHERE_MAX_VALUES = 500
+OVERFETCH_FACTOR = 4
+OVERFETCH_MAX_K = 200
+
+# Chroma 조회 시 마감 문서 수만큼 더 가져와 거르는 최대 개수
+# - 6천 건 컬렉션 기준 n_results 1000이 약 75ms, apply_end where 조건이 약 150ms이므로
+#   마감 문서가 이보다 많을 때만(정리 작업이 밀린 경우) where 조건을 사용
+EXPIRED_OVERFETCH_MAX = 1000
+
+# 검색 모드
+# - vector: 임베딩 유사도만 사용
+# - hybrid: BM25 문자 n-gram 랭킹과 벡터 랭킹을 RRF로 병합
+# 두 모드 모두 쿼리에 정책명(또는 줄임말)이 들어 있으면 정책명 인덱스의 문서를 맨 앞에 두고,
+# 쿼리 전체가 정책명이고 일치 문서가 k개 이하이면 임베딩 없이 바로 반환
+SEARCH_MODES = ("vector", "hybrid")
+
+# 쿼리 일부에서 정책명을 찾은 경우 맨 앞에 고정할 최대 문서 수
+# - 나머지는 벡터/BM25 순위로 채움 (3글자 이상 이름은 쿼리 어디에 있어도 일치하므로 다른
+#   뜻의 문장에 걸릴 수 있고, 줄임말 하나가 수십 건의 정책명으로 이어지기도 함)
+NAME_PIN_LIMIT = 2
+
+# 검색 대상으로 등록하는 컬렉션 (지역 파티션 컬렉션은 dataload가 만든 목록에서 추가 등록)
+COLLECTION_NAMES = (
+    "gov24_services",
+    "youth_policy_list",
+    "mongddang_data",
+    "fifty_portal_edu_data",
+    "unified_data",
+    # "pdf_sections",
+)
+
+# 벡터 검색 백엔드 (settings.RETRIEVER_BACKEND)
+# - chroma: Chroma 컬렉션 조회
+# - numpy : dataload가 내보낸 mmap 스냅샷을 행렬곱으로 전수 검색. 스냅샷이 없는 컬렉션은
+#           Chroma로 조회
+BACKENDS = ("chroma", "numpy")
+
+# 인덱스 세대 전환 후 이전 세대 컬렉션의 Chroma 세그먼트를 해제하기까지 기다리는 시간(초)
+# - 전환 직전에 시작한 검색은 이전 세대 인덱스로 끝까지 진행하므로 바로 닫지 않음
+INDEX_RELEASE_DELAY = 60
+
+# 검색 요청 하나가 처음부터 끝까지 같은 세대의 (IndexSet, 결과 캐시 세대)를 보도록 고정
+# - 컬렉션 조회 스레드에는 contextvars.copy_context()로 함께 전달
+_pinned_generation = contextvars.ContextVar("pinned_generation", default=None)
+
+
+def _one_generation(method):
+    """
+    검색 메서드 실행 동안 인덱스 세대를 고정하는 데코레이터.
+
+    - 실행 도중 세대가 전환되어도 요청은 시작할 때의 인덱스 묶음으로 끝까지 진행하며,
+      그 결과는 이전 세대로 기록되므로 새 세대의 결과 캐시에 남지 않음.
+    - 비동기 메서드는 세대 확인/새 묶음 로드를 백그라운드 스레드에 맡기고 현재 묶음으로
+      바로 진행하므로, Redis 조회나 인덱스 로드가 이벤트 루프를 막지 않음.
+    """
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with self._pin_generation(background=True):
+                return await method(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._pin_generation():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class IndexSet:
+    """
+    한 인덱스 세대에서 함께 로드한 컬렉션과 파생 인덱스 묶음.
+
+    - VectorRetriever는 이 묶음을 참조 하나로 들고 있고, 세대가 바뀌면 새 묶음을 끝까지
+      만든 뒤 참조만 교체하므로 검색은 적재 중이거나 일부만 바뀐 인덱스를 보지 않음.
+    - 딕셔너리 key는 논리 컬렉션 이름(파티션은 파티션 컬렉션 이름)이고, 실제 Chroma
+      컬렉션과 파생 인덱스 파일은 버전 목록(versions)으로 찾은 실제 이름을 사용.
+    - 지역 파티션 컬렉션은 검색 대상 컬렉션(collections)과 따로 두며, 메타데이터 역색인은
+      원본 컬렉션의 것을 함께 씀 (파티션 문서는 원본 문서의 부분집합).
+    """
+
+    def __init__(
+        self,
+        versions,
+        collections,
+        partitions,
+        partition_collections,
+        snapshots,
+        metadata_indexes,
+        lexical_indexes,
+        name_index,
+    ):
+        self.versions = versions
+        self.collections = collections
+        self.partitions = partitions
+        self.partition_collections = partition_collections
+        self.parents = {
+            partition: name
+            for name, manifest in partitions.items()
+            for partition in manifest.values()
+        }
+        self.snapshots = snapshots
+        self.metadata_indexes = metadata_indexes
+        self.lexical_indexes = lexical_indexes
+        self.name_index = name_index
+
+    def physical_name(self, name):
+        """논리 컬렉션 이름에 해당하는 실제 Chroma 컬렉션 이름."""
+        return resolve(self.versions, name)
+
+    def physical_names(self):
+        """이 묶음이 조회하는 실제 컬렉션 이름 -> Chroma 컬렉션 인스턴스 (파티션 포함)."""
+        names = {
+            self.physical_name(name): collection
+            for name, collection in self.collections.items()
+        }
+        names.update(self.partition_collections)
+        return names
 
 
 class VectorRetriever:
@@ -9,85 +182,1697 @@ class VectorRetriever:
 
     - 여러 Chroma 컬렉션을 사전에 등록하고,
       멀티 컬렉션 유사도 검색 및 메타데이터 필터링을 지원.
+    - 쿼리 임베딩은 검색 1회당 한 번만 계산하고, 모든 컬렉션에 벡터로 재사용.
+    - 여러 컬렉션은 제한된 스레드 풀에서 동시에 조회하며, 타임아웃된 컬렉션은 제외하고
+      나머지 결과만 반환.
+    - name/region/source 필터는 로드 시 만든 역색인으로 후보를 구해 인덱스 조회 단계에서
+      적용하므로, top-k를 뽑은 뒤 버리는 일이 없음.
+    - region 필터가 시/도로 해석되면 dataload가 만든 region_key 파티션 컬렉션 중 해당
+      시/도와 전국 파티션만 검색함.
+    - 같은 조건의 반복 검색은 결과 캐시에서 바로 반환함.
+    - dataload 로더는 버전이 붙은 새 컬렉션에 적재한 뒤 인덱스 세대 번호를 올리며, 다음
+      요청에서 새 버전의 컬렉션/파생 인덱스를 모두 로드한 뒤 한 번에 전환하고 캐시를 비움.
+      요청은 시작할 때의 세대로 끝까지 진행하고, 이전 세대 컬렉션은 잠시 뒤 해제함.
+    - hybrid 모드에서는 dataload가 만든 BM25 인덱스로 정책명/줄임말 같은 어휘 일치를
+      보완함.
+    - 쿼리에 들어 있는 정책명은 dataload가 만든 정책명 인덱스로 찾아 벡터 순위와 관계없이
+      최상위에 둠.
+    - 같은 문서가 소스별 컬렉션과 unified_data에 함께 있으므로, 결과는 문서 키로 중복
+      제거한 뒤 RETRIEVER_FUSION 방식으로 병합해 전체 k개만 반환.
+    - RETRIEVER_BACKEND가 numpy이면 Chroma 대신 mmap 스냅샷을 전수 검색해 sqlite 잠금과
+      쿼리당 오버헤드를 피함.
+    - RETRIEVER_SERVICE_URL이 설정되어 있으면 인덱스를 로드하지 않고, 같은 메서드를 가진
+      검색 서비스 클라이언트(RemoteRetriever)를 반환함.
     """
 
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(VectorRetriever, cls).__new__(cls)
-            cls._instance._initialize()
+            if settings.RETRIEVER_SERVICE_URL:
+                cls._instance = RemoteRetriever(
+                    settings.RETRIEVER_SERVICE_URL,
+                    pool_size=settings.RETRIEVER_SERVICE_POOL_SIZE,
+                    timeout=settings.RETRIEVER_SERVICE_TIMEOUT,
+                )
+            else:
+                cls.local()
+        return cls._instance
+
+    @classmethod
+    def local(cls):
+        """
+        RETRIEVER_SERVICE_URL과 관계없이 인덱스를 직접 로드한 인스턴스를 반환.
+
+        - 검색 서비스 프로세스와 벤치마크처럼 컬렉션에 직접 접근해야 하는 곳에서 사용.
+        """
+        if not isinstance(cls._instance, cls):
+            instance = super(VectorRetriever, cls).__new__(cls)
+            instance._initialize()
+            cls._instance = instance
         return cls._instance
 
     def _initialize(self):
         """
         인스턴스 초기화 메서드.
 
-        - OpenAI 임베딩 모델 로드
-        - 자주 사용하는 Chroma 컬렉션들을 등록
+        - 캐시가 적용된 OpenAI 임베딩 모델 로드
+        - 현재 발행된 버전의 컬렉션과 파생 인덱스를 하나의 묶음(IndexSet)으로 로드
+        - 컬렉션 병렬 조회용 스레드 풀 생성
+        - 저장된 임베딩 차원이 EMBEDDING_DIMENSIONS와 다르면 시작 단계에서 실패
+        - 인덱스 세대 번호로 무효화되는 검색 결과 캐시 생성
+        - 마감 문서 제외 / 마감 임박 가중치 / 적응형 k / MMR 관련도 가중치 설정 로드
         """
         self.DB_DIR = settings.CHROMA_DB_DIR
-        self.embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
-        self.collections = self._register_collections()
+        self.embedding_model = get_embedding_model()
+        self.backend = settings.RETRIEVER_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 검색 백엔드입니다: {self.backend}")
+        self.indexes = self._load_indexes()
+        self._reload_lock = threading.Lock()
+        self._reload_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="index-reload"
+        )
+        self._reload_future = None
+        self._reload_future_lock = threading.Lock()
+        self.generation_watcher = GenerationWatcher()
+        self.result_cache = ResultCache(
+            maxsize=settings.RETRIEVER_RESULT_CACHE_SIZE,
+            ttl=settings.RETRIEVER_RESULT_CACHE_TTL,
+            negative_ttl=settings.RETRIEVER_NEGATIVE_CACHE_TTL,
+        )
+        self.result_cache.invalidate(self.generation_watcher.current)
+        self.collection_timeout = settings.RETRIEVER_COLLECTION_TIMEOUT
+        self.fusion = settings.RETRIEVER_FUSION
+        if self.fusion not in FUSION_STRATEGIES:
+            raise ValueError(f"지원하지 않는 병합 방식입니다: {self.fusion}")
+        self.exclude_expired = settings.RETRIEVER_EXCLUDE_EXPIRED
+        self.deadline_boost = settings.RETRIEVER_DEADLINE_BOOST
+        self.adaptive_k = settings.RETRIEVER_ADAPTIVE_K
+        self.mmr_lambda = settings.RETRIEVER_MMR_LAMBDA
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.RETRIEVER_MAX_WORKERS,
+            thread_name_prefix="vector-retriever",
+        )
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _current_indexes(self):
+        """이 요청에 고정된 인덱스 묶음. 검색 요청 밖이면 최신 묶음."""
+        pinned = _pinned_generation.get()
+        return self.indexes if pinned is None else pinned[0]
+
+    def _cache_generation(self):
+        """이 요청에 고정된 결과 캐시 세대. 검색 요청 밖이면 None(현재 세대)."""
+        pinned = _pinned_generation.get()
+        return None if pinned is None else pinned[1]
+
+    @contextmanager
+    def _pin_generation(self, background=False):
+        """
+        세대 변경을 확인(필요하면 전환)한 뒤, 블록 안에서 쓸 인덱스 묶음과 캐시 세대를 고정.
+
+        - 이미 고정된 요청 안에서 다시 호출하면(search_and_format -> search) 그대로 사용.
+
+        Args:
+            background (bool): True이면 세대 확인/전환을 백그라운드 스레드에서 실행하고
+                기다리지 않음. 전환이 끝나기 전까지는 이전 묶음으로 검색.
+        """
+        if _pinned_generation.get() is not None:
+            yield
+            return
+        if background:
+            self._check_generation_in_background()
+        else:
+            self._check_generation()
+        token = _pinned_generation.set((self.indexes, self.result_cache.generation))
+        try:
+            yield
+        finally:
+            _pinned_generation.reset(token)
+
+    @property
+    def collections(self):
+        """현재 세대의 {컬렉션 이름: Chroma 컬렉션} (지역 파티션 제외)."""
+        return self._current_indexes().collections
+
+    @property
+    def partitions(self):
+        """현재 세대의 {컬렉션 이름: {region_key: 파티션 컬렉션 이름}}."""
+        return self._current_indexes().partitions
+
+    @property
+    def snapshots(self):
+        """현재 세대의 {컬렉션/파티션 이름: NumpySnapshot} (numpy 백엔드)."""
+        return self._current_indexes().snapshots
+
+    @property
+    def metadata_indexes(self):
+        """현재 세대의 {컬렉션 이름: MetadataIndex}."""
+        return self._current_indexes().metadata_indexes
+
+    @property
+    def lexical_indexes(self):
+        """현재 세대의 {컬렉션 이름: LexicalIndex}."""
+        return self._current_indexes().lexical_indexes
+
+    @property
+    def name_index(self):
+        """현재 세대의 정책명 인덱스."""
+        return self._current_indexes().name_index
 
-    def _register_collections(self):
+    def _collection(self, name):
+        """컬렉션 또는 지역 파티션 이름에 해당하는 현재 세대의 Chroma 컬렉션."""
+        indexes = self._current_indexes()
+        collection = indexes.collections.get(name)
+        if collection is None:
+            collection = indexes.partition_collections[name]
+        return collection
+
+    def _metadata_index(self, name):
+        """컬렉션의 메타데이터 역색인. 지역 파티션은 원본 컬렉션의 역색인을 사용."""
+        indexes = self._current_indexes()
+        return indexes.metadata_indexes.get(indexes.parents.get(name, name))
+
+    def _load_indexes(self, previous=None):
         """
-        프로젝트에서 사용하는 주요 컬렉션을 사전 등록.
+        현재 발행된 버전의 컬렉션과 파생 인덱스를 모두 로드해 새 묶음을 만듦.
+
+        - 실제 컬렉션 이름이 이전 묶음과 같으면 Chroma 컬렉션 인스턴스를 재사용.
+        - self의 현재 인덱스는 건드리지 않으므로, 로드 중에도 검색은 이전 묶음으로 진행.
+
+        Args:
+            previous (IndexSet, optional): 현재 사용 중인 묶음.
+
+        Returns:
+            IndexSet: 새 인덱스 묶음.
+
+        Raises:
+            ImproperlyConfigured: 저장된 임베딩 차원이 설정값과 다른 경우.
+        """
+        try:
+            versions = load_versions(settings.RETRIEVER_INDEX_DIR)
+        except Exception as e:
+            logger.warning("컬렉션 버전 목록 로드 실패: %s", e)
+            versions = previous.versions if previous is not None else {}
+        opened = previous.physical_names() if previous is not None else {}
+
+        collections = self._register_collections(versions, opened)
+        partitions, partition_collections = self._load_partitions(versions, opened)
+        paths = {name: resolve(versions, name) for name in collections}
+        snapshots = self._load_snapshots(paths)
+        # 파티션은 원본 컬렉션의 임베딩을 그대로 복사하므로 차원 검사는 원본만 함
+        self._check_embedding_dimensions(collections, snapshots)
+        snapshots.update(
+            self._load_snapshots({name: name for name in partition_collections})
+        )
+        return IndexSet(
+            versions=versions,
+            collections=collections,
+            partitions=partitions,
+            partition_collections=partition_collections,
+            snapshots=snapshots,
+            metadata_indexes=self._build_metadata_indexes(collections, snapshots),
+            lexical_indexes=self._load_lexical_indexes(paths),
+            name_index=self._load_name_index(paths),
+        )
+
+    def _register_collections(self, versions, opened=None):
+        """
+        프로젝트에서 사용하는 주요 컬렉션을 현재 발행된 버전으로 사전 등록.
+
+        Args:
+            versions (dict): 논리 컬렉션 이름 -> 실제 컬렉션 이름.
+            opened (dict, optional): 재사용할 {실제 컬렉션 이름: Chroma 컬렉션}.
 
         Returns:
             dict: 컬렉션 이름을 key로, Chroma 컬렉션 인스턴스를 value로 하는 딕셔너리.
         """
-        collection_names = [
-            "gov24_services",
-            "youth_policy_list",
-            "mongddang_data",
-            "fifty_portal_edu_data",
-            "unified_data",
-            # "pdf_sections",
-        ]
         return {
-            name: Chroma(
-                collection_name=name,
-                embedding_function=self.embedding_model,
-                persist_directory=self.DB_DIR,
-            )
-            for name in collection_names
+            name: self._open_collection(resolve(versions, name), opened)
+            for name in COLLECTION_NAMES
         }
 
-    def search(self, query, k=5, filters=None, collection_names=None):
+    def _open_collection(self, name, opened=None):
+        """Chroma 컬렉션 인스턴스 생성. opened에 같은 이름이 있으면 재사용."""
+        if opened and name in opened:
+            return opened[name]
+        return Chroma(
+            collection_name=name,
+            embedding_function=self.embedding_model,
+            persist_directory=self.DB_DIR,
+        )
+
+    def _load_partitions(self, versions, opened=None):
+        """
+        dataload가 저장한 region_key 파티션 목록을 읽고 파티션 컬렉션을 엶.
+
+        - 파티션 컬렉션은 검색 대상 컬렉션과 따로 보관하며, 스냅샷만 따로 로드하고
+          메타데이터 역색인은 원본 컬렉션의 것을 사용.
+        - 파티션 목록이 없는 컬렉션은 region 필터를 기존 부분 문자열 필터로 처리.
+
+        Args:
+            versions (dict): 논리 컬렉션 이름 -> 실제 컬렉션 이름.
+            opened (dict, optional): 재사용할 {실제 컬렉션 이름: Chroma 컬렉션}.
+
+        Returns:
+            tuple: ({컬렉션 이름: {region_key: 파티션 컬렉션 이름}},
+                {파티션 컬렉션 이름: Chroma 컬렉션}).
+        """
+        partitions, partition_collections = {}, {}
+        for name in COLLECTION_NAMES:
+            path = partition_manifest_path(
+                settings.RETRIEVER_INDEX_DIR, resolve(versions, name)
+            )
+            try:
+                manifest = load_partition_manifest(path)
+            except Exception as e:
+                logger.warning("'%s' 지역 파티션 목록 로드 실패: %s", name, e)
+                continue
+            if not manifest:
+                continue
+            for partition in manifest.values():
+                partition_collections[partition] = self._open_collection(
+                    partition, opened
+                )
+            partitions[name] = manifest
+        return partitions, partition_collections
+
+    def _check_embedding_dimensions(self, collections, snapshots):
+        """
+        컬렉션/스냅샷에 저장된 임베딩 차원(과 기록된 모델)이 설정값과 같은지 검사.
+
+        - 다른 차원으로 만든 인덱스를 조회하면 모든 검색이 실패하거나 엉뚱한 결과가 나오므로,
+          워커 시작 시 바로 알 수 있게 예외를 발생시킴.
+        - 차원이 같아도 다른 임베딩 제공자(EMBEDDING_PROVIDER)로 만든 컬렉션은 결과가 엉뚱하므로
+          같은 방식으로 실패시킴.
+
+        Raises:
+            ImproperlyConfigured: 차원이나 모델이 다른 컬렉션, 차원이 다른 스냅샷이 있는 경우.
+        """
+        expected = get_embedding_dimensions()
+        model, _, _ = get_embedding_provider()
+        mismatched = []
+        for name, collection in collections.items():
+            try:
+                dimensions = stored_dimensions(collection)
+                stored = stored_model(collection)
+            except Exception as e:
+                logger.warning("'%s' 임베딩 차원 확인 실패: %s", name, e)
+                continue
+            if dimensions is not None and dimensions != expected:
+                mismatched.append(f"{name}={dimensions}")
+            elif stored is not None and stored != model:
+                mismatched.append(f"{name}={stored}")
+        for name, snapshot in snapshots.items():
+            if len(snapshot) and snapshot.dimensions != expected:
+                mismatched.append(f"{name}(snapshot)={snapshot.dimensions}")
+        if mismatched:
+            raise ImproperlyConfigured(
+                f"저장된 임베딩 차원/모델이 EMBEDDING_DIMENSIONS({expected}), "
+                f"EMBEDDING_PROVIDER({model})와 다릅니다: "
+                f"{', '.join(mismatched)}. 데이터를 다시 로드하세요."
+            )
+
+    def _build_metadata_indexes(self, collections, snapshots):
+        """
+        등록된 컬렉션마다 name/region/source 메타데이터 역색인을 생성.
+
+        Returns:
+            dict: 컬렉션 이름을 key로, MetadataIndex를 value로 하는 딕셔너리.
+        """
+        indexes = {}
+        for name, collection in collections.items():
+            snapshot = snapshots.get(name)
+            try:
+                if snapshot is not None:
+                    indexes[name] = MetadataIndex.from_records(
+                        snapshot.ids, map(snapshot.metadata, range(len(snapshot)))
+                    )
+                else:
+                    indexes[name] = MetadataIndex.from_collection(collection)
+            except Exception as e:
+                logger.warning("'%s' 메타데이터 인덱스 생성 실패: %s", name, e)
+        return indexes
+
+    def _load_lexical_indexes(self, paths):
+        """
+        dataload가 저장한 컬렉션별 BM25 인덱스를 로드.
+
+        - 인덱스 파일이 없는 컬렉션은 제외되며, hybrid 모드에서도 벡터 검색만 사용.
+
+        Args:
+            paths (dict): 컬렉션 이름 -> 파생 인덱스 파일에 쓰인 실제 컬렉션 이름.
+
+        Returns:
+            dict: 컬렉션 이름을 key로, LexicalIndex를 value로 하는 딕셔너리.
+        """
+        indexes = {}
+        for name, physical_name in paths.items():
+            path = lexical_index_path(settings.RETRIEVER_INDEX_DIR, physical_name)
+            try:
+                index = LexicalIndex.load(path)
+            except Exception as e:
+                logger.warning("'%s' BM25 인덱스 로드 실패: %s", name, e)
+                continue
+            if index is not None:
+                indexes[name] = index
+        return indexes
+
+    def _load_name_index(self, paths):
+        """
+        dataload가 저장한 컬렉션별 정책명 맵을 모아 하나의 정책명 인덱스로 만듦.
+
+        - 맵 파일이 없는 컬렉션은 정책명 빠른 경로에서 제외됨.
+
+        Args:
+            paths (dict): 컬렉션 이름 -> 파생 인덱스 파일에 쓰인 실제 컬렉션 이름.
+
+        Returns:
+            NameIndex: 모든 컬렉션의 정책명과 줄임말 테이블을 합친 인덱스.
+        """
+        name_maps = {}
+        for name, physical_name in paths.items():
+            try:
+                names = load_name_map(
+                    name_map_path(settings.RETRIEVER_INDEX_DIR, physical_name)
+                )
+            except Exception as e:
+                logger.warning("'%s' 정책명 맵 로드 실패: %s", name, e)
+                continue
+            if names is not None:
+                name_maps[name] = names
+        return NameIndex(name_maps)
+
+    def _load_snapshots(self, paths):
+        """
+        numpy 백엔드일 때 dataload가 내보낸 컬렉션별 벡터 스냅샷을 mmap으로 로드.
+
+        - RETRIEVER_QUANTIZATION이 int8/float16이면 양자화 행렬로 후보를 찾고 float32로
+          재계산하므로, 프로세스에 상주하는 벡터 메모리가 1/4(1/2)로 줄어듦.
+
+        Args:
+            paths (dict): 컬렉션 이름 -> 파생 인덱스 파일에 쓰인 실제 컬렉션 이름.
+
+        Returns:
+            dict: 컬렉션 이름을 key로, NumpySnapshot을 value로 하는 딕셔너리.
+        """
+        if self.backend != "numpy":
+            return {}
+        snapshots = {}
+        for name, physical_name in paths.items():
+            try:
+                snapshot = NumpySnapshot.load(
+                    snapshot_path(settings.RETRIEVER_INDEX_DIR, physical_name),
+                    quantization=settings.RETRIEVER_QUANTIZATION,
+                )
+            except Exception as e:
+                logger.warning("'%s' 벡터 스냅샷 로드 실패: %s", name, e)
+                continue
+            if snapshot is None:
+                logger.warning("'%s' 벡터 스냅샷이 없어 Chroma로 조회합니다.", name)
+            else:
+                snapshots[name] = snapshot
+        return snapshots
+
+    def refresh_metadata_indexes(self):
+        """
+        새로 발행된 버전의 컬렉션과 지역 파티션, 벡터 스냅샷, 메타데이터 역색인,
+        BM25/정책명 인덱스를 로드해 한 번에 전환.
+
+        - 새 묶음을 모두 만든 뒤 참조 하나만 바꾸므로, 로드 중인 요청과 다른 스레드의 검색은
+          이전 세대 인덱스를 그대로 사용.
+        - 로드에 실패하면(임베딩 차원 불일치 등) 이전 세대를 계속 사용.
+        - 더 이상 쓰지 않는 이전 세대 컬렉션은 INDEX_RELEASE_DELAY 뒤에 Chroma 세그먼트를 해제.
+
+        Returns:
+            bool: 전환했으면 True.
+        """
+        with self._reload_lock:
+            previous = self.indexes
+            try:
+                indexes = self._load_indexes(previous)
+            except Exception as e:
+                logger.error("새 인덱스 세대 로드 실패, 이전 세대를 계속 사용: %s", e)
+                return False
+            self.indexes = indexes
+
+        retired = [
+            collection
+            for name, collection in previous.physical_names().items()
+            if name not in indexes.physical_names()
+        ]
+        if retired:
+            timer = threading.Timer(
+                INDEX_RELEASE_DELAY, self._release_collections, args=(retired,)
+            )
+            timer.daemon = True
+            timer.start()
+        return True
+
+    def _release_collections(self, collections):
+        """이전 세대 컬렉션이 메모리에 올린 Chroma 세그먼트를 해제."""
+        released = sum(release_collection(collection) for collection in collections)
+        self._record_stats(collections_released=released)
+
+    def embed_query(self, query):
+        """
+        쿼리 문자열을 임베딩 벡터로 변환.
+
+        - 같은 쿼리로 여러 번 검색하는 호출자(크루 툴 등)는 이 벡터를 보관했다가
+          `search(..., query_embedding=...)`로 넘겨 임베딩 호출을 생략할 수 있음.
+
+        Args:
+            query (str): 검색 쿼리 문자열.
+
+        Returns:
+            list[float]: 쿼리 임베딩 벡터.
+        """
+        self._record_stats(embedding_calls=1)
+        return self.embedding_model.embed_query(query)
+
+    @_one_generation
+    def search(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        query_embedding=None,
+        mode="vector",
+        diversify=False,
+    ):
         """
         멀티 컬렉션 대상 유사도 검색 수행.
 
+        - 같은 조건의 검색 결과가 캐시에 있으면 Chroma를 조회하지 않고 바로 반환.
+        - 쿼리에 정책명이 들어 있으면 해당 문서 최대 NAME_PIN_LIMIT개를 score 0.0으로 맨 앞에
+          두고, 쿼리 전체가 정책명이고 일치 문서가 k개 이하이면 벡터 검색 없이 반환.
+        - 쿼리 임베딩을 한 번만 계산한 뒤, 모든 컬렉션을 벡터로 동시에 조회.
+        - `collection_timeout` 안에 응답하지 않은 컬렉션은 건너뛰고 부분 결과를 반환.
+        - 신청 마감일이 지난 문서는 각 컬렉션 조회 단계에서 제외 (RETRIEVER_EXCLUDE_EXPIRED).
+        - 최근 결과가 없던 필터 조합이면 쿼리와 무관하게 바로 빈 리스트를 반환.
+        - 적응형 k를 쓰면 벡터 거리 분포에 따라 k보다 적게(뚜렷한 간격) 또는 많게(고른 분포)
+          반환할 수 있음 (RETRIEVER_ADAPTIVE_K).
+        - diversify이면 후보를 더 가져와, 조회 중에 함께 받은 후보 임베딩으로 MMR 재순위화해
+          거의 같은 문서(여러 자치구/캠퍼스에 등록된 같은 사업)가 결과를 채우지 않게 함.
+
         Args:
             query (str): 검색 쿼리 문자열.
-            k (int): 각 컬렉션별 검색 결과 수 (기본값 5).
+            k (int): 중복 제거 후 전체 검색 결과 수 (기본값 5).
             filters (dict, optional): 메타데이터 필터링 조건. 예: {"title": "청년"}.
             collection_names (list, optional): 검색 대상 컬렉션 이름 리스트. None이면 통합 컬렉션 사용.
+            query_embedding (list[float], optional): 미리 계산된 쿼리 임베딩. 주어지면 임베딩 호출을 생략.
+            mode (str): "vector" 또는 "hybrid"(BM25 + 벡터 RRF 병합). RRF로 병합한 경우
+                score는 RRF 점수의 역수로, 거리와 마찬가지로 낮을수록 관련도가 높음.
+            diversify (bool): MMR 다양화 여부. 임베딩/인덱스 호출은 늘지 않음.
 
         Returns:
-            list: [(컬렉션 이름, Document)] 형태의 튜플 리스트. score 기준 내림차순 정렬됨.
+            list: [(컬렉션 이름, Document, score)] 고유 문서 최대 k개. score 기준 오름차순 정렬됨
+                (diversify이면 MMR 선택 순서).
         """
-        filters = filters or {}
+        targets = self._resolve_targets(collection_names)
+        if not targets:
+            return []
+        filters = self._route_filters(filters, targets)
+
+        cache_key = self._make_cache_key(query, targets, k, filters, mode, diversify)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        if self._known_empty(targets, filters):
+            return []
+
+        pinned, complete = self._exact_name_results(
+            cache_key, query, targets, k, filters
+        )
+        if complete:
+            return pinned
+
+        fetch_k = self._fetch_k(k, diversify)
+        vectors = {} if diversify else None
+        lexical = None
+        if mode == "hybrid":
+            lexical = self._lexical_search(query, targets, fetch_k, filters)
+
+        embedded = query_embedding is None
+        if embedded:
+            query_embedding = self.embed_query(query)
+
+        futures = {
+            self._executor.submit(
+                contextvars.copy_context().run,
+                self._query_collection,
+                name,
+                query_embedding,
+                fetch_k,
+                filters,
+                vectors,
+            ): name
+            for name in targets
+        }
+        done, not_done = wait(futures, timeout=self.collection_timeout)
+        for future in not_done:
+            future.cancel()
+
+        hits = {}
+        failed = [futures[future] for future in not_done]
+        for future in done:
+            name = futures[future]
+            try:
+                hits[name] = future.result()
+            except Exception as e:
+                logger.warning("'%s' 컬렉션 검색 실패: %s", name, e)
+                failed.append(name)
+
+        return self._finish_search(
+            cache_key,
+            k,
+            targets,
+            hits,
+            filters,
+            embedded,
+            failed,
+            len(not_done),
+            lexical=lexical,
+            pinned=pinned,
+            vectors=vectors,
+        )
+
+    @_one_generation
+    async def asearch(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        query_embedding=None,
+        mode="vector",
+        diversify=False,
+    ):
+        """
+        `search`의 비동기 버전.
+
+        - 쿼리 임베딩은 비동기 API로 계산하고, 컬렉션 조회/정책명 조회/BM25 검색은 스레드
+          풀에서 실행.
+        - 이벤트 루프를 막지 않으므로 `get_chatbot_response` 같은 비동기 파이프라인에서 사용.
+
+        Args:
+            query (str): 검색 쿼리 문자열.
+            k (int): 중복 제거 후 전체 검색 결과 수 (기본값 5).
+            filters (dict, optional): 메타데이터 필터링 조건.
+            collection_names (list, optional): 검색 대상 컬렉션 이름 리스트.
+            query_embedding (list[float], optional): 미리 계산된 쿼리 임베딩.
+            mode (str): "vector" 또는 "hybrid".
+            diversify (bool): MMR 다양화 여부.
+
+        Returns:
+            list: [(컬렉션 이름, Document, score)] 고유 문서 최대 k개.
+        """
+        targets = self._resolve_targets(collection_names)
+        if not targets:
+            return []
+        filters = self._route_filters(filters, targets)
+
+        cache_key = self._make_cache_key(query, targets, k, filters, mode, diversify)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        if self._known_empty(targets, filters):
+            return []
+
+        # 정책명 조회(Chroma get)와 BM25 검색도 동기 호출이므로 스레드 풀에서 실행
+        loop = asyncio.get_running_loop()
+        pinned, complete = await loop.run_in_executor(
+            self._executor,
+            contextvars.copy_context().run,
+            self._exact_name_results,
+            cache_key,
+            query,
+            targets,
+            k,
+            filters,
+        )
+        if complete:
+            return pinned
+
+        fetch_k = self._fetch_k(k, diversify)
+        vectors = {} if diversify else None
+        lexical = None
+        if mode == "hybrid":
+            lexical = await loop.run_in_executor(
+                self._executor,
+                contextvars.copy_context().run,
+                self._lexical_search,
+                query,
+                targets,
+                fetch_k,
+                filters,
+            )
+
+        embedded = query_embedding is None
+        if embedded:
+            self._record_stats(embedding_calls=1)
+            query_embedding = await self.embedding_model.aembed_query(query)
+
+        tasks = {
+            asyncio.ensure_future(
+                loop.run_in_executor(
+                    self._executor,
+                    contextvars.copy_context().run,
+                    self._query_collection,
+                    name,
+                    query_embedding,
+                    fetch_k,
+                    filters,
+                    vectors,
+                )
+            ): name
+            for name in targets
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.collection_timeout)
+        for task in pending:
+            task.cancel()
+
+        hits = {}
+        failed = [tasks[task] for task in pending]
+        for task in done:
+            name = tasks[task]
+            try:
+                hits[name] = task.result()
+            except Exception as e:
+                logger.warning("'%s' 컬렉션 검색 실패: %s", name, e)
+                failed.append(name)
+
+        return self._finish_search(
+            cache_key,
+            k,
+            targets,
+            hits,
+            filters,
+            embedded,
+            failed,
+            len(pending),
+            lexical=lexical,
+            pinned=pinned,
+            vectors=vectors,
+        )
+
+    @_one_generation
+    def search_many(
+        self,
+        queries,
+        k=5,
+        filters=None,
+        collection_names=None,
+        mode="vector",
+        diversify=False,
+    ):
+        """
+        여러 쿼리를 한 번에 검색.
+
+        - 캐시에 없는 쿼리들은 임베딩 요청 한 번으로 함께 임베딩.
+        - 컬렉션마다 모든 쿼리 벡터를 묶어 한 번의 배치 조회(스냅샷 행렬곱 또는 Chroma
+          query_embeddings)로 처리하고, 컬렉션끼리는 스레드 풀에서 동시에 조회.
+        - 결과 병합/캐시는 쿼리마다 `search`와 동일하게 처리.
+
+        Args:
+            queries (list): 검색 쿼리 문자열 리스트.
+            k (int): 쿼리별 중복 제거 후 전체 검색 결과 수.
+            filters (dict, optional): 모든 쿼리에 공통으로 적용할 메타데이터 필터.
+            collection_names (list, optional): 검색 대상 컬렉션 이름 리스트.
+            mode (str): "vector" 또는 "hybrid".
+            diversify (bool): MMR 다양화 여부.
+
+        Returns:
+            list: 입력 순서대로, 쿼리마다 [(컬렉션 이름, Document, score)] 리스트.
+        """
+        queries = list(queries)
+        targets = self._resolve_targets(collection_names)
+        if not targets:
+            return [[] for _ in queries]
+        filters = self._route_filters(filters, targets)
+
+        results = [None] * len(queries)
+        pending = {}
+        for i, query in enumerate(queries):
+            cache_key = self._make_cache_key(
+                query, targets, k, filters, mode, diversify
+            )
+            cached = self._get_cached_results(cache_key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            if self._known_empty(targets, filters):
+                results[i] = []
+                continue
+            pinned, complete = self._exact_name_results(
+                cache_key, query, targets, k, filters
+            )
+            if complete:
+                results[i] = pinned
+            else:
+                pending[i] = (cache_key, pinned)
+        if not pending:
+            return results
+
+        indices = list(pending)
+        fetch_k = self._fetch_k(k, diversify)
+        vectors = {} if diversify else None
+        self._record_stats(embedding_calls=1, batch_searches=1)
+        embeddings = self.embedding_model.embed_documents([queries[i] for i in indices])
+
+        futures = {
+            self._executor.submit(
+                contextvars.copy_context().run,
+                self._query_collection_many,
+                name,
+                embeddings,
+                fetch_k,
+                filters,
+                vectors,
+            ): name
+            for name in targets
+        }
+        done, not_done = wait(futures, timeout=self.collection_timeout)
+        for future in not_done:
+            future.cancel()
+
+        hits = {}
+        failed = [futures[future] for future in not_done]
+        for future in done:
+            name = futures[future]
+            try:
+                hits[name] = future.result()
+            except Exception as e:
+                logger.warning("'%s' 컬렉션 배치 검색 실패: %s", name, e)
+                failed.append(name)
+
+        for position, i in enumerate(indices):
+            lexical = None
+            if mode == "hybrid":
+                lexical = self._lexical_search(queries[i], targets, fetch_k, filters)
+            cache_key, pinned = pending[i]
+            results[i] = self._finish_search(
+                cache_key,
+                k,
+                targets,
+                {name: batch[position] for name, batch in hits.items()},
+                filters,
+                position == 0,
+                failed,
+                len(not_done),
+                lexical=lexical,
+                pinned=pinned,
+                vectors=vectors,
+            )
+        return results
+
+    @_one_generation
+    def search_and_format(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        mode="vector",
+        max_tokens=None,
+        diversify=False,
+    ):
+        """
+        검색 결과와 포맷된 마크다운을 함께 반환.
+
+        - 마크다운도 검색 결과와 같은 캐시 항목에 (토큰 예산별로) 저장되므로, 반복 질문은
+          Chroma 조회와 포맷팅을 모두 건너뜀.
+
+        Args:
+            query (str): 검색 쿼리 문자열.
+            k (int): 중복 제거 후 전체 검색 결과 수.
+            filters (dict, optional): 메타데이터 필터링 조건.
+            collection_names (list, optional): 검색 대상 컬렉션 이름 리스트.
+            mode (str): "vector" 또는 "hybrid".
+            max_tokens (int, optional): 마크다운 토큰 예산. None이면 제한 없음.
+            diversify (bool): MMR 다양화 여부.
+
+        Returns:
+            tuple: (검색 결과 리스트, `format_docs` 마크다운 문자열)
+        """
+        results = self.search(
+            query,
+            k=k,
+            filters=filters,
+            collection_names=collection_names,
+            mode=mode,
+            diversify=diversify,
+        )
+        return results, self._format_results(
+            results, query, collection_names, k, filters, mode, max_tokens, diversify
+        )
+
+    @_one_generation
+    async def asearch_and_format(
+        self,
+        query,
+        k=5,
+        filters=None,
+        collection_names=None,
+        mode="vector",
+        max_tokens=None,
+        diversify=False,
+    ):
+        """
+        `search_and_format`의 비동기 버전.
+
+        - 검색은 `asearch`로 실행하므로 RAG 체인을 `astream`으로 실행할 때 이벤트 루프나
+          요청마다의 워커 스레드를 막지 않음.
 
+        Returns:
+            tuple: (검색 결과 리스트, `format_docs` 마크다운 문자열)
+        """
+        results = await self.asearch(
+            query,
+            k=k,
+            filters=filters,
+            collection_names=collection_names,
+            mode=mode,
+            diversify=diversify,
+        )
+        return results, self._format_results(
+            results, query, collection_names, k, filters, mode, max_tokens, diversify
+        )
+
+    def _format_results(
+        self, results, query, collection_names, k, filters, mode, max_tokens, diversify
+    ):
+        """검색 결과의 마크다운을 캐시에서 찾거나 만들어 캐시에 저장."""
+        cache_key = self._make_cache_key(
+            query, self._resolve_targets(collection_names), k, filters, mode, diversify
+        )
+        variant = f"markdown:{max_tokens}"
+        entry = self.result_cache.get(cache_key)
+        if entry is not None and variant in entry.formatted:
+            return entry.formatted[variant]
+
+        context = self.build_context(results, max_tokens=max_tokens)
+        self.result_cache.set_formatted(
+            cache_key, variant, context.text, generation=self._cache_generation()
+        )
+        return context.text
+
+    def _make_cache_key(self, query, targets, k, filters, mode, diversify=False):
+        """
+        검색 모드, 다양화 여부와 기준 날짜를 포함한 결과 캐시 키 생성.
+
+        - 날짜가 바뀌면 키도 바뀌므로, 전날 캐시된 결과에 그사이 마감된 문서가 남지 않음.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 검색 모드입니다: {mode}")
+        return self.result_cache.make_key(
+            query,
+            targets,
+            k,
+            filters,
+            mode=mode,
+            diversify=diversify,
+            active_on=self._active_on(),
+        )
+
+    def _fetch_k(self, k, diversify=False):
+        """
+        컬렉션마다 조회할 후보 수. 적응형 k면 결과를 늘릴 여유분까지, 다양화하면 MMR이 고를
+        후보까지 가져옴.
+        """
+        fetch_k = fetch_size(k) if self.adaptive_k else k
+        return max(fetch_k, mmr_fetch_size(k)) if diversify else fetch_k
+
+    def _negative_key(self, targets, filters):
+        """
+        negative cache 키. 결과 유무가 쿼리와 무관하게 정해지는 필터일 때만 만들고, 아니면 None.
+
+        - region_key 파티션 조건 외의 필터는 모든 대상 컬렉션의 메타데이터 역색인이 해석할 수
+          있어야 함 (색인되지 않은 필드를 거리순으로 훑어 거르는 경우는 쿼리마다 결과가 다를 수 있음).
+        """
+        if not filters:
+            return None
+        fields = {
+            key: value for key, value in filters.items() if key != REGION_KEY_FIELD
+        }
+        if fields:
+            for name in targets:
+                index = self._metadata_index(name)
+                if index is None or not index.supports(fields):
+                    return None
+        return self.result_cache.make_filter_key(
+            targets, filters, active_on=self._active_on()
+        )
+
+    def _known_empty(self, targets, filters):
+        """
+        최근 결과가 없던 필터 조합인지 확인. 맞으면 임베딩/조회 없이 빈 결과로 처리.
+        """
+        key = self._negative_key(targets, filters)
+        if key is None or not self.result_cache.is_empty(key):
+            return False
+        self._record_stats(searches=1, negative_cache_hits=1)
+        return True
+
+    def _get_cached_results(self, cache_key):
+        """
+        캐시된 검색 결과를 반환 (세대 변경 확인은 요청 시작 시 `_pin_generation`에서 처리).
+
+        Returns:
+            list | None: 캐시 적중 시 검색 결과 복사본, 미스면 None.
+        """
+        entry = self.result_cache.get(cache_key)
+        if entry is None:
+            self._record_stats(result_cache_misses=1)
+            return None
+        self._record_stats(result_cache_hits=1)
+        return list(entry.results)
+
+    def _check_generation(self):
+        """
+        로더가 세대 번호를 올렸으면 새로 발행된 버전의 인덱스로 전환하고 결과 캐시를 비움.
+
+        - 전환에 실패하면 세대를 커밋하지 않으므로 다음 확인 주기에 다시 시도.
+        """
+        generation, changed = self.generation_watcher.poll()
+        if not changed:
+            return
+        logger.info("인덱스 세대 변경 감지(%d): 새 버전 인덱스로 전환", generation)
+        if not self.refresh_metadata_indexes():
+            return
+        self.generation_watcher.commit(generation)
+        self.result_cache.invalidate(generation)
+        self._record_stats(generation_reloads=1)
+
+    def _check_generation_in_background(self):
+        """
+        `_check_generation`을 인덱스 로드 전용 스레드에서 실행. 이미 실행 중이면 건너뜀.
+        """
+        with self._reload_future_lock:
+            if self._reload_future is not None and not self._reload_future.done():
+                return
+            self._reload_future = self._reload_executor.submit(
+                self._check_generation_safely
+            )
+
+    def _check_generation_safely(self):
+        """백그라운드 세대 확인. 예외는 로그만 남김 (다음 요청에서 다시 확인)."""
+        try:
+            self._check_generation()
+        except Exception:
+            logger.exception("백그라운드 인덱스 세대 확인 실패")
+
+    def _resolve_targets(self, collection_names):
+        """검색 대상 중 등록된 컬렉션 이름만 추림. None이면 통합 컬렉션."""
         if collection_names is None:
             collection_names = ["unified_data"]
+        return [name for name in collection_names if name in self.collections]
+
+    def _route_filters(self, filters, targets):
+        """
+        region 필터를 region_key 파티션 라우팅 조건으로 바꿈.
+
+        - "서울", "경기도 안산시"처럼 시/도로 해석되는 값은 (시/도, 전국) 파티션 조건이 되어
+          해당 지역 정책과 전국 단위 정책만 검색.
+        - 시/도로 해석되지 않는 값이거나, 파티션이 없는 컬렉션이 대상에 있으면 기존 부분
+          문자열 필터를 그대로 사용.
+
+        Returns:
+            dict: 검색에 사용할 필터 조건.
+        """
+        if not filters or "region" not in filters:
+            return filters
+        partitions = route_region(filters["region"])
+        if partitions is None:
+            return filters
+        if any(name not in self.partitions for name in targets):
+            return filters
+        routed = {key: value for key, value in filters.items() if key != "region"}
+        routed[REGION_KEY_FIELD] = partitions
+        return routed
+
+    def _active_on(self):
+        """마감 문서 제외 기준 날짜(YYYYMMDD). 제외하지 않도록 설정했으면 None."""
+        return today_key() if self.exclude_expired else None
+
+    def _is_current(self, metadata, today):
+        """마감 문서를 제외하지 않거나(today가 None) 마감일이 지나지 않았으면 True."""
+        return today is None or is_active(metadata, today)
+
+    def _active_query(self, name, k, where, today):
+        """
+        마감 문서 제외를 반영한 Chroma 조회 개수와 where 조건.
+
+        - 역색인에 모아 둔 마감일로 컬렉션의 마감 문서 수를 세어 그만큼 더 가져오고,
+          결과에서 거름 (매일 정리 작업이 돌면 대부분 0개).
+        - 마감 문서가 EXPIRED_OVERFETCH_MAX개를 넘으면(정리 작업이 밀린 경우) 느리더라도
+          apply_end where 조건을 붙여 k개를 보장.
+        - 단, 정수 apply_end가 없는 문서(이전 로더가 만든 문서)가 있으면 where 조건이 그
+          문서들까지 빼버리므로 상한 없이 마감 문서 수만큼 더 가져옴 (컬렉션을 다시 적재하면
+          assign_search_metadata가 값을 채워 where 조건을 다시 사용).
+
+        Returns:
+            tuple: (조회 개수, where 조건 또는 None)
+        """
+        index = self._metadata_index(name)
+        if today is None or index is None:
+            return k, where
+        expired = index.expired_count(today)
+        if expired <= EXPIRED_OVERFETCH_MAX or index.undated:
+            return k + expired, where
+        active = {APPLY_END_FIELD: {"$gte": today}}
+        return k, {"$and": [where, active]} if where else active
+
+    def _drop_expired(self, hits, today, k):
+        """[(Document, score)]에서 마감 문서를 빼고 최대 k개 반환."""
+        return [hit for hit in hits if self._is_current(hit[0].metadata, today)][:k]
+
+    def _query_collection(self, name, query_embedding, k, filters=None, vectors=None):
+        """
+        단일 컬렉션을 벡터로 조회. 스레드 풀에서 실행됨.
+
+        - 필터가 없으면 그대로 top-k 조회.
+        - 필터가 역색인으로 해석되면 where 조건으로 후보 집합 안에서만 top-k 조회.
+        - 해석할 수 없으면 필터 결과가 k개가 될 때까지 더 많이 가져와서 거름.
+        - numpy 백엔드 스냅샷이 있으면 Chroma 대신 스냅샷을 조회 (스냅샷에 없는 메타데이터
+          필드로 거르는 경우는 Chroma).
+        - region_key 파티션 조건이면 해당 파티션 컬렉션들만 조회해 거리순으로 합침.
+        - 마감 문서는 스냅샷에서는 거리 계산 직후, Chroma에서는 마감 문서 수만큼 더
+          가져온 결과에서 제외.
+        - vectors가 주어지면 조회 중에 함께 받은 후보 임베딩을 {문서 ID: 벡터}로 채움 (MMR용).
+        """
+        partitions = self._partition_targets(name, filters)
+        if partitions is not None:
+            filters = {
+                key: value for key, value in filters.items() if key != REGION_KEY_FIELD
+            }
+            hits = [
+                hit
+                for partition in partitions
+                for hit in self._query_collection(
+                    partition, query_embedding, k, filters, vectors
+                )
+            ]
+            return sorted(hits, key=lambda hit: hit[1])[:k]
+
+        snapshot = self.snapshots.get(name)
+        if snapshot is not None and snapshot.supports(filters):
+            return self._query_snapshot(
+                name, snapshot, query_embedding, k, filters, vectors
+            )
+
+        today = self._active_on()
+        collection = self._collection(name)
+        if not filters:
+            fetch_k, where = self._active_query(name, k, None, today)
+            [hits] = self._chroma_query(
+                collection, [query_embedding], fetch_k, where, vectors
+            )
+            return self._drop_expired(hits, today, k)
+
+        index = self._metadata_index(name)
+        if index is not None and index.supports(filters):
+            candidate_ids = index.candidate_ids(filters)
+            self._record_stats(filtered_index_hits=1)
+            if not candidate_ids:
+                # 역색인상 조건을 만족하는 문서가 없으므로 벡터 검색 자체를 생략
+                return []
+            if len(candidate_ids) <= EXACT_CANDIDATE_LIMIT:
+                return self._score_candidates(
+                    collection, query_embedding, candidate_ids, k, today, vectors
+                )
+            where = index.build_where(filters, max_values=METADATA_WHERE_MAX_VALUES)
+            if where:
+                fetch_k, where = self._active_query(name, k, where, today)
+                [hits] = self._chroma_query(
+                    collection, [query_embedding], fetch_k, where, vectors
+                )
+                return self._drop_expired(hits, today, k)
+
+        return self._overfetch(collection, query_embedding, k, filters, today, vectors)
+
+    def _partition_targets(self, name, filters):
+        """
+        region_key 파티션 조건일 때 조회할 파티션 컬렉션 이름 리스트. 아니면 None.
+        """
+        if not filters or REGION_KEY_FIELD not in filters:
+            return None
+        manifest = self.partitions.get(name)
+        if manifest is None:
+            return None
+        self._record_stats(region_partition_searches=1)
+        return [manifest[key] for key in filters[REGION_KEY_FIELD] if key in manifest]
+
+    def _query_collection_many(
+        self, name, query_embeddings, k, filters=None, vectors=None
+    ):
+        """
+        단일 컬렉션을 여러 쿼리 벡터로 한 번에 조회. 스레드 풀에서 실행됨.
+
+        - 스냅샷은 행렬곱 한 번, Chroma는 query_embeddings 배치 조회 한 번으로 처리.
+        - Chroma에서 where 조건으로 바꿀 수 없는 필터는 쿼리별 `_query_collection`으로 처리.
+        - region_key 파티션 조건이면 파티션 컬렉션마다 배치 조회한 뒤 쿼리별로 합침.
+
+        Returns:
+            list: 쿼리마다 [(Document, score)] 리스트.
+        """
+        partitions = self._partition_targets(name, filters)
+        if partitions is not None:
+            filters = {
+                key: value for key, value in filters.items() if key != REGION_KEY_FIELD
+            }
+            merged = [[] for _ in query_embeddings]
+            for partition in partitions:
+                batch = self._query_collection_many(
+                    partition, query_embeddings, k, filters, vectors
+                )
+                for hits, partition_hits in zip(merged, batch):
+                    hits.extend(partition_hits)
+            return [sorted(hits, key=lambda hit: hit[1])[:k] for hits in merged]
+
+        snapshot = self.snapshots.get(name)
+        if snapshot is not None and snapshot.supports(filters):
+            return self._query_snapshot(
+                name, snapshot, query_embeddings, k, filters, vectors
+            )
+
+        where = None
+        if filters:
+            index = self._metadata_index(name)
+            if index is not None and index.supports(filters):
+                where = index.build_where(filters, max_values=METADATA_WHERE_MAX_VALUES)
+                if where == {}:
+                    return [[] for _ in query_embeddings]
+            if not where:
+                return [
+                    self._query_collection(name, embedding, k, filters, vectors)
+                    for embedding in query_embeddings
+                ]
+            self._record_stats(filtered_index_hits=1)
+
+        today = self._active_on()
+        fetch_k, where = self._active_query(name, k, where, today)
+        batch = self._chroma_query(
+            self._collection(name), query_embeddings, fetch_k, where, vectors
+        )
+        return [self._drop_expired(hits, today, k) for hits in batch]
+
+    def _chroma_query(
+        self, collection, query_embeddings, n_results, where=None, vectors=None
+    ):
+        """
+        Chroma 컬렉션을 쿼리 벡터 여러 개로 한 번에 조회.
+
+        - vectors가 주어지면 같은 조회에서 후보 임베딩도 받아 {문서 ID: 벡터}로 채움.
+
+        Returns:
+            list: 쿼리마다 거리 오름차순 [(Document, score)] 리스트.
+        """
+        include = ["documents", "metadatas", "distances"]
+        if vectors is not None:
+            include.append("embeddings")
+        result = collection._collection.query(
+            query_embeddings=[list(embedding) for embedding in query_embeddings],
+            n_results=n_results,
+            where=where,
+            include=include,
+        )
+        if vectors is not None:
+            for ids, embeddings in zip(result["ids"], result["embeddings"]):
+                vectors.update(zip(ids, embeddings))
+        return [
+            [
+                (
+                    Document(
+                        page_content=document or "",
+                        metadata=metadata or {},
+                        id=doc_id,
+                    ),
+                    float(distance),
+                )
+                for doc_id, document, metadata, distance in zip(
+                    ids, documents, metadatas, distances
+                )
+            ]
+            for ids, documents, metadatas, distances in zip(
+                result["ids"],
+                result["documents"],
+                result["metadatas"],
+                result["distances"],
+            )
+        ]
+
+    def _query_snapshot(
+        self, name, snapshot, query_embedding, k, filters=None, vectors=None
+    ):
+        """
+        NumPy 스냅샷을 전수 검색.
+
+        - 역색인으로 해석되는 필터는 후보 행만 계산하고, 그 외 필터는 거리순으로 훑으며 거름.
+        - 마감 문서는 거리를 inf로 두어 순위 계산 전에 제외.
+        - query_embedding이 (쿼리 수, 차원) 행렬이면 쿼리별 결과 리스트를 반환.
+        - vectors가 주어지면 결과 문서의 스냅샷 행을 {문서 ID: 벡터}로 채움.
+        - 스냅샷에는 본문이 없으므로 top-k를 고른 뒤 Chroma에서 ID로 원본 문서를 가져옴.
+
+        Returns:
+            list: 거리 오름차순 [(Document, score)] 최대 k개 (배치면 쿼리마다).
+        """
+        batched = np.ndim(query_embedding) == 2
+        today = self._active_on()
+        if not filters:
+            hits = snapshot.search(query_embedding, k, active_on=today)
+        else:
+            hits = self._search_snapshot_filtered(
+                name, snapshot, query_embedding, k, filters, today
+            )
+        if vectors is not None:
+            for batch in hits:
+                for doc, _ in batch:
+                    vectors[doc.id] = snapshot.matrix[snapshot.positions[doc.id]]
+        hits = self._hydrate(name, hits)
+        return hits if batched else hits[0]
+
+    def _hydrate(self, name, batches):
+        """
+        스냅샷 검색 결과의 본문 없는 Document를 Chroma에 저장된 원본 문서로 바꿈.
+
+        - 모든 쿼리의 결과 ID를 모아 한 번의 get으로 가져옴.
+
+        Returns:
+            list: 쿼리마다 [(Document, score)] 리스트 (Chroma에 없는 문서는 제외).
+        """
+        ids = list({doc.id for batch in batches for doc, _ in batch})
+        if not ids:
+            return batches
+        docs = {doc.id: doc for doc in self._documents_by_id(name, ids)}
+        return [
+            [(docs[doc.id], score) for doc, score in batch if doc.id in docs]
+            for batch in batches
+        ]
 
-        results = []
-        for name in collection_names:
-            if name not in self.collections:
+    def _search_snapshot_filtered(
+        self, name, snapshot, query_embedding, k, filters, today
+    ):
+        """필터 조건이 있는 스냅샷 검색. 반환 형식은 `NumpySnapshot.search`와 같음."""
+        index = self._metadata_index(name)
+        if index is not None and index.supports(filters):
+            self._record_stats(filtered_index_hits=1)
+            rows = [
+                snapshot.positions[doc_id]
+                for doc_id in index.candidate_ids(filters)
+                if doc_id in snapshot.positions
+            ]
+            return snapshot.search(query_embedding, k, rows=rows, active_on=today)
+        return snapshot.search(
+            query_embedding,
+            k,
+            predicate=lambda metadata: self._metadata_match(metadata, filters),
+            active_on=today,
+        )
+
+    def _score_candidates(
+        self, collection, query_embedding, candidate_ids, k, today=None, vectors=None
+    ):
+        """
+        후보 문서의 임베딩만 가져와 쿼리와의 거리(제곱 L2, Chroma 기본값)를 직접 계산.
+
+        - today가 주어지면 마감 문서는 제외.
+        - vectors가 주어지면 가져온 임베딩을 {문서 ID: 벡터}로 채움.
+
+        Returns:
+            list: 거리 오름차순 [(Document, score)] 최대 k개.
+        """
+        result = collection.get(
+            ids=list(candidate_ids), include=["embeddings", "documents", "metadatas"]
+        )
+        if not result["ids"]:
+            return []
+        matrix = np.asarray(result["embeddings"], dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        distances = ((matrix - query) ** 2).sum(axis=1)
+        if vectors is not None:
+            vectors.update(zip(result["ids"], matrix))
+        order = [
+            i
+            for i in np.argsort(distances)
+            if self._is_current(result["metadatas"][i] or {}, today)
+        ]
+        return [
+            (
+                Document(
+                    page_content=result["documents"][i],
+                    metadata=result["metadatas"][i] or {},
+                    id=result["ids"][i],
+                ),
+                float(distances[i]),
+            )
+            for i in order[:k]
+        ]
+
+    def _overfetch(
+        self, collection, query_embedding, k, filters, today=None, vectors=None
+    ):
+        """
+        필터를 만족하는 결과가 k개가 될 때까지 조회 개수를 늘려가며 재검색.
+
+        Returns:
+            list: 필터를 만족하고 마감되지 않은 [(Document, score)] 최대 k개.
+        """
+        fetch_k = k * OVERFETCH_FACTOR
+        while True:
+            self._record_stats(overfetch_rounds=1)
+            [hits] = self._chroma_query(
+                collection, [query_embedding], fetch_k, vectors=vectors
+            )
+            matched = [
+                (doc, score)
+                for doc, score in hits
+                if self._metadata_match(doc.metadata, filters)
+                and self._is_current(doc.metadata, today)
+            ]
+            if len(matched) >= k or len(hits) < fetch_k or fetch_k >= OVERFETCH_MAX_K:
+                return matched[:k]
+            fetch_k = min(fetch_k * OVERFETCH_FACTOR, OVERFETCH_MAX_K)
+
+    def _exact_name_results(self, cache_key, query, targets, k, filters):
+        """
+        쿼리에 들어 있는 정책명의 문서를 정책명 인덱스에서 바로 찾음.
+
+        - 쿼리 전체가 정책명(또는 줄임말)이고 일치 문서가 k개 이하이면 임베딩과 벡터
+          조회를 모두 생략할 수 있으므로 결과를 캐시하고 완료로 표시.
+        - 그 외에는 최대 NAME_PIN_LIMIT개만 고정하고 나머지는 벡터 순위에 맡김.
+        - 문서를 가져오는 ID 수는 고정할 문서 수의 OVERFETCH_FACTOR배로 제한 (마감/필터로
+          빠지는 문서 대비).
+        - score는 0.0(완전 일치)으로 두어 거리/RRF 점수보다 항상 앞에 옴.
+
+        Returns:
+            tuple: ([(컬렉션 이름, Document, 0.0)] 리스트, 벡터 검색 생략 가능 여부).
+        """
+        entries = [
+            (name, doc_id)
+            for name, doc_id in self.name_index.lookup(query)
+            if name in targets
+        ]
+        if not entries:
+            return [], False
+
+        covered = len(entries) <= k and self.name_index.covers(query)
+        limit = k if covered else NAME_PIN_LIMIT
+        by_collection = {}
+        for name, doc_id in entries[: limit * OVERFETCH_FACTOR]:
+            by_collection.setdefault(name, []).append(doc_id)
+
+        today = self._active_on()
+        rankings = [
+            [
+                (name, doc, 0.0)
+                for doc in self._documents_by_id(name, by_collection[name])
+                if self._metadata_match(doc.metadata, filters)
+                and self._is_current(doc.metadata, today)
+            ]
+            for name in targets
+            if name in by_collection
+        ]
+        results = fuse_results(rankings, limit, strategy="min")
+        complete = covered and bool(results)
+        if complete:
+            self.result_cache.set(
+                cache_key, results, generation=self._cache_generation()
+            )
+            self._record_stats(searches=1, exact_name_hits=1)
+        return list(results), complete
+
+    def _documents_by_id(self, name, ids):
+        """
+        문서 ID로 Chroma에서 Document를 가져옴.
+
+        Returns:
+            list: ids 순서대로의 Document 리스트 (없는 ID는 제외).
+        """
+        result = self._collection(name).get(
+            ids=list(ids), include=["documents", "metadatas"]
+        )
+        docs = {
+            doc_id: Document(
+                page_content=document or "", metadata=metadata or {}, id=doc_id
+            )
+            for doc_id, document, metadata in zip(
+                result["ids"], result["documents"], result["metadatas"]
+            )
+        }
+        return [docs[doc_id] for doc_id in ids if doc_id in docs]
+
+    def _lexical_search(self, query, targets, k, filters):
+        """
+        컬렉션별 BM25 상위 문서 랭킹을 반환.
+
+        - 마감 문서 수만큼 더 가져와 마감 문서를 거름.
+
+        Returns:
+            list: 컬렉션마다 [(컬렉션 이름, Document, BM25 점수)] 점수 내림차순 리스트.
+        """
+        today = self._active_on()
+        rankings = []
+        for name in targets:
+            index = self.lexical_indexes.get(name)
+            if index is None:
                 continue
-            collection = self.collections[name]
-            docs_with_scores = collection.similarity_search_with_score(query, k=k)
-            for doc, score in docs_with_scores:
-                if self._metadata_match(doc.metadata, filters):
-                    results.append((name, doc, score))
+            fetch_k, _ = self._active_query(
+                name, k * OVERFETCH_FACTOR if filters else k, None, today
+            )
+            ranking = []
+            for position, score in index.search(query, fetch_k):
+                doc = index.document(position)
+                if (
+                    len(ranking) < k
+                    and self._metadata_match(doc.metadata, filters)
+                    and self._is_current(doc.metadata, today)
+                ):
+                    ranking.append((name, doc, score))
+            rankings.append(ranking)
+        self._record_stats(lexical_searches=1)
+        return rankings
+
+    def _finish_search(
+        self,
+        cache_key,
+        k,
+        targets,
+        hits,
+        filters,
+        embedded,
+        failed,
+        timeouts,
+        lexical=None,
+        pinned=None,
+        vectors=None,
+    ):
+        """
+        컬렉션별 결과를 필터링 후 중복 제거하며 병합하고, 캐시와 통계를 갱신.
 
-        return sorted(results, key=lambda x: x[2])
+        - BM25 랭킹이 있으면 점수 척도가 달라 항상 RRF로 병합.
+        - 적응형 k면 벡터 거리 분포로 반환할 결과 수를 정함.
+        - 마감 임박 가중치가 설정되어 있으면 후보 전체를 병합한 뒤 가중치를 반영해 k개를 고름.
+        - vectors가 주어지면(다양화) 병합 후보를 더 남긴 뒤 MMR로 k개를 고름.
+        - 필터 검색 결과가 비었으면 필터 조합을 negative cache에 기록.
+        - 정책명 인덱스에서 찾은 문서(pinned)는 병합 결과보다 앞에 둠.
+
+        Args:
+            cache_key (str): 결과 캐시 키.
+            k (int): 반환할 고유 문서 수.
+            targets (list): 조회한 컬렉션 이름 리스트 (순서 유지용).
+            hits (dict): 컬렉션 이름 -> [(Document, score)].
+            filters (dict): 메타데이터 필터링 조건.
+            embedded (bool): 이번 검색에서 쿼리 임베딩을 새로 계산했는지 여부.
+            failed (list): 타임아웃 또는 오류로 결과가 없는 컬렉션 이름 리스트.
+            timeouts (int): 타임아웃된 컬렉션 수.
+            lexical (list, optional): hybrid 모드의 컬렉션별 BM25 랭킹.
+            pinned (list, optional): 정책명이 일치한 [(컬렉션 이름, Document, 0.0)] 리스트.
+            vectors (dict, optional): MMR에 쓸 {문서 ID: 임베딩}.
+
+        Returns:
+            list: [(컬렉션 이름, Document, score)] score 오름차순 리스트 (다양화하면 MMR
+                선택 순서).
+        """
+        filters = filters or {}
+
+        # 컬렉션마다 쿼리를 다시 임베딩하지 않았으므로 (컬렉션 수 - 실제 호출 수)만큼 절약
+        saved = len(targets) - (1 if embedded else 0)
+
+        rankings = [
+            [
+                (name, doc, score)
+                for doc, score in hits.get(name, [])
+                if self._metadata_match(doc.metadata, filters)
+            ]
+            for name in targets
+        ]
+        limit = self._adaptive_limit(rankings, k) if self.adaptive_k else k
+        strategy = self.fusion
+        if lexical:
+            rankings.extend(lexical)
+            strategy = "rrf"
+        total = sum(len(ranking) for ranking in rankings)
+        pool = limit if vectors is None else mmr_fetch_size(limit)
+        if self.deadline_boost > 0:
+            results = self._boost_deadlines(
+                fuse_results(rankings, total, strategy=strategy), pool
+            )
+        else:
+            results = fuse_results(rankings, pool, strategy=strategy)
+        duplicates = total - len(results)
+        if vectors is not None:
+            results = self._diversify(results, limit, vectors)
+        if pinned:
+            pinned_keys = {document_key(doc) for _, doc, _ in pinned}
+            results = pinned + [
+                hit for hit in results if document_key(hit[1]) not in pinned_keys
+            ]
+            results = results[: max(limit, len(pinned))]
+            self._record_stats(name_pinned_searches=1)
+
+        if failed:
+            # 부분 결과는 캐시하지 않음
+            logger.warning(
+                "컬렉션 검색 누락(타임아웃 %.1fs 또는 오류): %s",
+                self.collection_timeout,
+                failed,
+            )
+        else:
+            generation = self._cache_generation()
+            self.result_cache.set(cache_key, results, generation=generation)
+            negative_key = None if results else self._negative_key(targets, filters)
+            if negative_key is not None:
+                self.result_cache.mark_empty(negative_key, generation=generation)
+
+        self._record_stats(
+            searches=1,
+            embedding_calls_saved=saved,
+            collection_timeouts=timeouts,
+            merged_hits_dropped=duplicates,
+        )
+        logger.debug(
+            "search: %d개 컬렉션 조회, 임베딩 호출 %d회 절약", len(targets), saved
+        )
+        return list(results)
+
+    def _diversify(self, results, k, vectors):
+        """
+        병합 후보 중 MMR로 서로 덜 비슷한 k개를 고름.
+
+        - 후보 임베딩은 벡터 조회 중에 함께 받은 것만 쓰므로 임베딩/인덱스 호출이 늘지 않음.
+
+        Returns:
+            list: MMR 선택 순서의 [(컬렉션 이름, Document, score)] 최대 k개.
+        """
+        order = mmr_select(
+            [score for _, _, score in results],
+            [vectors.get(doc.id) for _, doc, _ in results],
+            k,
+            lambda_mult=self.mmr_lambda,
+        )
+        self._record_stats(
+            mmr_searches=1, mmr_docs_replaced=sum(1 for i in order if i >= k)
+        )
+        return [results[i] for i in order]
+
+    def _adaptive_limit(self, rankings, k):
+        """
+        컬렉션별 벡터 랭킹의 거리 분포로 반환할 결과 수를 정하고 통계를 기록.
+
+        - 병합 방식과 무관하게 컬렉션 간 최소 거리로 분포를 봄 (RRF 점수는 순위만 반영하므로).
+        - 마감 임박 가중치를 쓰면 가중치를 반영해 다시 정렬한 거리로 봄 (원래 거리로 자르면
+          가중치로 앞당겨진 문서가 잘린 범위 밖에 있거나, 간격이 사라진 지점에서 자를 수 있음).
+
+        Returns:
+            int: 반환할 결과 수.
+        """
+        fused = fuse_results(rankings, fetch_size(k), strategy="min")
+        if self.deadline_boost > 0:
+            fused = self._boosted(fused)
+        distances = [score for _, _, score in fused]
+        limit = adaptive_cut(distances, k)
+        if limit < k:
+            self._record_stats(adaptive_k_trimmed=1, adaptive_k_docs_saved=k - limit)
+        elif limit > k:
+            self._record_stats(adaptive_k_expanded=1)
+        return limit
+
+    def _boost_deadlines(self, results, k):
+        """
+        마감이 임박한 문서가 앞으로 오도록 score를 조정해 다시 정렬한 뒤 k개로 자름.
+
+        - score * (1 - RETRIEVER_DEADLINE_BOOST * 임박도). 임박도는 마감
+          DEADLINE_BOOST_DAYS일 전부터 0 -> 1(마감 당일)로 커지며, 상시 모집은 0.
+
+        Returns:
+            list: [(컬렉션 이름, Document, 조정된 score)] score 오름차순 최대 k개.
+        """
+        self._record_stats(deadline_boosted_searches=1)
+        return self._boosted(results)[:k]
+
+    def _boosted(self, results):
+        """마감 임박 가중치를 반영한 score 오름차순 [(컬렉션 이름, Document, score)]."""
+        today = today_key()
+        boosted = [
+            (
+                name,
+                doc,
+                score * (1 - self.deadline_boost * urgency(doc.metadata, today)),
+            )
+            for name, doc, score in results
+        ]
+        boosted.sort(key=lambda hit: hit[2])
+        return boosted
+
+    def get_stats(self):
+        """
+        누적 검색 통계 반환.
+
+        Returns:
+            dict: searches(검색 횟수), embedding_calls(임베딩 호출 수),
+                embedding_calls_saved(재사용으로 절약한 임베딩 호출 수),
+                collection_timeouts(타임아웃된 컬렉션 조회 수),
+                filtered_index_hits(역색인으로 처리한 필터 검색 수),
+                region_partition_searches(지역 파티션으로 라우팅한 컬렉션 조회 수),
+                overfetch_rounds(필터 보충을 위한 추가 조회 수),
+                result_cache_hits/result_cache_misses(검색 결과 캐시 적중/미스 수),
+                generation_reloads(인덱스 세대 변경으로 인한 갱신 수),
+                collections_released(세대 전환 후 해제한 이전 버전 컬렉션 수),
+                exact_name_hits/lexical_searches(정책명 완전 일치 / BM25 검색 수),
+                name_pinned_searches(정책명 일치 문서를 벡터 결과 앞에 둔 검색 수),
+                merged_hits_dropped(병합 시 중복 또는 k 초과로 제외된 결과 수),
+                batch_searches(search_many 배치 수),
+                deadline_boosted_searches(마감 임박 가중치를 반영한 검색 수),
+                mmr_searches/mmr_docs_replaced(MMR 다양화 검색 수 / 거리순 상위 k 밖에서
+                골라 넣은 문서 수),
+                negative_cache_hits(결과가 없던 필터 조합이라 조회 없이 끝낸 검색 수),
+                adaptive_k_trimmed/adaptive_k_expanded(적응형 k로 결과를 줄인 / 늘린 검색 수),
+                adaptive_k_docs_saved(적응형 k로 컨텍스트에서 뺀 문서 수),
+                context_tokens_used/context_tokens_dropped(컨텍스트에 넣은 / 예산 때문에
+                뺀 토큰 수),
+                embedding_cache_*(임베딩 캐시 적중/미스 수) 등의 카운터.
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        for key, value in self.embedding_model.cache.get_stats().items():
+            stats[f"embedding_cache_{key}"] = value
+        return stats
+
+    def _record_stats(self, **counts):
+        """검색 통계 카운터를 스레드 안전하게 증가."""
+        with self._stats_lock:
+            self.stats.update(counts)
 
     def _metadata_match(self, metadata, filters):
         """
         주어진 메타데이터가 필터 조건을 충족하는지 검사.
 
+        - 대소문자, 전각/반각, 띄어쓰기 차이는 무시하고 부분 문자열 포함 여부로 판단.
+        - 값이 튜플/리스트이면(region_key 파티션) 원소 중 하나와 정확히 같아야 함.
+
         Args:
             metadata (dict): 문서의 메타데이터.
             filters (dict): {"key": "value"} 형태의 조건.
@@ -100,48 +1885,54 @@ class VectorRetriever:
         for key, value in filters.items():
             if key not in metadata:
                 return False
-            if value not in str(metadata[key]):
+            if isinstance(value, (tuple, list)):
+                if metadata[key] not in value:
+                    return False
+            elif compact_text(value) not in compact_text(metadata[key]):
                 return False
         return True
 
-    def format_docs(self, docs):
+    def build_context(self, docs, max_tokens=None):
+        """
+        검색 결과를 토큰 예산 안에서 마크다운으로 조립하고 토큰 사용량을 기록.
+
+        Args:
+            docs (list): [(컬렉션 이름, Document, score)] 순위순 리스트.
+            max_tokens (int, optional): 토큰 예산. None이면 제한 없음.
+
+        Returns:
+            BuiltContext: 마크다운(text)과 used_tokens/dropped_tokens/included/dropped.
+        """
+        context = build_context(docs, max_tokens=max_tokens)
+        self._record_stats(
+            context_tokens_used=context.used_tokens,
+            context_tokens_dropped=context.dropped_tokens,
+        )
+        logger.debug(
+            "context: 문서 %d개 포함(%d토큰), %d개 제외, %d토큰 생략 (예산 %s)",
+            context.included,
+            context.used_tokens,
+            context.dropped,
+            context.dropped_tokens,
+            max_tokens,
+        )
+        return context
+
+    def format_docs(self, docs, max_tokens=None):
         """
         검색된 문서 리스트를 사용자에게 제공할 수 있는 포맷으로 변환.
 
         - 각 문서에서 표준화된 메타데이터(name, region, subject, detail, link)와 본문을 추출하여 마크다운 형식으로 가공.
+        - 본문에 이미 들어 있는 subject/detail은 중복해서 넣지 않음.
+        - max_tokens가 주어지면 순위순으로 예산 안에서만 채우고, 긴 필드는 잘라냄.
         - 링크가 없을 경우 안내 문구로 대체.
         - score는 내부 정렬용으로만 사용되며 사용자에게 노출되지 않음.
 
         Args:
             docs (list): [(컬렉션 이름, Document, score)] 튜플 리스트.
+            max_tokens (int, optional): 토큰 예산.
 
         Returns:
             str: 문서들의 제목, 내용, 메타데이터를 포함한 마크다운 문자열.
         """
-        formatted = []
-        for name, doc, _ in docs:
-            meta = doc.metadata
-            content = doc.page_content.strip()
-
-            title = meta.get("name", "제목 없음")
-            region = meta.get("region", "정보 없음")
-            subject = meta.get("subject", "정보 없음")
-            detail = meta.get("detail", "정보 없음")
-            link = meta.get("link")
-
-            link_md = (
-                f"[바로가기]({link})"
-                if link
-                else "해당 서비스는 URL이 제공되지 않습니다."
-            )
-
-            formatted.append(
-                f"**[{title}]**\n"
-                f"- 지역: {region}\n"
-                f"- 지원대상: {subject}\n"
-                f"- 지원내용: {detail}\n"
-                f"- 링크: {link_md}\n"
-                f"- 본문 요약: {content}"
-            )
-
-        return "\n\n---\n\n".join(formatted)
+        return self.build_context(docs, max_tokens=max_tokens).text
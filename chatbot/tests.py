@@ -1,4 +1,8 @@
 import asyncio
+import json
+import os
+import tempfile
+import time
 import unittest
 import uuid
 from unittest.mock import patch
@@ -6,9 +10,20 @@ from unittest.mock import patch
 from channels.db import database_sync_to_async
 from channels.testing import WebsocketCommunicator
 from django.contrib.auth import get_user_model
-from django.test import TransactionTestCase
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
 
 from chatbot.consumers import ChatConsumer
+from chatbot.langchain_flow.aho_corasick import AhoCorasick
+from chatbot.langchain_flow.chains.detail_rag_chain import DETAIL_CHAIN
+from chatbot.langchain_flow.classifier import (
+    Category,
+    ReloadingTermMatcher,
+    manual_classifier,
+)
+from chatbot.langchain_flow.fast_path import ClassificationFastPath
+from chatbot.langchain_flow.run import stream_with_deduction
+from chatbot.langchain_flow.speculative import SpeculativeRetrieval, keyword_overlap
+from chatbot.langchain_flow.task_graph import TaskGraph
 from chatbot.models import ChatLog, ChatRoom
 
 User = get_user_model()
@@ -162,5 +177,258 @@ class ChatConsumerTestCase(TransactionTestCase):
         self.loop.run_until_complete(run_test())
 
 
+class TaskGraphTestCase(SimpleTestCase):
+    """
+    응답 전처리용 비동기 의존성 그래프를 테스트합니다.
+    """
+
+    def test_independent_nodes_run_concurrently(self):
+        """독립 노드는 동시에 실행되고, 의존 노드는 앞 노드의 결과를 받는지 테스트"""
+
+        async def sleep_and_return(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        async def classify(history):
+            return f"{history}->분류"
+
+        graph = TaskGraph()
+        graph.add("history", lambda: sleep_and_return("기록"))
+        graph.add("classification", classify, deps=("history",))
+        graph.add("profile", lambda: sleep_and_return("프로필"))
+        graph.add("credit", lambda: sleep_and_return(10))
+        results = asyncio.run(graph.run())
+
+        self.assertEqual(
+            results,
+            {
+                "history": "기록",
+                "classification": "기록->분류",
+                "profile": "프로필",
+                "credit": 10,
+            },
+        )
+        self.assertLess(graph.elapsed, 0.25)
+        self.assertEqual(set(graph.timings), set(results))
+        with self.assertRaises(ValueError):
+            graph.add("summary", classify, deps=("unknown",))
+
+
+class SpeculativeRetrievalTestCase(SimpleTestCase):
+    """
+    입력 분류 전에 시작하는 추측 검색을 테스트합니다.
+    """
+
+    def test_take_reuses_only_overlapping_query(self):
+        """겹치는 쿼리는 미리 검색한 결과를 재사용하고, 겹치지 않으면 취소하는지 테스트"""
+
+        class Tool:
+            async def ainvoke(self, tool_input):
+                return f"검색: {tool_input['query']}"
+
+        self.assertEqual(keyword_overlap("청년 월세 지원", "청년월세지원"), 1.0)
+        self.assertLess(keyword_overlap("청년 월세 지원", "노인 일자리"), 0.5)
+
+        async def scenario():
+            speculation = SpeculativeRetrieval(enabled=True, min_overlap=0.5)
+            speculation.start("overview", Tool(), "청년 월세 지원 알려줘")
+            speculation.start("detail", Tool(), "청년 월세 지원 알려줘")
+            speculation.start("personalized", Tool(), "서울 청년 구직자")
+            hit = await speculation.take("overview", "청년 월세 지원")
+            miss = await speculation.take("personalized", "노인 일자리")
+            speculation.cancel()
+            return hit, miss, speculation.pending
+
+        hit, miss, pending = asyncio.run(scenario())
+
+        self.assertEqual(hit, "검색: 청년 월세 지원 알려줘")
+        self.assertIsNone(miss)
+        self.assertEqual(pending, {})
+        self.assertGreaterEqual(SpeculativeRetrieval.get_stats()["hits"], 1)
+
+
+class AsyncRAGToolTestCase(SimpleTestCase):
+    """
+    RAG 체인의 비동기 검색 툴 실행을 테스트합니다.
+    """
+
+    @override_settings(WEB_SEARCH_TIMEOUT=0.2)
+    def test_vector_and_web_search_run_concurrently(self):
+        """벡터 검색과 웹 검색이 동시에 실행되고, 느린 웹 검색은 제한 시간 후 빈 결과가 되는지 테스트"""
+
+        class Retriever:
+            async def asearch_and_format(self, query, **kwargs):
+                await asyncio.sleep(0.1)
+                return [], f"검색: {query}"
+
+        class SlowTavily:
+            def __init__(self, **kwargs):
+                pass
+
+            async def arun(self, query):
+                await asyncio.sleep(1)
+                return "웹 결과"
+
+        async def retrieve():
+            started = time.perf_counter()
+            result = await DETAIL_CHAIN.first.ainvoke(
+                {"question": "질문", "keywords": ["청년", "월세"]}
+            )
+            return result, time.perf_counter() - started
+
+        with patch(
+            "chatbot.langchain_flow.tools.detail_rag_tool.VectorRetriever", Retriever
+        ), patch(
+            "chatbot.langchain_flow.tools.tavily_web_tool.TavilySearchResults",
+            SlowTavily,
+        ):
+            result, elapsed = asyncio.run(retrieve())
+
+        self.assertEqual(result["context"], "검색: 청년 월세")
+        self.assertEqual(result["web_search"], "")
+        self.assertLess(elapsed, 0.5)
+
+
+class CreditDeductionStreamTestCase(SimpleTestCase):
+    """
+    응답 생성과 동시에 진행한 크레딧 차감의 마무리를 테스트합니다.
+    """
+
+    def test_refund_when_stream_fails_before_first_chunk(self):
+        """첫 청크 전에 응답 생성이 실패하면 차감을 되돌리고 예외를 전달하는지 테스트"""
+
+        async def failing_stream():
+            raise RuntimeError("LLM 오류")
+            yield "응답"
+
+        async def deduct(error):
+            await asyncio.sleep(0.05)
+            return error
+
+        async def consume(error):
+            deduction = asyncio.ensure_future(deduct(error))
+            chunks = []
+            async for chunk in stream_with_deduction(
+                failing_stream(), deduction, 1, cost=1
+            ):
+                chunks.append(chunk)
+            return chunks, deduction
+
+        with patch("chatbot.langchain_flow.run.refund_credit") as refund:
+            with self.assertRaises(RuntimeError):
+                asyncio.run(consume(None))
+            refund.assert_called_once_with(1, cost=1)
+
+            refund.reset_mock()
+            chunks, deduction = asyncio.run(consume("크레딧 부족"))
+            self.assertEqual(chunks, [("크레딧 부족", False)])
+            self.assertTrue(deduction.done())
+            refund.assert_not_called()
+
+
+class ClassificationFastPathTestCase(SimpleTestCase):
+    """
+    규칙 기반 분류 확신도와 LLM 입력 분류 빠른 경로를 테스트합니다.
+    """
+
+    def test_fast_path_only_for_confident_messages(self):
+        """이전 대화가 없고 확신도가 높은 메시지만 빠른 경로를 타고, 섀도 실행이 불일치를 기록하는지 테스트"""
+        confident = manual_classifier("청년 월세 지원 정책 알려줘")
+        self.assertEqual(confident.category, Category.GOV_POLICY.value)
+        self.assertEqual(sum(confident.scores.values()), 1.0)
+        self.assertGreater(confident.confidence, 0.7)
+        self.assertEqual(
+            manual_classifier("그거 신청 절차 자세히 알려줘").confidence, 0
+        )
+        self.assertEqual(manual_classifier("나한테 맞는 정책 알려줘").confidence, 0)
+        self.assertIsNone(manual_classifier("심심하다").category)
+        self.assertEqual(
+            manual_classifier("점심 메뉴 추천해줘 알려줘 추천해줘").confidence, 0
+        )
+
+        async def llm_classify():
+            return {"category": Category.OFF_TOPIC.value, "is_followup": False}
+
+        async def scenario():
+            fast_path = ClassificationFastPath(threshold=0.7, shadow_rate=1.0)
+            skipped = fast_path.classify(
+                "대출 신청 조건은?", manual_classifier("대출 신청 조건은?")
+            )
+            followup = fast_path.classify(
+                "청년 월세 지원 정책 알려줘", confident, ["이전 대화"]
+            )
+            result = fast_path.classify("청년 월세 지원 정책 알려줘", confident, [])
+            fast_path.shadow(result, llm_classify)
+            await asyncio.gather(*ClassificationFastPath._shadow_tasks)
+            return skipped, followup, result
+
+        before = ClassificationFastPath.get_stats()
+        skipped, followup, result = asyncio.run(scenario())
+        after = ClassificationFastPath.get_stats()
+
+        self.assertIsNone(skipped)
+        self.assertIsNone(followup)
+        self.assertEqual(result["keywords"], "청년 월세 지원 정책")
+        self.assertFalse(result["is_followup"])
+        self.assertEqual(after["requests"] - before.get("requests", 0), 3)
+        self.assertEqual(after["fast_path"] - before.get("fast_path", 0), 1)
+        self.assertEqual(after["history_skipped"] - before.get("history_skipped", 0), 1)
+        self.assertEqual(
+            after["shadow_disagreements"] - before.get("shadow_disagreements", 0), 1
+        )
+
+
+class TermMatcherTestCase(SimpleTestCase):
+    """
+    분류 단어 Aho-Corasick 매처와 단어 파일 다시 불러오기를 테스트합니다.
+    """
+
+    def test_automaton_finds_overlapping_patterns(self):
+        """겹치거나 다른 패턴 안에 포함된 패턴도 `in` 검사와 같이 모두 찾는지 테스트"""
+        patterns = ["신청", "신청방법", "청방", "방법", "자세히", "신청"]
+        automaton = AhoCorasick(patterns)
+        for text in ["신청방법 자세히", "방법신청", "청방", "", "정책"]:
+            expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+            self.assertEqual(automaton.search(text), expected)
+
+    def test_reload_when_terms_file_changes(self):
+        """단어 파일이 바뀌면 다시 컴파일하고, 잘못된 파일이면 이전 목록을 유지하는지 테스트"""
+        terms = {
+            "weights": {"keywords": 1, "patterns": 2},
+            "categories": {
+                "gov_policy": {"keywords": ["정책"], "patterns": ["알려줘"]},
+                "detail_policy": {"keywords": [["서류", 5]], "patterns": []},
+            },
+            "markers": {"reference": ["그거"]},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "terms.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(terms, f)
+            matcher = ReloadingTermMatcher(path, interval=0)
+            self.assertEqual(
+                matcher.get().match("그거 정책 서류 알려줘"),
+                ({"gov_policy": 3, "detail_policy": 5}, {"reference"}),
+            )
+
+            terms["categories"]["gov_policy"]["keywords"].append("지원")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(terms, f)
+            os.utime(path, ns=(0, 1))
+            self.assertEqual(matcher.get().match("지원")[0]["gov_policy"], 1)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{")
+            os.utime(path, ns=(0, 2))
+            self.assertEqual(matcher.get().match("지원")[0]["gov_policy"], 1)
+
+            # 확신도 계산에 필요한 두 카테고리보다 적으면 이전 목록 유지
+            del terms["categories"]["detail_policy"]
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(terms, f)
+            os.utime(path, ns=(0, 3))
+            self.assertEqual(matcher.get().match("서류")[0]["detail_policy"], 5)
+
+
 if __name__ == "__main__":
     unittest.main()
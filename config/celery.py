@@ -32,6 +32,10 @@ app.conf.beat_schedule = {
         "task": "dataload.tasks.load_gov24_data_task",
         "schedule": crontab(hour=2, minute=0, day_of_week=3),  # 매주 수요일 오전 2시
     },
+    "prune-expired-documents-every-day-0.5am": {
+        "task": "dataload.tasks.prune_expired_documents_task",
+        "schedule": crontab(hour=0, minute=30),  # 매일 오전 0시 30분
+    },
 }
 
 
@@ -26,6 +26,72 @@ environ.Env.read_env(BASE_DIR / ".env")
 
 # ChromaDB 저장 경로 설정
 CHROMA_DB_DIR = env("CHROMA_DB_DIR", default=str(BASE_DIR / "chroma_db"))
+# dataload가 만드는 보조 검색 인덱스(BM25 등) 저장 위치 (Chroma 디렉터리 옆)
+RETRIEVER_INDEX_DIR = env("RETRIEVER_INDEX_DIR", default=f"{CHROMA_DB_DIR}_indexes")
+
+# VectorRetriever 멀티 컬렉션 병렬 검색 설정 (스레드 수, 컬렉션별 타임아웃 초)
+RETRIEVER_MAX_WORKERS = env.int("RETRIEVER_MAX_WORKERS", default=8)
+RETRIEVER_COLLECTION_TIMEOUT = env.float("RETRIEVER_COLLECTION_TIMEOUT", default=5.0)
+# 컬렉션 간 중복 문서 병합 방식 ("min": 최소 거리, "rrf": Reciprocal Rank Fusion)
+RETRIEVER_FUSION = env("RETRIEVER_FUSION", default="min")
+# RAG 체인에 넣는 검색 컨텍스트의 토큰 예산 (gpt-4o-mini 토크나이저 기준)
+RAG_CONTEXT_MAX_TOKENS = env.int("RAG_CONTEXT_MAX_TOKENS", default=2500)
+# RAG 체인의 벡터 검색 / 웹 검색 툴 제한 시간(초). 넘기면 해당 컨텍스트 없이 응답 생성
+RAG_TOOL_TIMEOUT = env.float("RAG_TOOL_TIMEOUT", default=8.0)
+WEB_SEARCH_TIMEOUT = env.float("WEB_SEARCH_TIMEOUT", default=5.0)
+# 규칙 기반 분류 키워드/문장 패턴과 가중치 파일 (수정하면 실행 중에도 다시 불러옴)
+CLASSIFIER_TERMS_PATH = env(
+    "CLASSIFIER_TERMS_PATH",
+    default=str(BASE_DIR / "chatbot" / "langchain_flow" / "classifier_terms.json"),
+)
+# 규칙 기반 분류 확신도가 이 값 이상이면 LLM 입력 분류를 생략 (1보다 크면 항상 LLM 분류)
+# - 섀도 실행 불일치율로 답변 영향을 확인하기 전까지는 기본으로 사용하지 않음 (검증 시 0.7 권장)
+CLASSIFIER_FAST_PATH_CONFIDENCE = env.float(
+    "CLASSIFIER_FAST_PATH_CONFIDENCE", default=1.1
+)
+# LLM 분류를 생략한 요청 중 LLM 분류를 백그라운드로 실행해 결과를 비교할 비율
+CLASSIFIER_SHADOW_SAMPLE_RATE = env.float("CLASSIFIER_SHADOW_SAMPLE_RATE", default=0.05)
+# 입력 분류를 기다리는 동안 원본 메시지로 RAG 검색을 미리 시작 (추측 검색)
+# - 재사용한 검색 결과가 답변 품질에 주는 영향을 확인하기 전까지는 기본으로 사용하지 않음
+SPECULATIVE_RETRIEVAL = env.bool("SPECULATIVE_RETRIEVAL", default=False)
+# 분류 결과 키워드와 원본 메시지의 문자 bigram 겹침(Dice)이 이 값 이상이면 추측 검색 결과를 재사용
+SPECULATIVE_RETRIEVAL_MIN_OVERLAP = env.float(
+    "SPECULATIVE_RETRIEVAL_MIN_OVERLAP", default=0.5
+)
+
+# 벡터 검색 백엔드 ("chroma": Chroma 조회, "numpy": dataload가 내보낸 mmap 스냅샷 전수 검색)
+# - dataload는 numpy일 때만 스냅샷을, RETRIEVER_QUANTIZATION의 양자화 행렬만 내보내므로
+#   두 설정을 바꾸면 데이터를 다시 발행해야 함
+RETRIEVER_BACKEND = env("RETRIEVER_BACKEND", default="chroma")
+# numpy 백엔드 양자화 모드 ("none", "int8", "float16")
+# - int8/float16 행렬로 후보를 찾고 상위 후보만 float32 원본으로 재계산 (상주 메모리 1/4, 1/2)
+# - NumPy는 양자화 행렬을 float32로 변환하며 계산하므로 단일 쿼리 지연시간은 늘어남
+#   (float16 변환은 특히 느림)
+RETRIEVER_QUANTIZATION = env("RETRIEVER_QUANTIZATION", default="none")
+
+# 검색 결과 캐시 설정 (인덱스 세대 번호가 바뀌면 자동 무효화)
+RETRIEVER_RESULT_CACHE_SIZE = env.int("RETRIEVER_RESULT_CACHE_SIZE", default=2000)
+RETRIEVER_RESULT_CACHE_TTL = env.int("RETRIEVER_RESULT_CACHE_TTL", default=60 * 60 * 24)
+
+# 신청 마감일(apply_end)이 지난 문서를 검색 결과에서 제외할지 여부
+RETRIEVER_EXCLUDE_EXPIRED = env.bool("RETRIEVER_EXCLUDE_EXPIRED", default=True)
+# 마감 임박 가중치 (0이면 사용 안 함). 마감 14일 전부터 score에 (1 - 값 * 임박도)를 곱함
+RETRIEVER_DEADLINE_BOOST = env.float("RETRIEVER_DEADLINE_BOOST", default=0.0)
+# 결과가 없던 필터 조합(지역/정책명)을 쿼리와 무관하게 빈 결과로 돌려줄 시간(초). 0이면 사용 안 함
+RETRIEVER_NEGATIVE_CACHE_TTL = env.int("RETRIEVER_NEGATIVE_CACHE_TTL", default=300)
+# 벡터 거리 분포로 결과 수 조정 (뚜렷한 간격이 있으면 k보다 적게, 고르면 최대 2k개)
+# - 답변 품질 영향을 확인하기 전까지는 기본으로 사용하지 않음
+RETRIEVER_ADAPTIVE_K = env.bool("RETRIEVER_ADAPTIVE_K", default=False)
+# MMR 다양화에서 관련도 가중치 (1이면 거리순 그대로, 낮을수록 서로 다른 문서를 우선)
+RETRIEVER_MMR_LAMBDA = env.float("RETRIEVER_MMR_LAMBDA", default=0.5)
+
+# 공유 검색 서비스 주소 (python -m chatbot.retrieval.service로 실행)
+# - 설정하면 워커마다 인덱스를 로드하지 않고 서비스에 요청 (빈 값이면 프로세스 내 검색)
+# - 예: "unix:///run/ainfo/retrieval.sock", "http://127.0.0.1:8765"
+RETRIEVER_SERVICE_URL = env("RETRIEVER_SERVICE_URL", default="")
+# 검색 서비스 클라이언트 연결 풀 크기와 요청 타임아웃(초)
+RETRIEVER_SERVICE_POOL_SIZE = env.int("RETRIEVER_SERVICE_POOL_SIZE", default=8)
+RETRIEVER_SERVICE_TIMEOUT = env.float("RETRIEVER_SERVICE_TIMEOUT", default=30.0)
 
 # API 키 설정
 GOV24_API_KEY = env("GOV24_API_KEY")
@@ -189,6 +255,27 @@ CELERY_RESULT_BACKEND = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# 임베딩 차원 (text-embedding-3-small 기본 1536, 256/512 등으로 줄이면 인덱스/메모리 감소)
+# - 로더와 검색이 같은 값을 써야 하며, 바꾼 뒤에는 전체 데이터를 다시 로드해야 함
+EMBEDDING_DIMENSIONS = env.int("EMBEDDING_DIMENSIONS", default=1536)
+
+# 임베딩 제공자 (openai: OpenAI API, hashing: API 없이 동작하는 결정적 해싱 임베딩)
+# - hashing은 CI/부하 테스트에서 적재 처리량과 검색 지연시간을 측정하기 위한 용도이며,
+#   제공자를 바꾸면 EMBEDDING_DIMENSIONS와 마찬가지로 전체 데이터를 다시 로드해야 함
+EMBEDDING_PROVIDER = env("EMBEDDING_PROVIDER", default="openai")
+
+# 임베딩 캐시 설정 (프로세스 LRU + Redis, 같은 텍스트의 임베딩 API 재호출 방지)
+EMBEDDING_CACHE_SIZE = env.int("EMBEDDING_CACHE_SIZE", default=10000)
+EMBEDDING_CACHE_TTL = env.int("EMBEDDING_CACHE_TTL", default=60 * 60)
+EMBEDDING_CACHE_REDIS = env.bool("EMBEDDING_CACHE_REDIS", default=True)
+EMBEDDING_CACHE_REDIS_DB = env.int("EMBEDDING_CACHE_REDIS_DB", default=2)
+EMBEDDING_CACHE_REDIS_TTL = env.int(
+    "EMBEDDING_CACHE_REDIS_TTL", default=60 * 60 * 24 * 8
+)
+
+# 인덱스 세대 번호 등 검색 메타데이터를 저장하는 Redis DB
+RETRIEVER_REDIS_DB = env.int("RETRIEVER_REDIS_DB", default=2)
+
 
 # 사용자 모델 설정
 AUTH_USER_MODEL = "accounts.User"
@@ -5,15 +5,51 @@
 
 import logging
 import os
+import shutil
 import traceback
+from collections import defaultdict
+from contextlib import contextmanager
 
+import chromadb
 import django
 import environ
+import redis
 from django.conf import settings
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from tqdm import tqdm
 
+from chatbot.retrieval.deadlines import (
+    APPLY_END_FIELD,
+    APPLY_START_FIELD,
+    NO_DEADLINE,
+    NO_START,
+    is_active,
+    today_key,
+)
+from chatbot.retrieval.embeddings import embedding_signature, get_embedding_model
+from chatbot.retrieval.generation import bump_index_generation, get_redis_client
+from chatbot.retrieval.lexical_index import LexicalIndex, lexical_index_path
+from chatbot.retrieval.name_index import export_name_map, name_map_path
+from chatbot.retrieval.regions import (
+    NATIONWIDE,
+    REGION_KEY_FIELD,
+    load_partition_manifest,
+    load_subregions,
+    partition_collection_name,
+    partition_manifest_path,
+    region_key,
+    save_partition_manifest,
+)
+from chatbot.retrieval.snapshot import export_snapshot, snapshot_path
+from chatbot.retrieval.versions import (
+    load_versions,
+    new_version,
+    resolve,
+    save_versions,
+    stale_versions,
+    versioned_name,
+)
+
 # 환경 변수 및 Django 설정
 env = environ.Env()
 environ.Env.read_env()
@@ -22,17 +58,26 @@ django.setup()
 
 # 설정 값 로드
 CHROMA_DB_DIR = settings.CHROMA_DB_DIR
-OPENAI_API_KEY = env("OPENAI_API_KEY")
+RETRIEVER_INDEX_DIR = settings.RETRIEVER_INDEX_DIR
+# EMBEDDING_PROVIDER=hashing이면 API 키 없이도 적재할 수 있음
+OPENAI_API_KEY = env("OPENAI_API_KEY", default=None)
 
 # ChromaDB 로깅 레벨 설정
 logging.getLogger("chromadb").setLevel(logging.ERROR)
 
+# 스테이징 ~ 발행 구간 Redis 잠금
+# - 같은 논리 컬렉션을 여러 작업(주간 적재, 매일 마감 정리, 수동 load_data)이 동시에 스테이징하면
+#   나중에 발행한 쪽이 먼저 발행한 쪽의 변경을 모르는 채로 현재 버전을 복사해 되돌리므로 직렬화
+# - 작업이 비정상 종료해도 잠금이 풀리도록 만료 시간을 둠 (전체 적재 시간보다 길게)
+PUBLISH_LOCK_PREFIX = "dataload:publish_lock:"
+PUBLISH_LOCK_TIMEOUT = 6 * 60 * 60
+
 
 def get_embeddings():
     """
-    OpenAI 임베딩 반환 함수
+    설정된 제공자(EMBEDDING_PROVIDER)의 임베딩 반환 함수 (변경되지 않은 문서는 임베딩 캐시에서 재사용)
     """
-    return OpenAIEmbeddings(model="text-embedding-3-small", api_key=OPENAI_API_KEY)
+    return get_embedding_model(api_key=OPENAI_API_KEY)
 
 
 def get_chroma_collection(collection_name, embeddings):
@@ -43,30 +88,154 @@ def get_chroma_collection(collection_name, embeddings):
         collection_name=collection_name,
         embedding_function=embeddings,
         persist_directory=CHROMA_DB_DIR,
+        collection_metadata=embedding_signature(),
     )
 
 
-def clear_collection(collection, collection_name):
+def current_collection_name(collection_name):
+    """
+    논리 컬렉션 이름에 해당하는 현재 발행된 실제 컬렉션 이름
+    (버전 목록에 없으면 논리 이름 그대로)
+    """
+    return resolve(load_versions(RETRIEVER_INDEX_DIR), collection_name)
+
+
+def list_collection_names():
+    """
+    CHROMA_DB_DIR에 있는 모든 컬렉션 이름
+    """
+    client = chromadb.PersistentClient(path=CHROMA_DB_DIR)
+    # chromadb 0.6부터 list_collections는 이름 문자열을, 이전 버전은 Collection을 반환
+    return [str(c) if isinstance(c, str) else c.name for c in client.list_collections()]
+
+
+def _add_records(collection, result, positions, batch_size=1000):
+    """
+    Chroma get 결과 중 지정한 위치의 문서를 임베딩째 컬렉션에 추가
+    (임베딩 API를 다시 호출하지 않고 복사하기 위함)
+    """
+    for start in range(0, len(positions), batch_size):
+        batch = positions[start : start + batch_size]
+        collection.add(
+            ids=[result["ids"][i] for i in batch],
+            embeddings=[result["embeddings"][i] for i in batch],
+            documents=[result["documents"][i] for i in batch],
+            metadatas=[result["metadatas"][i] for i in batch],
+        )
+
+
+def stage_collection(collection_name, version, embeddings, keep=None):
+    """
+    발행 전까지 검색에 노출되지 않는 새 버전(스테이징) 컬렉션 생성
+
+    - keep(metadata -> bool)이 주어지면 현재 발행된 버전에서 조건을 만족하는 문서를
+      임베딩째 복사 (여러 로더가 함께 채우는 unified_data에서 다른 소스 문서를 유지하거나,
+      마감 문서만 빼고 옮기기 위함)
+    - 검색 프로세스는 publish_collections가 버전 목록을 바꾸기 전까지 현재 버전을 계속 조회
+    - keep으로 현재 버전을 복사하는 경우 publish_lock 안에서 스테이징부터 발행까지 진행해야
+      다른 작업이 그 사이에 발행한 문서를 되돌리지 않음
+
+    Args:
+        collection_name (str): 논리 컬렉션 이름.
+        version (str): 스테이징 버전 (new_version()).
+        embeddings: 임베딩 함수.
+        keep (callable, optional): 현재 버전에서 옮길 문서 조건.
+
+    Returns:
+        Chroma: 스테이징 컬렉션.
+    """
+    name = versioned_name(collection_name, version)
+    get_chroma_collection(name, embeddings).delete_collection()
+    staged = get_chroma_collection(name, embeddings)
+
+    if keep is not None:
+        current = get_chroma_collection(
+            current_collection_name(collection_name), embeddings
+        )
+        result = current.get(include=["embeddings", "documents", "metadatas"])
+        positions = [
+            i for i, metadata in enumerate(result["metadatas"]) if keep(metadata or {})
+        ]
+        _add_records(staged._collection, result, positions)
+        tqdm.write(
+            f"'{collection_name}' 현재 버전에서 {len(positions)}개 문서를 "
+            f"'{name}'(으)로 복사했습니다."
+        )
+    return staged
+
+
+@contextmanager
+def publish_lock(collection_names):
+    """
+    논리 컬렉션들의 스테이징 ~ 발행 구간을 다른 적재 작업과 직렬화하는 Redis 잠금
+
+    - 교착을 피하기 위해 컬렉션 이름 순으로 잠금
+    - 다른 작업이 잠금을 쥐고 있으면 풀릴 때까지 기다림
+    - Redis에 연결할 수 없으면(로컬 수동 적재 등) 경고만 남기고 잠금 없이 진행
+
+    Raises:
+        RuntimeError: PUBLISH_LOCK_TIMEOUT 동안 잠금을 얻지 못한 경우.
     """
-    지정된 컬렉션 내 모든 문서 삭제
+    client = get_redis_client()
+    locks = []
+    try:
+        for name in sorted(set(collection_names)):
+            lock = client.lock(
+                PUBLISH_LOCK_PREFIX + name,
+                timeout=PUBLISH_LOCK_TIMEOUT,
+                blocking_timeout=PUBLISH_LOCK_TIMEOUT,
+            )
+            try:
+                acquired = lock.acquire()
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                tqdm.write(f"발행 잠금을 사용할 수 없어 잠금 없이 진행합니다: {e}")
+                break
+            if not acquired:
+                raise RuntimeError(f"'{name}' 발행 잠금 대기 시간 초과")
+            locks.append(lock)
+        yield
+    finally:
+        for lock in reversed(locks):
+            try:
+                lock.release()
+            except redis.RedisError as e:
+                tqdm.write(f"발행 잠금 해제 실패: {e}")
+
+
+def drop_collection(collection_name):
     """
-    result = collection.get()
-    if result and "ids" in result and result["ids"]:
-        collection.delete(ids=result["ids"])
-        tqdm.write(f"'{collection_name}' 컬렉션의 모든 문서를 삭제했습니다.")
-    else:
-        tqdm.write(f"'{collection_name}' 컬렉션에 삭제할 문서가 없습니다.")
+    실제 컬렉션과 그 지역 파티션, RETRIEVER_INDEX_DIR의 파생 인덱스 파일을 삭제
+    """
+    embeddings = get_embeddings()
+    manifest_path = partition_manifest_path(RETRIEVER_INDEX_DIR, collection_name)
+    partitions = list((load_partition_manifest(manifest_path) or {}).values())
+    for name in [collection_name] + partitions:
+        get_chroma_collection(name, embeddings).delete_collection()
+        shutil.rmtree(snapshot_path(RETRIEVER_INDEX_DIR, name), ignore_errors=True)
+        lexical_path = lexical_index_path(RETRIEVER_INDEX_DIR, name)
+        for path in (
+            f"{lexical_path}.npz",
+            f"{lexical_path}.json",
+            name_map_path(RETRIEVER_INDEX_DIR, name),
+        ):
+            if os.path.exists(path):
+                os.remove(path)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    tqdm.write(f"이전 버전 컬렉션 '{collection_name}'을(를) 삭제했습니다.")
 
 
 def save_documents_with_progress(collection, documents, batch_size=64):
     """
-    문서를 배치로 저장하며 tqdm로 진행률 표시
+    문서를 배치로 저장하며 tqdm로 진행률 표시 (저장 전 region_key / 신청 기간 기본값 부여)
     """
     total = len(documents)
     if total == 0:
         tqdm.write("저장할 문서가 없습니다.")
         return
 
+    assign_search_metadata(documents)
+
     tqdm.write(f"총 {total}개 문서 저장 시작")
     for i in tqdm(range(0, total, batch_size), desc="Saving documents"):
         batch = documents[i : i + batch_size]
@@ -89,6 +258,25 @@ def sanitize_metadata(metadata):
     return sanitized
 
 
+def assign_search_metadata(documents):
+    """
+    검색 단계에서 사용하는 메타데이터를 문서에 기록
+
+    - region을 17개 시/도 또는 '전국' 중 하나로 매핑해 region_key에 기록
+      (검색 시 region 필터를 시/도 + 전국 파티션 라우팅으로 처리하기 위함)
+    - 신청 기간이 없는 문서는 apply_start/apply_end를 상시(항상 유효) 값으로 채움
+      (마감 여부를 정수 비교만으로 판단하기 위함)
+    """
+    subregions = load_subregions()
+    for doc in documents:
+        doc.metadata[REGION_KEY_FIELD] = region_key(
+            doc.metadata.get("region", ""), subregions
+        )
+        doc.metadata.setdefault(APPLY_START_FIELD, NO_START)
+        doc.metadata.setdefault(APPLY_END_FIELD, NO_DEADLINE)
+    return documents
+
+
 def prepare_metadata_for_chroma(documents):
     """
     문서 리스트의 메타데이터를 ChromaDB에 맞게 일괄 전처리
@@ -98,6 +286,182 @@ def prepare_metadata_for_chroma(documents):
     return documents
 
 
+def build_lexical_index(collection_name):
+    """
+    컬렉션 문서로 BM25 문자 n-gram 인덱스를 만들어 RETRIEVER_INDEX_DIR에 저장
+    """
+    collection = get_chroma_collection(collection_name, get_embeddings())
+    index = LexicalIndex.from_collection(collection)
+    index.save(lexical_index_path(RETRIEVER_INDEX_DIR, collection_name))
+    tqdm.write(f"'{collection_name}' BM25 인덱스 저장 완료 ({len(index)}개 문서)")
+
+
+def build_name_map(collection_name):
+    """
+    컬렉션 문서의 정규화된 정책명 -> 문서 ID 맵을 RETRIEVER_INDEX_DIR에 저장
+    (검색 시 쿼리에 든 정책명을 벡터 검색 없이 찾는 데 사용)
+    """
+    collection = get_chroma_collection(collection_name, get_embeddings())
+    count = export_name_map(
+        collection, name_map_path(RETRIEVER_INDEX_DIR, collection_name)
+    )
+    tqdm.write(f"'{collection_name}' 정책명 맵 저장 완료 ({count}개 정책명)")
+
+
+def record_embedding_signature(collection_name):
+    """
+    컬렉션 메타데이터에 임베딩 모델/차원을 기록 (검색 프로세스 시작 시 불일치 검사용)
+
+    - Chroma modify는 메타데이터 전체를 교체하므로 기존 값에 덮어써서 저장
+    - hnsw:* 값은 생성 후 변경할 수 없으므로 제외
+    """
+    collection = get_chroma_collection(collection_name, get_embeddings())._collection
+    metadata = {
+        key: value
+        for key, value in (collection.metadata or {}).items()
+        if not key.startswith("hnsw:")
+    }
+    metadata.update(embedding_signature())
+    collection.modify(metadata=metadata)
+
+
+def build_snapshot(collection_name):
+    """
+    컬렉션 임베딩(float32 + RETRIEVER_QUANTIZATION 양자화 행렬)과 문서 ID, 검색용 메타데이터 열을
+    NumPy 스냅샷으로 내보냄 (numpy 검색 백엔드용이므로 RETRIEVER_BACKEND가 numpy일 때만)
+    """
+    if settings.RETRIEVER_BACKEND != "numpy":
+        return
+    collection = get_chroma_collection(collection_name, get_embeddings())
+    count = export_snapshot(
+        collection,
+        snapshot_path(RETRIEVER_INDEX_DIR, collection_name),
+        quantization=settings.RETRIEVER_QUANTIZATION,
+    )
+    tqdm.write(f"'{collection_name}' 벡터 스냅샷 저장 완료 ({count}개 문서)")
+
+
+def build_region_partitions(collection_name, batch_size=1000):
+    """
+    region_key별 파티션 컬렉션을 만들고 파티션 목록을 RETRIEVER_INDEX_DIR에 저장
+    (region 필터 검색 시 전체 컬렉션 대신 시/도 + 전국 파티션만 조회하기 위함)
+
+    - 임베딩은 원본 컬렉션에서 그대로 복사하므로 임베딩 API를 다시 호출하지 않음
+    - 파티션마다 벡터 스냅샷도 함께 내보냄
+    - 이번에 문서가 없는 파티션은 삭제
+    """
+    embeddings = get_embeddings()
+    source = get_chroma_collection(collection_name, embeddings)
+    result = source.get(include=["embeddings", "documents", "metadatas"])
+
+    groups = defaultdict(list)
+    for i, metadata in enumerate(result["metadatas"]):
+        groups[(metadata or {}).get(REGION_KEY_FIELD, NATIONWIDE)].append(i)
+
+    path = partition_manifest_path(RETRIEVER_INDEX_DIR, collection_name)
+    previous = load_partition_manifest(path) or {}
+    manifest = {}
+    for key, positions in groups.items():
+        name = partition_collection_name(collection_name, key)
+        get_chroma_collection(name, embeddings).delete_collection()
+        partition = get_chroma_collection(name, embeddings)._collection
+        _add_records(partition, result, positions, batch_size)
+        build_snapshot(name)
+        manifest[key] = name
+
+    for key, name in previous.items():
+        if key not in manifest:
+            get_chroma_collection(name, embeddings).delete_collection()
+    save_partition_manifest(path, manifest)
+    tqdm.write(
+        f"'{collection_name}' 지역 파티션 저장 완료 "
+        f"({', '.join(f'{key} {len(groups[key])}' for key in manifest)})"
+    )
+
+
+def publish_collections(collection_names, version=None):
+    """
+    컬렉션 갱신 완료를 알림
+    (BM25 인덱스, 정책명 맵, 벡터 스냅샷, 지역 파티션 재생성 후 인덱스 세대 번호 증가)
+
+    - version이 주어지면 stage_collection으로 만든 해당 버전 컬렉션의 파생 인덱스를 만든 뒤
+      버전 목록을 새 버전으로 바꾸고 세대 번호를 올림. 검색 프로세스는 다음 요청에서
+      새 버전의 컬렉션/인덱스로 한 번에 전환하므로 빈 컬렉션이나 적재 중인 컬렉션을 보지 않음
+    - 전환하지 않은 검색 프로세스가 있을 수 있으므로 직전 버전은 남기고 그 이전 버전만 삭제
+    - version이 없으면 현재 발행된 컬렉션의 파생 인덱스를 그대로 다시 만듦
+    """
+    versions = load_versions(RETRIEVER_INDEX_DIR)
+    published = {
+        name: (versioned_name(name, version) if version else resolve(versions, name))
+        for name in collection_names
+    }
+    for physical_name in published.values():
+        record_embedding_signature(physical_name)
+        build_lexical_index(physical_name)
+        build_name_map(physical_name)
+        build_snapshot(physical_name)
+        build_region_partitions(physical_name)
+
+    if version:
+        # 인덱스를 만드는 동안 다른 로더가 발행했을 수 있으므로 목록을 다시 읽어 갱신
+        versions = load_versions(RETRIEVER_INDEX_DIR)
+        versions.update(published)
+        save_versions(RETRIEVER_INDEX_DIR, versions)
+    generation = bump_index_generation(collection_names)
+    if generation is not None:
+        tqdm.write(
+            f"인덱스 세대 {generation} 발행: "
+            f"{', '.join(published[name] for name in collection_names)}"
+        )
+
+    if version:
+        existing = list_collection_names()
+        for name, physical_name in published.items():
+            for stale in stale_versions(existing, name, physical_name):
+                drop_collection(stale)
+
+
+def prune_expired_documents(collection_names):
+    """
+    신청 마감일이 지난 문서를 뺀 새 버전 컬렉션을 만들어 변경된 컬렉션만 다시 발행
+    (검색 시 마감 문서를 걸러내느라 더 가져오는 개수를 0에 가깝게 유지하기 위함)
+
+    Returns:
+        int: 삭제한 문서 수.
+    """
+    today = today_key()
+    embeddings = get_embeddings()
+    # 다른 적재 작업이 발행하는 도중에 현재 버전을 복사하지 않도록 발행까지 잠금
+    with publish_lock(collection_names):
+        pruned, total = [], 0
+        for collection_name in collection_names:
+            collection = get_chroma_collection(
+                current_collection_name(collection_name), embeddings
+            )
+            result = collection.get(where={APPLY_END_FIELD: {"$lt": today}}, include=[])
+            if not result["ids"]:
+                continue
+            tqdm.write(
+                f"'{collection_name}' 마감 문서 {len(result['ids'])}개 삭제 (기준일 {today})"
+            )
+            pruned.append(collection_name)
+            total += len(result["ids"])
+
+        if pruned:
+            version = new_version()
+            for collection_name in pruned:
+                stage_collection(
+                    collection_name,
+                    version,
+                    embeddings,
+                    keep=lambda metadata: is_active(metadata, today),
+                )
+            publish_collections(pruned, version=version)
+        else:
+            tqdm.write(f"삭제할 마감 문서가 없습니다. (기준일 {today})")
+    return total
+
+
 def run_loader(loader_function, loader_name):
     """
     로더를 실행하고 오류 발생 시 예외를 처리
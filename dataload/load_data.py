@@ -10,6 +10,8 @@ import shutil
 from django.conf import settings
 from tqdm import tqdm
 
+from chatbot.retrieval.versions import versions_path
+
 from .common import run_loader
 from .load_fifty_portal_edu_data import process_and_store_fifty_portal_edu_data
 from .load_gov24_data import process_and_store_combined_gov24
@@ -20,9 +22,12 @@ from .load_youth_policy_data import process_and_store_youth_policy_data
 
 def delete_all_collections():
     """
-    CHROMA_DB_DIR 내 모든 컬렉션 폴더를 삭제
+    CHROMA_DB_DIR 내 모든 컬렉션 폴더와 컬렉션 버전 목록을 삭제
     """
     chroma_dir = settings.CHROMA_DB_DIR
+    path = versions_path(settings.RETRIEVER_INDEX_DIR)
+    if os.path.exists(path):
+        os.remove(path)
 
     if not os.path.exists(chroma_dir):
         tqdm.write("Chroma 디렉토리가 존재하지 않습니다.")
@@ -8,13 +8,17 @@ from django.conf import settings
 from langchain.schema import Document
 from tqdm import tqdm
 
+from chatbot.retrieval.deadlines import deadline_metadata
+
 from .common import (
-    clear_collection,
-    get_chroma_collection,
     get_embeddings,
+    new_version,
     prepare_metadata_for_chroma,
+    publish_collections,
+    publish_lock,
     sanitize_metadata,
     save_documents_with_progress,
+    stage_collection,
 )
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
@@ -27,6 +31,7 @@ DATA_TYPE = "json"
 PAGE_SIZE = 500
 MAX_PAGES = 4
 API_RATE_LIMIT_DELAY = 1
+SOURCE_NAME = "50플러스포털"
 
 
 def fetch_fifty_portal_edu_data(start_index, end_index):
@@ -78,7 +83,9 @@ def build_fifty_portal_edu_doc(item):
             "name": item.get("LCT_NM", ""),
             "link": item.get("CR_URL", ""),
             "region": "서울시",
-            "source": "50플러스포털",
+            "source": SOURCE_NAME,
+            # 수강 신청(등록) 기간 기준으로 마감 여부 판단
+            **deadline_metadata(start=item.get("REG_STDE"), end=item.get("REG_EDDE")),
         }
     )
 
@@ -93,13 +100,6 @@ def process_and_store_fifty_portal_edu_data():
         tqdm.write("--- 50플러스포털 교육정보 데이터 로딩 시작 ---")
         start_time = time.time()
 
-        embeddings = get_embeddings()
-        collection = get_chroma_collection("fifty_portal_edu_data", embeddings)
-        unified_collection = get_chroma_collection("unified_data", embeddings)
-
-        # 컬렉션 초기화
-        clear_collection(collection, "fifty_portal_edu_data")
-
         all_docs = []
 
         # 총 건수를 파악하기 위해 1페이지만 호출해서 list_total_count 확인
@@ -122,10 +122,26 @@ def process_and_store_fifty_portal_edu_data():
 
         prepared_docs = prepare_metadata_for_chroma(all_docs)
 
-        # 개별 컬렉션 저장
-        save_documents_with_progress(collection, prepared_docs)
-        # 통합 컬렉션 저장
-        save_documents_with_progress(unified_collection, prepared_docs)
+        # 새 버전 컬렉션에 저장 (발행 전까지 검색은 현재 버전을 그대로 사용)
+        embeddings = get_embeddings()
+        # 스테이징부터 발행까지 unified_data를 함께 쓰는 다른 적재 작업과 직렬화
+        with publish_lock(["fifty_portal_edu_data", "unified_data"]):
+            version = new_version()
+            collection = stage_collection("fifty_portal_edu_data", version, embeddings)
+            unified_collection = stage_collection(
+                "unified_data",
+                version,
+                embeddings,
+                keep=lambda metadata: metadata.get("source") != SOURCE_NAME,
+            )
+
+            # 개별 컬렉션 저장
+            save_documents_with_progress(collection, prepared_docs)
+            # 통합 컬렉션 저장
+            save_documents_with_progress(unified_collection, prepared_docs)
+            publish_collections(
+                ["fifty_portal_edu_data", "unified_data"], version=version
+            )
 
         elapsed = time.time() - start_time
         tqdm.write(f"\n총 {len(all_docs)}건 저장 완료. 소요 시간: {elapsed:.2f}초")
@@ -13,12 +13,21 @@ from django.conf import settings
 from langchain.schema import Document
 from tqdm import tqdm
 
+from chatbot.retrieval.deadlines import (
+    APPLY_END_FIELD,
+    APPLY_START_FIELD,
+    deadline_metadata,
+    format_date_key,
+)
+
 from .common import (
-    clear_collection,
-    get_chroma_collection,
     get_embeddings,
+    new_version,
+    publish_collections,
+    publish_lock,
     sanitize_metadata,
     save_documents_with_progress,
+    stage_collection,
 )
 
 # Django 환경설정
@@ -32,6 +41,7 @@ GOV24_API_KEY = settings.GOV24_API_KEY
 PAGE_SIZE = 10
 API_RATE_LIMIT_DELAY = 0.5
 TIMEOUT_SECONDS = 30
+SOURCE_NAME = "정부24"
 session = requests.Session()
 
 
@@ -89,14 +99,16 @@ def build_combined_doc(service_list_item, service_detail_item):
     # 지원대상: {service_list_item.get('지원대상', '정보 없음')}
     # 지원내용: {service_list_item.get('지원내용', '정보 없음')}
     # 구비서류: {service_detail_item.get('구비서류', '정보 없음')}
+    # 신청기한: {service_list_item.get('신청기한', '정보 없음')}
+    deadline = deadline_metadata(period=service_list_item.get("신청기한"))
     page_content = f"""
         정책명/강좌명: {service_list_item.get('서비스명', '정보 없음')}
         정책/강좌 내용: {service_list_item.get('지원내용', '정보 없음')}
         지원 대상: {service_list_item.get('지원대상', '정보 없음')}
         카테고리/분야: {service_list_item.get('서비스분야', '정보 없음')}
         지역: 정보 없음
-        시작일: 정보 없음
-        종료일: 정보 없음
+        시작일: {format_date_key(deadline[APPLY_START_FIELD])}
+        종료일: {format_date_key(deadline[APPLY_END_FIELD])}
         접수방법: 정보 없음
         문의처: 정보 없음
         상세보기 링크: {service_list_item.get('상세조회URL', '정보 없음')}
@@ -110,7 +122,8 @@ def build_combined_doc(service_list_item, service_detail_item):
             "detail": service_list_item.get("지원내용", ""),
             "link": service_list_item.get("상세조회URL", ""),
             "region": service_list_item.get("서비스분야", ""),
-            "source": "정부24",
+            "source": SOURCE_NAME,
+            **deadline,
         }
     )
 
@@ -121,14 +134,6 @@ def process_and_store_combined_gov24():
     try:
         tqdm.write("=== 정부24 통합 데이터 로딩 시작 ===")
 
-        embeddings = get_embeddings()
-        gov24_collection = get_chroma_collection("gov24_services", embeddings)
-        unified_collection = get_chroma_collection("unified_data", embeddings)
-
-        # 기존 컬렉션 초기화
-        clear_collection(gov24_collection, "gov24_services")
-        clear_collection(unified_collection, "unified_data")
-
         combined_documents = []
         page = 1
         with tqdm(desc="서비스 목록 수집", unit="건", dynamic_ncols=True) as pbar:
@@ -159,11 +164,25 @@ def process_and_store_combined_gov24():
                 page += 1
                 time.sleep(API_RATE_LIMIT_DELAY)
 
-        # 개별 컬렉션 저장
-        save_documents_with_progress(gov24_collection, combined_documents)
-        # 통합 컬렉션 저장
-        save_documents_with_progress(unified_collection, combined_documents)
-        tqdm.write(f"총 {len(combined_documents)}건 저장 완료")
+        # 새 버전 컬렉션에 저장 (발행 전까지 검색은 현재 버전을 그대로 사용)
+        embeddings = get_embeddings()
+        # 스테이징부터 발행까지 unified_data를 함께 쓰는 다른 적재 작업과 직렬화
+        with publish_lock(["gov24_services", "unified_data"]):
+            version = new_version()
+            gov24_collection = stage_collection("gov24_services", version, embeddings)
+            unified_collection = stage_collection(
+                "unified_data",
+                version,
+                embeddings,
+                keep=lambda metadata: metadata.get("source") != SOURCE_NAME,
+            )
+
+            # 개별 컬렉션 저장
+            save_documents_with_progress(gov24_collection, combined_documents)
+            # 통합 컬렉션 저장
+            save_documents_with_progress(unified_collection, combined_documents)
+            tqdm.write(f"총 {len(combined_documents)}건 저장 완료")
+            publish_collections(["gov24_services", "unified_data"], version=version)
 
     except Exception as e:
         tqdm.write(f"데이터 로딩 실패: {e}")
@@ -9,12 +9,14 @@ from langchain.schema import Document
 from tqdm import tqdm
 
 from .common import (
-    clear_collection,
-    get_chroma_collection,
     get_embeddings,
+    new_version,
     prepare_metadata_for_chroma,
+    publish_collections,
+    publish_lock,
     sanitize_metadata,
     save_documents_with_progress,
+    stage_collection,
 )
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
@@ -27,6 +29,7 @@ DATA_TYPE = "json"
 PAGE_SIZE = 500
 MAX_PAGES = 4
 API_RATE_LIMIT_DELAY = 1
+SOURCE_NAME = "몽땅정보"
 
 
 def fetch_mongddang_api(start_index, end_index):
@@ -81,7 +84,7 @@ def build_mongddang_doc(item):
             "detail": item.get("BIZ_CN", ""),
             "link": item.get("DEVIW_SITE_ADDR", ""),
             "region": item.get("TRGT_RGN", ""),
-            "source": "몽땅정보",
+            "source": SOURCE_NAME,
         }
     )
 
@@ -96,13 +99,6 @@ def process_and_store_mongddang_data():
         tqdm.write("--- 몽땅정보 데이터 로딩 시장 ---")
         start_time = time.time()
 
-        embeddings = get_embeddings()
-        mongddang_collection = get_chroma_collection("mongddang_data", embeddings)
-        unified_collection = get_chroma_collection("unified_data", embeddings)
-
-        # 기존 데이터 초기화
-        clear_collection(mongddang_collection, "mongddang_data")
-
         all_docs = []
 
         # 총 건수를 파악하기 위해 1페이지만 호출해서 list_total_count 확인
@@ -123,15 +119,31 @@ def process_and_store_mongddang_data():
                 tqdm.write(f"[ERROR] 페이지 {page + 1} 수집 실패: {e}")
             time.sleep(API_RATE_LIMIT_DELAY)
 
-        # 개별 컬렉션 저장
-        save_documents_with_progress(
-            mongddang_collection, prepare_metadata_for_chroma(all_docs)
-        )
-
-        # 개별 컬렉션 저장
-        save_documents_with_progress(
-            unified_collection, prepare_metadata_for_chroma(all_docs)
-        )
+        # 새 버전 컬렉션에 저장 (발행 전까지 검색은 현재 버전을 그대로 사용)
+        embeddings = get_embeddings()
+        # 스테이징부터 발행까지 unified_data를 함께 쓰는 다른 적재 작업과 직렬화
+        with publish_lock(["mongddang_data", "unified_data"]):
+            version = new_version()
+            mongddang_collection = stage_collection(
+                "mongddang_data", version, embeddings
+            )
+            unified_collection = stage_collection(
+                "unified_data",
+                version,
+                embeddings,
+                keep=lambda metadata: metadata.get("source") != SOURCE_NAME,
+            )
+
+            # 개별 컬렉션 저장
+            save_documents_with_progress(
+                mongddang_collection, prepare_metadata_for_chroma(all_docs)
+            )
+
+            # 개별 컬렉션 저장
+            save_documents_with_progress(
+                unified_collection, prepare_metadata_for_chroma(all_docs)
+            )
+            publish_collections(["mongddang_data", "unified_data"], version=version)
 
         elapsed = time.time() - start_time
         tqdm.write(f"\n총 {len(all_docs)}건 저장 완료. 소요 시간: {elapsed:.2f}초")
@@ -14,10 +14,11 @@ from langchain.docstore.document import Document
 from tqdm import tqdm
 
 from .common import (
-    clear_collection,
-    get_chroma_collection,
     get_embeddings,
+    new_version,
+    publish_collections,
     save_documents_with_progress,
+    stage_collection,
 )
 
 # Django 환경설정
@@ -123,8 +124,8 @@ def process_and_store_pdf_data():
     """
     tqdm.write("=== PDF → ChromaDB 파이프라인 시작 ===")
     embeddings = get_embeddings()
-    collection = get_chroma_collection("pdf_sections", embeddings)
-    clear_collection(collection, "pdf_sections")
+    version = new_version()
+    collection = stage_collection("pdf_sections", version, embeddings)
 
     pages_text = extract_pdf_pages(PDF_PATH)
     tqdm.write(f"PDF 총 페이지 수: {len(pages_text)}")
@@ -137,6 +138,7 @@ def process_and_store_pdf_data():
     docs = build_documents_with_offset(policies, pages_text, offset)
 
     save_documents_with_progress(collection, docs)
+    publish_collections(["pdf_sections"], version=version)
     tqdm.write(f"총 {len(docs)}건 저장 완료.")
 
 
@@ -14,12 +14,22 @@ from django.conf import settings
 from langchain.schema import Document
 from tqdm import tqdm
 
+from chatbot.retrieval.deadlines import (
+    APPLY_END_FIELD,
+    APPLY_START_FIELD,
+    deadline_metadata,
+    format_date_key,
+)
+
 from .common import (
-    get_chroma_collection,
     get_embeddings,
+    new_version,
     prepare_metadata_for_chroma,
+    publish_collections,
+    publish_lock,
     sanitize_metadata,
     save_documents_with_progress,
+    stage_collection,
 )
 
 # Django 환경설정
@@ -31,6 +41,7 @@ YOUTH_API_BASE_URL = "https://www.youthcenter.go.kr/go/ythip/getPlcy"
 YOUTH_POLICY_API_KEY = settings.YOUTH_POLICY_API_KEY
 PAGE_SIZE = 10
 API_RATE_LIMIT_DELAY = 1
+SOURCE_NAME = "청년정책"
 
 
 def fetch_api(params, url=YOUTH_API_BASE_URL):
@@ -48,21 +59,6 @@ def fetch_api(params, url=YOUTH_API_BASE_URL):
     return None
 
 
-def clear_collection():
-    """
-    기존 youth_policy_list 컬렉션 데이터 삭제
-    """
-    embeddings = get_embeddings()
-    collection_name = "youth_policy_list"
-    list_db = get_chroma_collection(collection_name, embeddings)
-
-    result = list_db.get()
-    if result and "ids" in result and result["ids"]:
-        list_db.delete(ids=result["ids"])
-        tqdm.write(f"'{collection_name}' 컬렉션의 모든 문서를 삭제했습니다.")
-    return list_db
-
-
 def fetch_and_convert(page_num, existing_data=None):
     """
     API 데이터 페이지를 Document 객체로 변환
@@ -97,14 +93,16 @@ def build_list_doc(policy):
     # 심사방법내용: {policy.get('srngMthdCn', '정보 없음')}
     # 상세설명URL주소: {policy.get('refUrlAddr1', '정보 없음')}
     # 등록기관명: {policy.get('rgtrInstCdNm', '정보 없음')}
+    # 신청기간: {policy.get('aplyYmd', '정보 없음')}
+    deadline = deadline_metadata(period=policy.get("aplyYmd"))
     page_content = f"""
     정책명/강좌명: {policy.get('plcyNm', '정보 없음')}
     정책/강좌 내용: {policy.get('plcySprtCn', '정보 없음')}
     지원 대상: {policy.get('srngMthdCn', '정보 없음')}
     카테고리/분야: 정보 없음
     지역: {policy.get('rgtrInstCdNm', '정보 없음')}
-    시작일: 정보 없음
-    종료일: 정보 없음
+    시작일: {format_date_key(deadline[APPLY_START_FIELD])}
+    종료일: {format_date_key(deadline[APPLY_END_FIELD])}
     접수방법: 정보 없음
     문의처: 정보 없음
     상세보기 링크: {policy.get('refUrlAddr1', '정보 없음')}
@@ -118,7 +116,8 @@ def build_list_doc(policy):
             "detail": policy.get("plcySprtCn", ""),
             "link": policy.get("refUrlAddr1", ""),
             "region": policy.get("rgtrInstCdNm", ""),
-            "source": "청년정책",
+            "source": SOURCE_NAME,
+            **deadline,
         }
     )
 
@@ -133,12 +132,6 @@ def process_and_store_youth_policy_data():
         tqdm.write("=== 청년정책 데이터 로딩 시작 ===")
         start_time = time.time()
 
-        embeddings = get_embeddings()
-        unified_db = get_chroma_collection("unified_data", embeddings)
-
-        # 컬렉션 초기화
-        list_db = clear_collection()
-
         all_list_docs = []
 
         params = {
@@ -171,10 +164,24 @@ def process_and_store_youth_policy_data():
 
         prepared_docs = prepare_metadata_for_chroma(all_list_docs)
 
-        # 개별 컬렉션 저장
-        save_documents_with_progress(list_db, prepared_docs)
-        # 통합 컬렉션 저장
-        save_documents_with_progress(unified_db, prepared_docs)
+        # 새 버전 컬렉션에 저장 (발행 전까지 검색은 현재 버전을 그대로 사용)
+        embeddings = get_embeddings()
+        # 스테이징부터 발행까지 unified_data를 함께 쓰는 다른 적재 작업과 직렬화
+        with publish_lock(["youth_policy_list", "unified_data"]):
+            version = new_version()
+            list_db = stage_collection("youth_policy_list", version, embeddings)
+            unified_db = stage_collection(
+                "unified_data",
+                version,
+                embeddings,
+                keep=lambda metadata: metadata.get("source") != SOURCE_NAME,
+            )
+
+            # 개별 컬렉션 저장
+            save_documents_with_progress(list_db, prepared_docs)
+            # 통합 컬렉션 저장
+            save_documents_with_progress(unified_db, prepared_docs)
+            publish_collections(["youth_policy_list", "unified_data"], version=version)
 
         elapsed = time.time() - start_time
         tqdm.write(f"\n총 {len(all_list_docs)}건 저장 완료. 소요 시간: {elapsed:.2f}초")
@@ -4,6 +4,7 @@ import traceback
 from celery import shared_task
 from tqdm import tqdm
 
+from .common import prune_expired_documents
 from .load_fifty_portal_edu_data import process_and_store_fifty_portal_edu_data
 from .load_gov24_data import process_and_store_combined_gov24
 from .load_mongddang_data import process_and_store_mongddang_data
@@ -72,3 +73,29 @@ def load_fifty_plus_edu_data_task():
     except Exception as e:
         tqdm.write(f"[ERROR] 데이터 로딩 실패: {e}")
         traceback.print_exc()
+
+
+@shared_task
+def prune_expired_documents_task():
+    """
+    Celery를 통해 매일 실행되는 마감 문서 정리 작업
+    """
+    try:
+        tqdm.write("=== 마감 문서 정리 시작 (Celery) ===")
+        start_time = time.time()
+        pruned = prune_expired_documents(
+            [
+                "gov24_services",
+                "youth_policy_list",
+                "mongddang_data",
+                "fifty_portal_edu_data",
+                "unified_data",
+            ]
+        )
+        elapsed = time.time() - start_time
+        tqdm.write(
+            f"=== 마감 문서 {pruned}개 정리 완료. 소요 시간: {elapsed:.2f}초 ==="
+        )
+    except Exception as e:
+        tqdm.write(f"[ERROR] 마감 문서 정리 실패: {e}")
+        traceback.print_exc()